@@ -0,0 +1,86 @@
+# benchmarks/bench_chart.py
+#
+# Memory per cached chart and conversion cost: utils.chart.Chart against the
+# nested dicts (positions, signs, houses and the "planets" JSON shape) that
+# modules used to build from each other.
+#
+#   python -m benchmarks.bench_chart [n_charts]
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.chart import Chart
+from utils.ephemeris import PLANETS
+from utils.kundli import get_nakshatra_and_pada
+
+NAMES = list(PLANETS)
+
+
+def dict_chart(longitudes, lagna):
+    positions = {name: round(float(lon), 4) for name, lon in zip(NAMES, longitudes)}
+    signs = {name: int(lon // 30) % 12 for name, lon in positions.items()}
+    houses = {name: (sign - lagna) % 12 + 1 for name, sign in signs.items()}
+    planets = {}
+    for name, lon in positions.items():
+        nakshatra = get_nakshatra_and_pada(lon)
+        planets[name] = {
+            "longitude": lon, "sign": SIGN_NAMES[signs[name]], "degree": round(lon % 30, 4),
+            "house": houses[name], "nakshatra": nakshatra["nakshatra"], "pada": nakshatra["pada"],
+        }
+    return {"positions": positions, "signs": signs, "houses": houses, "planets": planets}
+
+
+def measure(build, count):
+    """(bytes retained per chart, microseconds per build); tracing is off while timing."""
+    start = time.perf_counter()
+    for i in range(count):
+        build(i)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    kept = [build(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / count, elapsed / count * 1e6
+
+
+def run(n_charts=20000):
+    rng = np.random.default_rng(0)
+    longitudes = rng.uniform(0, 360, (n_charts, len(NAMES)))
+    lagna = rng.integers(0, 12, n_charts).tolist()
+    rows = longitudes.tolist()
+
+    dict_bytes, dict_us = measure(lambda i: dict_chart(rows[i], lagna[i]), n_charts)
+    chart_bytes, chart_us = measure(lambda i: Chart(NAMES, longitudes[i], lagna[i]), n_charts)
+    charts = [Chart(NAMES, longitudes[i], lagna[i]) for i in range(n_charts)]
+
+    start = time.perf_counter()
+    for chart in charts:
+        chart.to_dict()
+    to_dict_us = (time.perf_counter() - start) / n_charts * 1e6
+    start = time.perf_counter()
+    for chart in charts:
+        chart.planet_positions()
+    positions_us = (time.perf_counter() - start) / n_charts * 1e6
+
+    sample = charts[0].to_dict()["planets"]
+    mismatches = sum(
+        sample[name]["nakshatra"] != get_nakshatra_and_pada(lon)["nakshatra"]
+        for name, lon in zip(NAMES, rows[0])
+    )
+
+    print(f"charts:               {n_charts}")
+    print(f"nested dicts:         {dict_bytes:8.0f} bytes/chart  {dict_us:7.1f} us to build")
+    print(f"Chart:                {chart_bytes:8.0f} bytes/chart  {chart_us:7.1f} us to build  "
+          f"({dict_bytes / chart_bytes:.1f}x smaller)")
+    print(f"Chart.to_dict():      {to_dict_us:8.1f} us")
+    print(f"planet_positions():   {positions_us:8.1f} us")
+    print(f"nakshatra mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
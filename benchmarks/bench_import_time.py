@@ -0,0 +1,78 @@
+# benchmarks/bench_import_time.py
+#
+# Cold-start budget: imports the service entrypoint (and the utils modules)
+# in fresh interpreters, reports the import time, and exits non-zero if the
+# entrypoint is over budget or any module pulls in a dependency that should
+# only load on first use (see utils/lazy.py).
+#
+#   python -m benchmarks.bench_import_time [budget_ms]
+#
+# IMPORT_BUDGET_MS sets the default budget; IMPORT_RUNS the number of runs
+# per module (the fastest is kept, to filter out disk-cache noise).
+
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+
+import utils
+
+ENTRYPOINT = "main"
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+RUNS = int(os.getenv("IMPORT_RUNS", "5"))
+
+# Must not be in sys.modules after importing any module of the service
+DEFERRED = [
+    "fpdf", "qrcode", "openai", "flatlib", "geopy", "timezonefinder",
+    "cairosvg", "matplotlib", "PIL",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    import {module}
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - start
+deferred = sorted({{m.split(".")[0] for m in sys.modules}} & set({deferred!r}))
+print(json.dumps({{"ms": elapsed * 1e3, "error": error, "deferred": deferred}}))
+"""
+
+
+def probe(module):
+    """Imports `module` in a fresh interpreter -> {"ms", "error", "deferred"}."""
+    code = PROBE.format(module=module, deferred=DEFERRED)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def service_modules():
+    return [ENTRYPOINT] + [f"utils.{m.name}" for m in pkgutil.iter_modules(utils.__path__)]
+
+
+def run(budget_ms=BUDGET_MS):
+    failures = []
+    print(f"{'module':32} {'import':>9}  deferred deps loaded")
+    for module in service_modules():
+        results = [probe(module) for _ in range(RUNS if module == ENTRYPOINT else 1)]
+        best = min(results, key=lambda r: r["ms"])
+        if best["error"]:
+            print(f"{module:32} {'-':>9}  (import failed: {best['error']})")
+            continue
+        print(f"{module:32} {best['ms']:7.1f}ms  {', '.join(best['deferred']) or '-'}")
+        if best["deferred"]:
+            failures.append(f"{module} imports {', '.join(best['deferred'])} eagerly")
+        if module == ENTRYPOINT and best["ms"] > budget_ms:
+            failures.append(f"{module} takes {best['ms']:.0f}ms to import (budget {budget_ms:.0f}ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return not failures
+
+
+if __name__ == "__main__":
+    ok = run(float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS)
+    sys.exit(0 if ok else 1)
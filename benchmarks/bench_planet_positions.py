@@ -0,0 +1,51 @@
+# benchmarks/bench_planet_positions.py
+#
+# Charts/second for the batched ephemeris API against the per-planet loop
+# that utils/kundli.get_planet_positions used to run.
+#
+#   python -m benchmarks.bench_planet_positions [n_charts]
+
+import sys
+import time
+
+import numpy as np
+import swisseph as swe
+
+from utils.ephemeris import PLANETS, KETU, calc_positions
+
+
+def legacy_positions(jd):
+    positions = {}
+    for name, pid in PLANETS.items():
+        pid = swe.MEAN_NODE if pid == KETU else pid
+        lon = swe.calc_ut(jd, pid)[0][0]
+        if name == 'Ketu':
+            lon = (lon + 180) % 360
+        positions[name] = round((lon - swe.get_ayanamsa(jd)) % 360, 4)
+    return positions
+
+
+def run(n_charts=5000):
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    jds = 2415020.5 + np.random.default_rng(0).uniform(0, 73000, n_charts)
+
+    start = time.perf_counter()
+    for jd in jds.tolist():
+        legacy_positions(jd)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calc_positions(jds)
+    batched = time.perf_counter() - start
+
+    check = legacy_positions(float(jds[0]))
+    drift = max(abs(check[name] - batch.sidereal[0, i]) for i, name in enumerate(batch.names))
+
+    print(f"charts:          {n_charts}")
+    print(f"per-planet loop: {n_charts / legacy:10.0f} charts/s")
+    print(f"batched:         {n_charts / batched:10.0f} charts/s  ({legacy / batched:.2f}x)")
+    print(f"max deviation:   {drift:.2e} deg")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,61 @@
+# benchmarks/bench_rise_set.py
+#
+# Accuracy and speed of utils.riseset tables against per-day swe.rise_trans
+# searches, for a year of sunrises/sunsets and moonrises/moonsets.
+#
+#   python -m benchmarks.bench_rise_set [days]
+
+import sys
+import time
+
+import numpy as np
+import swisseph as swe
+
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.riseset import rise_set_table
+
+CITIES = [
+    ("Chennai", 13.08, 80.27, 5.5),
+    ("Delhi", 28.61, 77.21, 5.5),
+    ("New York", 40.71, -74.01, -5.0),
+    ("London", 51.51, -0.13, 0.0),
+    ("Oslo", 59.91, 10.75, 1.0),
+]
+BODIES = {"Sun": swe.SUN, "Moon": swe.MOON}
+
+
+def reference(day_bounds, lat, lon, body, rsmi):
+    """First event inside each day via rise_trans, NaN if the next one falls on a later day."""
+    out = np.full(len(day_bounds) - 1, np.nan)
+    for i, start in enumerate(day_bounds[:-1].tolist()):
+        jd = DEFAULT_CONTEXT.rise_trans(start, body, rsmi, lat, lon)
+        if jd is not None and jd < day_bounds[i + 1]:
+            out[i] = jd
+    return out
+
+
+def run(days=365):
+    print(f"{'city':10} {'body':5} {'max err':>9} {'mean err':>9} {'mismatch':>9} {'table':>9} {'rise_trans':>11}")
+    for city, lat, lon, tz in CITIES:
+        day_bounds = swe.julday(2024, 1, 1, 0.0) - tz / 24 + np.arange(days + 1)
+        for name, body in BODIES.items():
+            start = time.perf_counter()
+            table = rise_set_table(day_bounds, lat, lon, body)
+            fast = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rises = reference(day_bounds, lat, lon, body, swe.CALC_RISE)
+            sets = reference(day_bounds, lat, lon, body, swe.CALC_SET)
+            slow = time.perf_counter() - start
+
+            got = np.concatenate((table.rise, table.set))
+            want = np.concatenate((rises, sets))
+            both = ~np.isnan(got) & ~np.isnan(want)
+            err = np.abs(got[both] - want[both]) * 86400
+            mismatch = int((np.isnan(got) != np.isnan(want)).sum())
+            print(f"{city:10} {name:5} {err.max():8.2f}s {err.mean():8.2f}s {mismatch:9d} "
+                  f"{fast * 1e3:7.1f}ms {slow * 1e3:9.1f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 365)
@@ -0,0 +1,50 @@
+# benchmarks/bench_shadbala.py
+#
+# Charts/second for utils.shadbala: one batched pass over many charts
+# against computing the same charts one at a time, as a request does.
+#
+#   python -m benchmarks.bench_shadbala [n_charts]
+
+import sys
+import time
+
+import numpy as np
+
+from utils.ephemeris import calc_positions
+from utils.shadbala import chart_angles, compute_shadbala
+
+
+def run(n_charts=5000):
+    rng = np.random.default_rng(0)
+    jds = 2415020.5 + rng.uniform(0, 73000, n_charts)
+    lats = rng.uniform(-60, 60, n_charts)
+    lons = rng.uniform(-180, 180, n_charts)
+
+    start = time.perf_counter()
+    batch = calc_positions(jds)
+    ascendant, mc = chart_angles(jds, lats, lons)
+    ephemeris = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = compute_shadbala(batch, ascendant, mc, lats, lons)
+    vectorized = time.perf_counter() - start
+
+    n_single = min(n_charts, 500)
+    start = time.perf_counter()
+    singles = []
+    for i in range(n_single):
+        one = calc_positions(jds[i])
+        asc, mid = chart_angles(jds[i], lats[i], lons[i])
+        singles.append(compute_shadbala(one, asc, mid, lats[i], lons[i]).total[0])
+    single = (time.perf_counter() - start) / n_single
+    drift = float(np.abs(np.array(singles) - batched.total[:n_single]).max())
+
+    print(f"charts:                 {n_charts}")
+    print(f"ephemeris + angles:     {n_charts / ephemeris:10.0f} charts/s")
+    print(f"shadbala (batched):     {n_charts / vectorized:10.0f} charts/s")
+    print(f"end to end (batched):   {n_charts / (ephemeris + vectorized):10.0f} charts/s")
+    print(f"end to end (one by one):{1 / single:10.0f} charts/s")
+    print(f"max deviation:          {drift:.2e} virupas")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,105 @@
+# benchmarks/bench_vargas.py
+#
+# Charts/second for all sixteen vargas (utils/vargas.py): one broadcast over
+# many charts' longitudes against mapping each planet and varga in Python,
+# and a full divisional report (D1-D60) the old way, with one ephemeris call
+# per planet per varga, against divisional_charts.calculate_divisional_chart
+# with its per-chart cache. Also checks the table against the textbook rules.
+#
+#   python -m benchmarks.bench_vargas [n_charts]
+
+import sys
+import time
+
+import numpy as np
+import swisseph as swe
+
+from utils.divisional_charts import PLANETS, calculate_divisional_chart
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.vargas import VARGA_NAMES, VARGAS, varga_signs
+
+
+def reference(lon, varga):
+    """Sign of one longitude in one varga, written out rule by rule."""
+    sign, deg = int(lon // 30) % 12, lon % 30
+    n = VARGAS[varga]
+    part = min(int(deg / (30 / n)), n - 1)
+    odd = sign % 2 == 0
+    movable, fixed = sign % 3 == 0, sign % 3 == 1
+    if varga == "D2":
+        return 4 if odd == (deg < 15) else 3
+    if varga == "D3":
+        return (sign + 4 * part) % 12
+    if varga == "D4":
+        return (sign + 3 * part) % 12
+    if varga == "D9":
+        first = {0: 0, 1: 9, 2: 6, 3: 3}[sign % 4]  # fire, earth, air, water: Aries, Capricorn, Libra, Cancer
+        return (first + part) % 12
+    if varga == "D27":
+        first = {0: 0, 1: 3, 2: 6, 3: 9}[sign % 4]  # Aries, Cancer, Libra, Capricorn
+        return (first + part) % 12
+    if varga == "D30":
+        bounds = [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)] if odd else [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)]
+        return next(s for bound, s in bounds if deg < bound)
+    first = {
+        "D1": sign, "D12": sign, "D60": sign,
+        "D7": sign if odd else sign + 6,
+        "D10": sign if odd else sign + 8,
+        "D16": 0 if movable else 4 if fixed else 8,
+        "D20": 0 if movable else 8 if fixed else 4,
+        "D24": 4 if odd else 3,
+        "D40": 0 if odd else 6,
+        "D45": 0 if movable else 4 if fixed else 8,
+    }[varga]
+    return (first + part) % 12
+
+
+def per_planet_report(jd, lat, lon):
+    """All vargas the way calculate_divisional_chart used to work: a calc_ut per planet per varga."""
+    context = DEFAULT_CONTEXT.with_topo(lon, lat, 0)
+    report = {}
+    for varga in VARGA_NAMES:
+        chart = {i: [] for i in range(12)}
+        for planet in PLANETS:
+            planet_lon = context.sidereal_longitude(jd, getattr(swe, planet.upper()))
+            chart[reference(planet_lon, varga)].append(planet)
+        report[varga] = chart
+    return report
+
+
+def run(n_charts=20000):
+    rng = np.random.default_rng(0)
+    longitudes = rng.uniform(0, 360, (n_charts, 9))
+
+    start = time.perf_counter()
+    table = varga_signs(longitudes)
+    batched = n_charts / (time.perf_counter() - start)
+
+    n_check = min(n_charts, 2000)
+    start = time.perf_counter()
+    expected = np.array([[[reference(lon, v) for v in VARGA_NAMES] for lon in row] for row in longitudes[:n_check]])
+    python = n_check / (time.perf_counter() - start)
+    mismatches = int((table[:n_check] != expected).sum())
+
+    n_report = 50
+    jds = 2415020.5 + rng.uniform(0, 73000, n_report)
+    lats, lons = rng.uniform(-60, 60, n_report), rng.uniform(-180, 180, n_report)
+    start = time.perf_counter()
+    old = [per_planet_report(jds[i], lats[i], lons[i]) for i in range(n_report)]
+    old_rate = n_report / (time.perf_counter() - start)
+    start = time.perf_counter()
+    new = [{v: calculate_divisional_chart(jds[i], lats[i], lons[i], v) for v in VARGA_NAMES} for i in range(n_report)]
+    new_rate = n_report / (time.perf_counter() - start)
+    mismatches += sum(a != b for a, b in zip(old, new))
+
+    print(f"charts:                 {n_charts}  (9 planets, {len(VARGAS)} vargas)")
+    print(f"varga_signs (batched):  {batched:10.0f} charts/s")
+    print(f"per planet in Python:   {python:10.0f} charts/s")
+    print(f"full report, old:       {old_rate:10.0f} charts/s  (calc_ut per planet per varga)")
+    print(f"full report, new:       {new_rate:10.0f} charts/s  (one ephemeris pass, cached vargas)")
+    print(f"mismatches:             {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000) else 0)
@@ -0,0 +1,86 @@
+# benchmarks/bench_yogas.py
+#
+# Charts/second for the compiled yoga rules (utils/yoga_rules.py) on random
+# charts: the built-in catalogue, and the catalogue padded with random
+# synthetic rules to 4x and 16x its size, against evaluating the same
+# clauses chart by chart in Python. Also checks that both agree.
+#
+#   python -m benchmarks.bench_yogas [n_charts]
+
+import sys
+import time
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.interpretations import YOGAS
+from utils.yoga_rules import (
+    PLANET_NAMES, Rule, all_of, any_of, compile_rules, detect, encode, evaluate, from_planet, in_house, in_sign,
+    lord_in, negate,
+)
+
+SCALES = [1, 4, 16]
+
+
+def random_rules(n, rng):
+    """Distinct synthetic rules: 1-3 clauses of 1-4 random (possibly negated) atoms."""
+    def atom():
+        kind = rng.integers(4)
+        planet, other = (PLANET_NAMES[i] for i in rng.choice(len(PLANET_NAMES), 2, replace=False))
+        house, sign = int(rng.integers(1, 13)), SIGN_NAMES[rng.integers(12)]
+        cond = [in_house(planet, house), in_sign(planet, sign), from_planet(planet, other, house),
+                lord_in(house, int(rng.integers(1, 13)))][kind]
+        return negate(cond) if rng.random() < 0.2 else cond
+
+    return [
+        Rule(f"Synthetic {i}", any_of(*(all_of(*(atom() for _ in range(rng.integers(1, 5))))
+                                        for _ in range(rng.integers(1, 4)))), 5, "", "")
+        for i in range(n)
+    ]
+
+
+def interpreted(rules, signs, lagna):
+    matches = np.zeros((len(signs), len(rules)), dtype=bool)
+    for row in range(len(signs)):
+        features = encode(signs[row], lagna[row])[:, 0]
+        for col, rule in enumerate(rules):
+            matches[row, col] = any(all(features[lit] for lit in clause) for clause in rule.clauses)
+    return matches
+
+
+def run(n_charts=20000):
+    rng = np.random.default_rng(0)
+    signs = rng.integers(0, 12, (n_charts, 9))
+    lagna = rng.integers(0, 12, n_charts)
+    synthetic = random_rules(len(YOGAS) * (max(SCALES) - 1), rng)
+
+    n_check = min(n_charts, 300)
+    start = time.perf_counter()
+    expected = interpreted(YOGAS, signs[:n_check], lagna[:n_check])
+    baseline = n_check / (time.perf_counter() - start)
+    print(f"charts:             {n_charts}")
+    print(f"per-chart Python:   {baseline:10.0f} charts/s  ({len(YOGAS)} rules)")
+
+    mismatches = int((evaluate(compile_rules(YOGAS), signs[:n_check], lagna[:n_check]) != expected).sum())
+    for scale in SCALES:
+        rules = YOGAS + synthetic[:len(YOGAS) * (scale - 1)]
+        compiled = compile_rules(rules)
+        start = time.perf_counter()
+        matches = evaluate(compiled, signs, lagna)
+        batch = n_charts / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for row in range(1000):
+            detect(compiled, signs[row], lagna[row])
+        single = (time.perf_counter() - start) * 1e3
+        print(f"compiled x{scale:<3}        {batch:10.0f} charts/s  {single:7.1f} us/chart single  "
+              f"({len(rules)} rules, {len(compiled.clause_ids)} clauses)")
+        if scale > 1:
+            check = interpreted(rules[len(YOGAS):], signs[:50], lagna[:50])
+            mismatches += int((matches[:50, len(YOGAS):] != check).sum())
+
+    print(f"mismatches:         {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000) else 0)
@@ -1,9 +1,44 @@
-from fastapi import FastAPI, Query
-from utils.kundli import generate_kundli_chart
-import swisseph as swe
+from fastapi import Body, FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from utils.kundli import generate_kundli_chart, get_julian_day
+from utils.kundli_batch import parse_records, shutdown_pool, stream_kundli_batch
+from utils.muhurat_search import iter_muhurat_range, stream_muhurat_search
+from utils.report_assets import iter_chunks
+from utils.report_cache import etag, etag_matches, report_key
+from utils.report_jobs import QueueFull, get_job_queue, render_report, resolve_params, shutdown_job_queue
 
 app = FastAPI()
 
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_pool()
+    shutdown_job_queue()
+
+def pdf_response(data: bytes, filename: str, key: str = None):
+    """Streams PDF bytes; `key` (the report cache key) becomes the ETag."""
+    headers = {"Content-Disposition": f'inline; filename="{filename}"', "Content-Length": str(len(data))}
+    if key:
+        headers.update({"ETag": etag(key), "Cache-Control": "no-cache"})
+    return StreamingResponse(iter_chunks(data), media_type="application/pdf", headers=headers)
+
+def not_modified(key: str):
+    return Response(status_code=304, headers={"ETag": etag(key), "Cache-Control": "no-cache"})
+
+def cached_pdf_response(request: Request, kind: str, params: dict, filename: str):
+    """
+    Serves a report from the content-addressed cache, rendering it on a miss.
+    A matching If-None-Match gets 304 without rendering or reading anything.
+    """
+    params = resolve_params(kind, params)
+    key = report_key(kind, params)
+    if etag_matches(request.headers.get("if-none-match"), key):
+        return not_modified(key)
+    try:
+        key, data = render_report(kind, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return pdf_response(data, filename, key)
+
 @app.get("/")
 def root():
     return {"message": "Navadharma API is live 🎉"}
@@ -21,9 +56,90 @@ def get_kundli(
     system: str = Query("kp", enum=["vedic", "kp"], description="Astrological system: vedic or kp"),
     debug: bool = Query(False, description="Return raw debugging info")
 ):
-    # Adjust for timezone
-    utc_hour = hour - tz
-    jd = swe.julday(year, month, day, utc_hour + (minute / 60.0))
+    jd = get_julian_day(year, month, day, hour, minute, tz)
 
     chart = generate_kundli_chart(jd, latitude, longitude, tz, system, debug)
     return chart
+
+@app.post("/kundli/batch")
+async def post_kundli_batch(request: Request):
+    """
+    Body: JSON array or NDJSON of records with the same fields as GET /kundli.
+    Streams back NDJSON, one {"index", "result"|"error"} line per record, in input order.
+    """
+    body = await request.body()
+    try:
+        records = parse_records(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream_kundli_batch(records), media_type="application/x-ndjson")
+
+@app.get("/muhurat/search")
+def search_muhurats(
+    start_date: str = Query(..., description="First day to search (YYYY-MM-DD)"),
+    days: int = Query(30, description="Number of days to search"),
+    latitude: float = Query(..., description="Latitude of the event"),
+    longitude: float = Query(..., description="Longitude of the event"),
+    muhurat_type: str = Query("marriage", description="marriage, travel or business"),
+    top_k: int = Query(10, ge=1, le=100, description="Number of best windows in the final line")
+):
+    """
+    Streams NDJSON: one {"window"} line per qualifying window as it is found,
+    then a final {"top"} line with the best `top_k` windows.
+    """
+    try:
+        windows = iter_muhurat_range(start_date, days, latitude, longitude, muhurat_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream_muhurat_search(windows, top_k), media_type="application/x-ndjson")
+
+@app.post("/report/pdf")
+def post_report_pdf(request: Request, data: dict = Body(..., description="Report data: name, date, time, place, lagna, planets, ...")):
+    """Renders the prediction report PDF and streams it back."""
+    return cached_pdf_response(request, "report", data, "navadharma_report.pdf")
+
+@app.get("/prediction/daily/pdf")
+def get_daily_prediction_pdf(
+    request: Request,
+    name: str = Query(..., description="Name shown on the report"),
+    date: str = Query(..., description="Prediction date (YYYY-MM-DD)")
+):
+    return cached_pdf_response(request, "daily", {"name": name, "date": date}, "daily_prediction.pdf")
+
+@app.post("/report/jobs", status_code=202)
+def submit_report_job(
+    kind: str = Body(..., description="report, daily or prediction"),
+    params: dict = Body(..., description="Report inputs (report data; name/date; or name, date and optional birth_date/birth_time/birth_place for prediction)")
+):
+    """Queues a PDF report for background rendering; poll the status URL, then fetch the PDF."""
+    try:
+        job_id = get_job_queue().submit(kind, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job_id, "status": "pending", "status_url": f"/report/jobs/{job_id}"}
+
+@app.get("/report/jobs/{job_id}")
+def get_report_job(job_id: str):
+    status = get_job_queue().status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired report job")
+    if status["status"] == "done":
+        status["result_url"] = f"/report/jobs/{job_id}/pdf"
+    return status
+
+@app.get("/report/jobs/{job_id}/pdf")
+def get_report_job_pdf(request: Request, job_id: str):
+    queue = get_job_queue()
+    status = queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired report job")
+    if status["status"] == "failed":
+        raise HTTPException(status_code=422, detail=status["error"])
+    pdf = queue.result(job_id)
+    if pdf is None:
+        raise HTTPException(status_code=409, detail=f"Report is {status['status']}")
+    if etag_matches(request.headers.get("if-none-match"), status["key"]):
+        return not_modified(status["key"])
+    return pdf_response(pdf, f"{status['kind']}_{job_id}.pdf", status["key"])
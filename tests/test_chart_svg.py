@@ -0,0 +1,15 @@
+from utils.chart_svg import render_chart, save_chart
+
+CHART = {0: ["Sun", "Moon"], 4: ["Mars"], 9: ["Jupiter", "Saturn"]}
+
+
+def test_svg_render_places_planets():
+    svg = render_chart(CHART, "D9", "south", ascendant=1).decode("utf-8")
+    assert svg.startswith("<svg") and "Ta (Asc)" in svg and ">Ju<" in svg
+
+
+def test_png_output_needs_no_optional_package(tmp_path):
+    for style in ("south", "north"):
+        path = save_chart(CHART, "D9", style, ascendant=1, fmt="png", directory=str(tmp_path))
+        with open(path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
@@ -0,0 +1,47 @@
+import pytest
+
+from utils import geolocation
+from utils.gazetteer import Gazetteer, build_index, read_seed
+from utils.geocode_cache import GeocodeCache
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer(build_index(read_seed()))
+
+
+@pytest.mark.parametrize("query", [
+    "Nagaur", "Patan", "Rampur",                            # near misses of Nagpur, Patna, Raipur
+    "Paris, Texas", "London, Ontario", "Sydney, Canada",    # qualifier rules out the indexed city
+])
+def test_lookup_returns_only_exact_matches(gazetteer, query):
+    assert gazetteer.lookup(query) is None
+
+
+@pytest.mark.parametrize("query, name, country", [
+    ("Nagpur", "Nagpur", "IN"),
+    ("Bombay", "Mumbai", "IN"),
+    ("Paris, France", "Paris", "FR"),
+    ("Hyderabad", "Hyderabad", "IN"),
+    ("Hyderabad, Pakistan", "Hyderabad", "PK"),
+    ("Mumbai, IN", "Mumbai", "IN"),
+])
+def test_lookup_exact_matches(gazetteer, query, name, country):
+    place = gazetteer.lookup(query)
+    assert (place.name, place.country) == (name, country)
+
+
+def test_search_keeps_near_misses_as_suggestions(gazetteer):
+    assert [p.name for p in gazetteer.search("Nagaur")][:1] == ["Nagpur"]
+    assert gazetteer.search("Sydney, Canada") == []
+
+
+def test_unmatched_place_falls_through_to_online_geocoder(tmp_path, monkeypatch):
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite3"))
+    queried = []
+    monkeypatch.setattr(geolocation, "get_geocode_cache", lambda: cache)
+    monkeypatch.setattr(geolocation, "geocode_online", lambda location: queried.append(location) or (27.2, 73.73))
+
+    lat, lon, tz = geolocation.get_lat_lon_timezone("Nagaur")
+    assert queried == ["Nagaur"]
+    assert (lat, lon, tz) == (27.2, 73.73, "Asia/Kolkata")
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from utils.chart_context import ChartContext
+from utils.flatlib_strength import get_planetary_strength_flatlib
+from utils.shadbala import chart_angles, shadbala_for_charts
+from utils.summary import generate_summary
+
+TROMSO = (69.65, 18.96)
+
+
+def test_chart_angles_above_the_polar_circle():
+    ascendant, mc = chart_angles(2460000.5, *TROMSO)
+    assert 0 <= ascendant[0] < 360 and 0 <= mc[0] < 360
+
+
+def test_angles_match_placidus_where_it_works():
+    ctx = ChartContext.from_datetime("1990-05-17T06:30:00", 28.61, 77.21)
+    _, ascmc = ctx.ephemeris.houses(ctx.jd, 28.61, 77.21, b'P')
+    ayanamsa = float(ctx.batch.ayanamsa[0])
+    assert ctx.angles == pytest.approx(((ascmc[0] - ayanamsa) % 360, (ascmc[1] - ayanamsa) % 360))
+
+
+def test_polar_chart_does_not_abort_a_batch():
+    result = shadbala_for_charts([2460000.5, 2460000.5], [28.61, TROMSO[0]], [77.21, TROMSO[1]])
+    assert np.isfinite(result.total).all()
+
+
+def test_strengths_and_summary_at_high_latitude():
+    strengths = get_planetary_strength_flatlib("1990-05-15T10:30:00", *TROMSO, 1.0)
+    assert set(strengths) >= {"Sun", "Moon", "Saturn"}
+    summary = generate_summary("1990-05-15T10:30:00", *TROMSO, 1.0)
+    assert summary
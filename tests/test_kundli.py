@@ -0,0 +1,22 @@
+import pytest
+
+from utils.ascendant import lagna_at
+from utils.chart import Chart
+from utils.kundli import KP_CONTEXT, generate_kundli_chart, get_julian_day
+
+DELHI = (28.61, 77.21)
+
+
+def test_kundli_chart_is_sidereal_throughout(monkeypatch):
+    built = []
+    from_batch = Chart.from_batch.__func__
+    monkeypatch.setattr(Chart, "from_batch", classmethod(lambda cls, *a, **kw: built.append(from_batch(cls, *a, **kw)) or built[-1]))
+
+    jd = get_julian_day(1990, 5, 17, 6, 30, 5.5)
+    chart = generate_kundli_chart(jd, *DELHI)["chart"]
+    (natal,) = built
+    ayanamsa = KP_CONTEXT.ayanamsa(jd)
+
+    assert natal.ascendant == pytest.approx((chart["ascendant"] - ayanamsa) % 360, abs=1e-3)
+    assert natal.lagna == lagna_at(jd, *DELHI, KP_CONTEXT).sign
+    assert natal.to_dict()["ascendant"]["sign"] == natal.house_chart()["houses"][0]["sign"]
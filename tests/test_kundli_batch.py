@@ -0,0 +1,16 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.kundli_batch import parse_records
+
+
+def test_parse_records_rejects_non_utf8_body():
+    with pytest.raises(ValueError, match="not valid UTF-8"):
+        parse_records(b'[{"name": "\xff"}]')
+
+
+def test_batch_endpoint_answers_400_for_non_utf8_body():
+    response = TestClient(app).post("/kundli/batch", content=b"\xff\xfe{}")
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
@@ -0,0 +1,19 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.muhurat_search import stream_muhurat_search
+
+PARAMS = {"start_date": "2024-01-01", "days": 1, "latitude": 28.61, "longitude": 77.21}
+
+
+@pytest.mark.parametrize("top_k", [0, -1, 101])
+def test_search_rejects_out_of_range_top_k(top_k):
+    response = TestClient(app).get("/muhurat/search", params={**PARAMS, "top_k": top_k})
+    assert response.status_code == 422
+
+
+def test_stream_with_no_slots_for_top_windows():
+    windows = [{"start": "06:00", "score": 80, "duration_minutes": 45}]
+    lines = list(stream_muhurat_search(iter(windows), top_k=0))
+    assert lines[-1] == '{"top": []}\n'
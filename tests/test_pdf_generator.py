@@ -0,0 +1,24 @@
+from utils import pdf_generator
+
+
+def _record_contexts(monkeypatch):
+    seen = []
+    monkeypatch.setattr(pdf_generator, "get_transit_effects", lambda ctx: seen.append(ctx) or [])
+    return seen
+
+
+def test_transits_are_judged_from_the_natal_chart(monkeypatch):
+    seen = _record_contexts(monkeypatch)
+    pdf = pdf_generator.generate_pdf_prediction_report(
+        "A", "2024-03-01", birth_date="1990-05-17", birth_time="06:30", birth_place="Delhi, India"
+    )
+    assert pdf.startswith(b"%PDF")
+    (natal,) = seen
+    assert natal.local_datetime.strftime("%Y-%m-%d %H:%M") == "1990-05-17 06:30"
+    assert natal.transit_jd - natal.jd > 30 * 365
+
+
+def test_natal_sections_need_birth_data(monkeypatch):
+    seen = _record_contexts(monkeypatch)
+    assert pdf_generator.generate_pdf_prediction_report("A", "2024-03-01").startswith(b"%PDF")
+    assert seen == []
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import report_cache
+from utils.report_cache import etag, etag_matches, report_key
+from utils.report_jobs import resolve_params
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "REPORT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_prediction_without_date_is_keyed_on_today(monkeypatch):
+    params = resolve_params("prediction", {"name": "A"})
+    assert params == {"name": "A", "date": datetime.today().strftime("%Y-%m-%d"),
+                      "time": "12:00", "place": "Delhi, India"}
+    tomorrow = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+    assert report_key("prediction", params) != report_key("prediction", {**params, "date": tomorrow})
+
+
+def test_explicit_prediction_inputs_are_kept():
+    params = {"name": "A", "date": "2024-01-02", "time": "06:30", "place": "Pune, India"}
+    assert resolve_params("prediction", params) == params
+    assert resolve_params("daily", {"name": "A", "date": "2024-01-02"}) == {"name": "A", "date": "2024-01-02"}
+
+
+def test_wildcard_etag_needs_a_cached_report(cache_dir):
+    key = report_key("daily", {"name": "A", "date": "2024-01-02"})
+    assert not etag_matches("*", key)
+    report_cache.store(key, b"%PDF-")
+    assert etag_matches("*", key)
+    assert etag_matches(f"W/{etag(key)}", key)
+    assert not etag_matches('"other"', key)
+
+
+def test_code_version_covers_computation_modules(tmp_path, monkeypatch):
+    for name in ("pdf_generator.py", "shadbala.py"):
+        (tmp_path / name).write_text("x = 1\n")
+    monkeypatch.delenv("REPORT_CODE_VERSION", raising=False)
+    monkeypatch.setattr(report_cache, "UTILS_DIR", str(tmp_path))
+    report_cache.code_version.cache_clear()
+    try:
+        before = report_cache.code_version()
+        (tmp_path / "shadbala.py").write_text("x = 2\n")
+        report_cache.code_version.cache_clear()
+        assert report_cache.code_version() != before
+    finally:
+        report_cache.code_version.cache_clear()
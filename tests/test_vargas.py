@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from utils.divisional_charts import calculate_divisional_chart, get_divisional_sign
+from utils.vargas import VARGA_NAMES, varga_signs
+
+
+@pytest.mark.parametrize("longitude, varga, sign", [
+    (35.0, "D9", 10),     # Taurus 5°: second navamsa from Capricorn, Aquarius
+    (16.0, "D2", 3),      # Aries, second hora: Cancer
+    (45.0, "D3", 5),      # Taurus 15°: second drekkana, the 5th from Taurus, Virgo
+    (33.0, "D30", 1),     # Taurus 3°: Venus's trimsamsa, Taurus
+    (0.1, "D60", 0),
+])
+def test_varga_rules(longitude, varga, sign):
+    assert get_divisional_sign(longitude, int(varga[1:])) == sign
+    assert varga_signs(longitude, (varga,))[0] == sign
+
+
+def test_all_vargas_in_one_pass():
+    signs = varga_signs(np.array([[10.0, 200.0]]))
+    assert signs.shape == (1, 2, len(VARGA_NAMES))
+    assert signs[0, :, 0].tolist() == [0, 6]
+
+
+def test_divisional_chart_above_the_polar_circle():
+    chart = calculate_divisional_chart(2460000.5, 69.65, 18.96)
+    assert sorted(p for planets in chart.values() for p in planets) == sorted(
+        ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"])
+
+
+def test_unknown_divisional_chart_is_rejected():
+    with pytest.raises(ValueError, match="D5"):
+        calculate_divisional_chart(2460000.5, 28.61, 77.21, "D5")
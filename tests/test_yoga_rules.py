@@ -0,0 +1,38 @@
+import pytest
+
+from utils.interpretations import compiled_yogas
+from utils.yoga_rules import detect
+
+# Sign of each planet: Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn, Rahu, Ketu; Aries lagna
+AMALA = [0, 3, 5, 7, 9, 1, 6, 2, 8]              # Jupiter alone in the 10th, Venus in the 2nd
+NEECHA_BHANGA = [4, 3, 1, 5, 9, 6, 0, 2, 8]      # Jupiter debilitated, Saturn in the 1st; Mars, also a canceller, is not in a kendra
+
+
+def _active(signs, lord):
+    return {y["name"] for y in detect(compiled_yogas(), signs, 0, lord) if y["active"]}
+
+
+def _names(signs):
+    return {y["name"] for y in detect(compiled_yogas(), signs, 0)}
+
+
+def test_amala_is_active_only_for_the_planet_that_forms_it():
+    assert "Amala Yoga" in _names(AMALA)
+    assert "Amala Yoga" in _active(AMALA, "Jupiter")
+    assert "Amala Yoga" not in _active(AMALA, "Venus")
+
+
+@pytest.mark.parametrize("lord, active", [("Jupiter", True), ("Saturn", True), ("Mars", False), ("Venus", False)])
+def test_neecha_bhanga_is_active_for_the_debilitated_planet_and_the_canceller_that_holds(lord, active):
+    assert "Neecha Bhanga Raja Yoga" in _names(NEECHA_BHANGA)
+    assert ("Neecha Bhanga Raja Yoga" in _active(NEECHA_BHANGA, lord)) is active
+
+
+def test_fixed_participants_still_count():
+    # Kemadruma has only negated atoms; the Moon takes part through Rule.planets
+    lonely_moon = [0, 6, 0, 0, 0, 0, 0, 2, 8]
+    assert "Kemadruma Yoga" in _active(lonely_moon, "Moon")
+
+
+def test_no_dasha_lord_means_nothing_active():
+    assert not any(y["active"] for y in detect(compiled_yogas(), AMALA, 0))
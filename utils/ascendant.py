@@ -0,0 +1,141 @@
+# utils/ascendant.py
+
+"""
+Lagna (rising sign) ingress tables.
+
+The ecliptic point at tropical longitude λ is on the eastern horizon when
+local sidereal time equals RAMC = α − arccos(−tan φ · tan δ), α and δ being
+the point's right ascension and declination. Solving that for the 12 sign
+cusps gives a day's sign changes from one sidereal-time, one obliquity and
+one ayanamsa lookup, with no swe.houses calls. Tables are cached per UT
+date and location, so "lagna at this minute" is a bisect.
+
+Inside the polar circles parts of the ecliptic never rise, so tables are
+only built up to MAX_TABLE_LATITUDE; lagna_at falls back to swe.houses there.
+"""
+
+import math
+import os
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+
+import swisseph as swe
+
+from utils.ephemeris import DEFAULT_CONTEXT
+
+SIGN_NAMES = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+
+SIDEREAL_RATE = 360.98564736629  # degrees of Earth rotation per UT day
+MAX_TABLE_LATITUDE = 66.0
+LAGNA_CACHE_SIZE = int(os.getenv("LAGNA_CACHE_SIZE", "4096"))
+# Locations are rounded before caching; 4 decimals is ~11 m
+LOCATION_PRECISION = 4
+
+# One UT day: signs[i] rises from times[i]; times[0] is the day start
+LagnaTable = namedtuple("LagnaTable", ["start", "end", "times", "signs"])
+LagnaSpan = namedtuple("LagnaSpan", ["sign", "name", "start", "end"])
+
+
+def ascendant_longitude(ramc, lat, eps):
+    """Tropical ecliptic longitude on the eastern horizon for a given RAMC (all degrees)."""
+    theta, phi, e = math.radians(ramc), math.radians(lat), math.radians(eps)
+    lam = math.atan2(math.cos(theta), -(math.sin(theta) * math.cos(e) + math.tan(phi) * math.sin(e)))
+    return math.degrees(lam) % 360
+
+
+def rising_ramc(lon, lat, eps):
+    """RAMC (degrees) at which tropical ecliptic longitude `lon` rises."""
+    lam, phi, e = math.radians(lon), math.radians(lat), math.radians(eps)
+    ra = math.atan2(math.sin(lam) * math.cos(e), math.cos(lam))
+    dec = math.asin(math.sin(e) * math.sin(lam))
+    return math.degrees(ra - math.acos(-math.tan(phi) * math.tan(dec))) % 360
+
+
+@lru_cache(maxsize=LAGNA_CACHE_SIZE)
+def _day_table(day_jd, lat, lon, context, sidereal):
+    context.activate()
+    eps = swe.calc_ut(day_jd + 0.5, swe.ECL_NUT)[0][0]
+    ayanamsa = context.ayanamsa(day_jd + 0.5) if sidereal else 0.0
+    ramc0 = (swe.sidtime(day_jd) * 15.0 + lon) % 360
+
+    events = []
+    for sign in range(12):
+        t = day_jd + ((rising_ramc(sign * 30 + ayanamsa, lat, eps) - ramc0) % 360) / SIDEREAL_RATE
+        while t < day_jd + 1:
+            events.append((t, sign))
+            t += 360 / SIDEREAL_RATE
+    events.sort()
+
+    first = int(((ascendant_longitude(ramc0, lat, eps) - ayanamsa) % 360) // 30)
+    return LagnaTable(
+        day_jd, day_jd + 1,
+        (day_jd,) + tuple(t for t, _ in events),
+        (first,) + tuple(sign for _, sign in events),
+    )
+
+
+def get_lagna_table(jd, lat, lon, context=DEFAULT_CONTEXT, sidereal=True):
+    """
+    Sign changes over the UT day containing `jd` at one location: 12 or 13
+    ingress instants (a sidereal day is ~4 minutes shorter than a solar day).
+    Sidereal signs use the context's ayanamsa; `sidereal=False` gives
+    tropical signs.
+    """
+    if abs(lat) > MAX_TABLE_LATITUDE:
+        raise ValueError(f"No lagna table above {MAX_TABLE_LATITUDE}° latitude")
+    day_jd = math.floor(jd - 0.5) + 0.5
+    return _day_table(day_jd, round(lat, LOCATION_PRECISION), round(lon, LOCATION_PRECISION), context, sidereal)
+
+
+def lagna_spans(start_jd, end_jd, lat, lon, context=DEFAULT_CONTEXT, sidereal=True):
+    """Rising-sign spans covering [start_jd, end_jd], stitched from daily tables; the ends are clipped to the window."""
+    times, signs = [], []
+    jd = start_jd
+    while True:
+        table = get_lagna_table(jd, lat, lon, context, sidereal)
+        for t, sign in zip(table.times, table.signs):
+            if not signs or sign != signs[-1]:
+                times.append(t)
+                signs.append(sign)
+        if table.end > end_jd:
+            break
+        jd = table.end
+
+    i = max(bisect_right(times, start_jd) - 1, 0)
+    spans = []
+    for k in range(i, len(times)):
+        start = max(times[k], start_jd)
+        end = min(times[k + 1], end_jd) if k + 1 < len(times) else end_jd
+        if start >= end_jd:
+            break
+        spans.append(LagnaSpan(signs[k], SIGN_NAMES[signs[k]], start, end))
+    return spans
+
+
+def lagna_at(jd, lat, lon, context=DEFAULT_CONTEXT, sidereal=True):
+    """
+    LagnaSpan rising at `jd`, with the instants it rose and will set
+    (clipped to ±12h). Falls back to swe.houses, without the span bounds,
+    inside the polar circles.
+    """
+    if abs(lat) > MAX_TABLE_LATITUDE:
+        # Placidus is undefined in the polar circles; the ascendant is the same in any system
+        _, ascmc = context.houses(jd, lat, lon, b'E')
+        asc = (ascmc[0] - (context.ayanamsa(jd) if sidereal else 0.0)) % 360
+        sign = int(asc // 30)
+        return LagnaSpan(sign, SIGN_NAMES[sign], None, None)
+    spans = lagna_spans(jd - 0.5, jd + 0.5, lat, lon, context, sidereal)
+    starts = [span.start for span in spans]
+    return spans[bisect_right(starts, jd) - 1]
+
+
+def cache_stats():
+    return _day_table.cache_info()
+
+
+def clear_cache():
+    _day_table.cache_clear()
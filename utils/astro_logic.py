@@ -1,7 +1,7 @@
 import swisseph as swe
 from utils.location_utils import get_timezone_offset
 from datetime import datetime
-from timezonefinder import TimezoneFinder
+from utils.ephemeris import DEFAULT_CONTEXT
 
 def get_julian_day(date_str, time_str):
     """
@@ -14,7 +14,7 @@ def get_moon_longitude(jd):
     """
     Returns the moon longitude for a given Julian day.
     """
-    moon_pos = swe.calc_ut(jd, swe.MOON)[0]
+    moon_pos = DEFAULT_CONTEXT.calc(jd, swe.MOON)
     return moon_pos[0]
 
 def get_nakshatra(moon_longitude):
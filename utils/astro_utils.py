@@ -2,8 +2,9 @@ import swisseph as swe
 import datetime
 import pytz
 from typing import Dict
-
-swe.set_ephe_path('.')  # Set to ephemeris directory if needed
+from utils.ascendant import SIGN_NAMES
+from utils.ephemeris import calc_positions
+from utils.vargas import varga_signs
 
 def get_julian_day(date_str: str, time_str: str, timezone="Asia/Kolkata"):
     dt = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
@@ -13,40 +14,16 @@ def get_julian_day(date_str: str, time_str: str, timezone="Asia/Kolkata"):
                       utc_dt.hour + utc_dt.minute / 60.0)
 
 def get_planet_positions(jd: float, lat: float, lon: float) -> Dict[str, float]:
-    planets = {
-        "Sun": swe.SUN,
-        "Moon": swe.MOON,
-        "Mars": swe.MARS,
-        "Mercury": swe.MERCURY,
-        "Jupiter": swe.JUPITER,
-        "Venus": swe.VENUS,
-        "Saturn": swe.SATURN,
-        "Rahu": swe.MEAN_NODE,
-        "Ketu": swe.TRUE_NODE,  # Ketu = 180° from Rahu
+    batch = calc_positions(jd)
+    return {
+        name: round(float(batch.tropical[0, i]), 2)
+        for i, name in enumerate(batch.names)
     }
 
-    positions = {}
-    for name, pid in planets.items():
-        lon, _ = swe.calc_ut(jd, pid)[0:2]
-        positions[name] = round(lon % 360, 2)
-
-    # Ketu = Rahu + 180
-    positions["Ketu"] = round((positions["Rahu"] + 180) % 360, 2)
-    return positions
-
 def get_divisional_chart(planet_positions: Dict[str, float], division: int) -> Dict[str, str]:
     """Returns the sign name for each planet in the specified divisional chart"""
-    rasi_names = [
-        "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-        "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-    ]
-    chart = {}
-    for planet, lon in planet_positions.items():
-        division_size = 30 / division
-        division_number = int((lon % 30) / division_size)
-        sign_index = (int(lon // 30) + division_number) % 12
-        chart[planet] = rasi_names[sign_index]
-    return chart
+    signs = varga_signs(list(planet_positions.values()), (f"D{division}",))[:, 0]
+    return {planet: SIGN_NAMES[sign] for planet, sign in zip(planet_positions, signs.tolist())}
 
 def determine_yogas(planet_positions: Dict[str, float]) -> list:
     yogas = []
@@ -0,0 +1,173 @@
+# utils/chart.py
+
+"""
+Compact natal chart shared between modules.
+
+A Chart keeps one moment's planets as arrays indexed like `names`: the
+sidereal longitudes as float64, and sign, whole-sign house, nakshatra and
+pada as the rows of one small int8 array. The dicts keyed by planet name
+and the JSON shapes older code and the API expect ("planet_positions",
+"planets", "houses") are built from those arrays on request; those
+views and the signs in the sixteen vargas are memoized per chart and
+must be treated as read-only.
+"""
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.kundli import NAKSHATRA_LORDS, NAKSHATRAS, SIGN_LORDS
+from utils.vargas import varga_signs
+
+NAKSHATRA_SPAN = 360 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+
+# Rows of Chart.codes
+SIGN, HOUSE, NAKSHATRA, PADA = range(4)
+
+
+class Chart:
+    __slots__ = ("names", "jd", "longitude", "speed", "codes", "lagna", "ascendant", "cusps", "_views")
+
+    def __init__(self, names, longitude, lagna, jd=None, speed=None, ascendant=None, cusps=None):
+        """
+        `longitude` (sidereal degrees) and `speed` (degrees/day) follow
+        `names`; `lagna` is the rising sign (0 = Aries), `ascendant` its
+        longitude and `cusps` the twelve house cusps, when known.
+        """
+        self.names = tuple(names)
+        self.jd = jd
+        self.longitude = np.asarray(longitude, dtype=np.float64) % 360
+        self.speed = None if speed is None else np.asarray(speed, dtype=np.float64)
+        self.lagna = int(lagna) % 12
+        self.ascendant = ascendant
+        self.cusps = None if cusps is None else np.asarray(cusps, dtype=np.float64)
+
+        nakshatra = np.minimum(self.longitude // NAKSHATRA_SPAN, 26)
+        codes = np.empty((4, len(self.names)), dtype=np.int8)
+        codes[SIGN] = self.longitude // 30
+        codes[HOUSE] = (codes[SIGN] - self.lagna) % 12 + 1
+        codes[NAKSHATRA] = nakshatra
+        codes[PADA] = np.minimum((self.longitude - nakshatra * NAKSHATRA_SPAN) // PADA_SPAN, 3) + 1
+        self.codes = codes
+        self._views = {}
+
+    @classmethod
+    def from_batch(cls, batch, lagna, row=0, **kwargs):
+        """From one row of a PositionBatch (utils.ephemeris.calc_positions)."""
+        return cls(batch.names, batch.sidereal[row], lagna, jd=float(batch.jd[row]), speed=batch.speed[row], **kwargs)
+
+    @classmethod
+    def from_positions(cls, positions, lagna, **kwargs):
+        """From a {planet: sidereal longitude} dict."""
+        return cls(positions.keys(), list(positions.values()), lagna, **kwargs)
+
+    def __repr__(self):
+        return f"Chart({SIGN_NAMES[self.lagna]} lagna, {len(self.names)} planets, jd={self.jd})"
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        return self.names.index(name)
+
+    @property
+    def sign(self):
+        return self.codes[SIGN]
+
+    @property
+    def house(self):
+        return self.codes[HOUSE]
+
+    @property
+    def nakshatra(self):
+        return self.codes[NAKSHATRA]
+
+    @property
+    def pada(self):
+        return self.codes[PADA]
+
+    def _view(self, key, build):
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = build()
+        return view
+
+    # Dict views, keyed by planet name
+
+    @property
+    def positions(self):
+        """Sidereal longitude."""
+        return self._view("positions", lambda: dict(zip(self.names, self.longitude.tolist())))
+
+    @property
+    def signs(self):
+        """Sign index (0 = Aries)."""
+        return self._view("signs", lambda: dict(zip(self.names, self.sign.tolist())))
+
+    @property
+    def sign_names(self):
+        return self._view("sign_names", lambda: {n: SIGN_NAMES[s] for n, s in zip(self.names, self.sign.tolist())})
+
+    @property
+    def planet_houses(self):
+        """Whole-sign house (1-12) from the lagna."""
+        return self._view("planet_houses", lambda: dict(zip(self.names, self.house.tolist())))
+
+    @property
+    def retrograde(self):
+        """Names of planets with negative speed (empty without speeds; the nodes always qualify)."""
+        if self.speed is None:
+            return []
+        return self._view("retrograde", lambda: [n for n, v in zip(self.names, self.speed.tolist()) if v < 0])
+
+    @property
+    def vargas(self):
+        """(planets, 16) int8 signs in every varga, columns in utils.vargas.VARGA_NAMES order."""
+        return self._view("vargas", lambda: varga_signs(self.longitude))
+
+    def nakshatra_of(self, name):
+        """{"nakshatra", "pada"} of a planet, as kundli.get_nakshatra_and_pada returns it."""
+        i = self.index(name)
+        return {"nakshatra": NAKSHATRAS[self.nakshatra[i]], "pada": int(self.pada[i])}
+
+    # JSON shapes
+
+    def planet_positions(self, digits=4):
+        """{planet: rounded longitude}, the "planet_positions" of a kundli chart."""
+        return dict(zip(self.names, np.round(self.longitude, digits).tolist()))
+
+    def house_chart(self, digits=2):
+        """{"houses": [{"house", "sign", "planets": ["Sun (12.34°)", ...]}]}, houses 1-12 from the lagna."""
+        degrees = np.round(self.longitude % 30, digits).tolist()
+        houses = [{"house": h, "sign": SIGN_NAMES[(self.lagna + h - 1) % 12], "planets": []} for h in range(1, 13)]
+        for name, house, degree in zip(self.names, self.house.tolist(), degrees):
+            houses[house - 1]["planets"].append(f"{name} ({degree:.{digits}f}°)")
+        return {"houses": houses}
+
+    def to_dict(self, digits=4):
+        """
+        {"planets": {name: {longitude, sign, degree, house, nakshatra, pada,
+        nakshatra_lord, retrograde}}, "ascendant": {sign, lord, longitude}}.
+        """
+        longitude = np.round(self.longitude, digits).tolist()
+        degree = np.round(self.longitude % 30, digits).tolist()
+        speed = self.speed.tolist() if self.speed is not None else [0.0] * len(self.names)
+        sign, house, nakshatra, pada = self.codes.tolist()
+        planets = {
+            name: {
+                "longitude": longitude[i],
+                "sign": SIGN_NAMES[sign[i]],
+                "degree": degree[i],
+                "house": house[i],
+                "nakshatra": NAKSHATRAS[nakshatra[i]],
+                "pada": pada[i],
+                "nakshatra_lord": NAKSHATRA_LORDS[nakshatra[i] % 9],
+                "retrograde": speed[i] < 0,
+            }
+            for i, name in enumerate(self.names)
+        }
+        lagna = SIGN_NAMES[self.lagna]
+        ascendant = {"sign": lagna, "lord": SIGN_LORDS[lagna]}
+        if self.ascendant is not None:
+            ascendant["longitude"] = round(self.ascendant, digits)
+        return {"planets": planets, "ascendant": ascendant}
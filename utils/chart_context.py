@@ -0,0 +1,171 @@
+# utils/chart_context.py
+
+"""
+One chart (a moment at a place) shared by everything a request computes.
+
+Report builders used to pass (date, time, place) to each sub-module, and
+each one geocoded the place, converted to a Julian day and ran the
+ephemeris again. A ChartContext is created once per request instead; its
+attributes are computed on first access and memoized, so every consumer
+reads the same location, JD, positions, whole-sign houses, angles, lagna,
+nakshatra, dasha and transits. The natal planets are held in one compact Chart (`chart`), whose
+memoized views back `positions`, `signs` and `planet_houses`. Instances
+are cheap and not shared between requests.
+"""
+
+from datetime import datetime
+from functools import cached_property
+
+from pytz import timezone
+
+from utils.ascendant import SIGN_NAMES, lagna_at
+from utils.chart import Chart
+from utils.dasha_calculator import get_dasha_periods
+from utils.ephemeris import DEFAULT_CONTEXT, PLANETS, calc_positions
+from utils.geolocation import get_lat_lon_timezone
+from utils.kundli import describe_lagna
+from utils.panchanga import get_timezone_name, local_to_jd
+from utils.vargas import varga_positions
+
+DATE_FORMATS = ["%Y-%m-%d", "%d-%m-%Y"]
+
+
+def _parse_date(date):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognized date: {date} (expected YYYY-MM-DD or DD-MM-YYYY)")
+
+
+class ChartContext:
+    def __init__(self, date, time="12:00", place=None, latitude=None, longitude=None, name=None,
+                 transit_date=None, ephemeris=DEFAULT_CONTEXT):
+        """
+        `place` is geocoded on first use unless `latitude`/`longitude` are
+        given. `transit_date` (YYYY-MM-DD, local noon) is the moment for
+        `transits`; it defaults to now.
+        """
+        if place is None and (latitude is None or longitude is None):
+            raise ValueError("Either a place or latitude/longitude is required")
+        self.name = name
+        self.date = date
+        self.time = time
+        self.place = place
+        self._coords = (latitude, longitude) if latitude is not None and longitude is not None else None
+        self.transit_date = transit_date
+        self.ephemeris = ephemeris
+
+    @classmethod
+    def from_datetime(cls, datetime_str, latitude, longitude, **kwargs):
+        """From an ISO date-time string (local time) and coordinates, as taken by the kundli endpoints."""
+        dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00")).replace(tzinfo=None)
+        return cls(dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M:%S"), latitude=latitude, longitude=longitude, **kwargs)
+
+    @cached_property
+    def location(self):
+        """(latitude, longitude, timezone name)."""
+        if self._coords:
+            lat, lon = self._coords
+            return lat, lon, get_timezone_name(lat, lon)
+        return get_lat_lon_timezone(self.place)
+
+    @property
+    def latitude(self):
+        return self.location[0]
+
+    @property
+    def longitude(self):
+        return self.location[1]
+
+    @cached_property
+    def tz(self):
+        return timezone(self.location[2])
+
+    @cached_property
+    def local_datetime(self):
+        day = _parse_date(self.date)
+        parts = [int(p) for p in self.time.split(":")]
+        return day.replace(hour=parts[0], minute=parts[1], second=parts[2] if len(parts) > 2 else 0)
+
+    @cached_property
+    def jd(self):
+        return local_to_jd(self.local_datetime, self.tz)
+
+    @cached_property
+    def batch(self):
+        """PositionBatch for the chart moment (tropical, sidereal and speeds)."""
+        return calc_positions(self.jd, PLANETS, self.ephemeris)
+
+    @cached_property
+    def chart(self):
+        """Compact Chart of the natal planets, with whole-sign houses from the lagna."""
+        return Chart.from_batch(self.batch, self.lagna.sign)
+
+    @property
+    def positions(self):
+        """Sidereal longitude by planet name."""
+        return self.chart.positions
+
+    @property
+    def signs(self):
+        """Sidereal sign index (0 = Aries) by planet name."""
+        return self.chart.signs
+
+    @cached_property
+    def angles(self):
+        """Sidereal (ascendant, MC) longitudes."""
+        ascendant, mc = self.ephemeris.angles(self.jd, self.latitude, self.longitude)
+        ayanamsa = float(self.batch.ayanamsa[0])
+        return (ascendant - ayanamsa) % 360, (mc - ayanamsa) % 360
+
+    @cached_property
+    def vargas(self):
+        """Lagna and planet signs in all sixteen divisional charts (utils.vargas.varga_positions)."""
+        return varga_positions(self.chart, self.angles[0])
+
+    @cached_property
+    def lagna(self):
+        """Sidereal LagnaSpan rising at the chart moment."""
+        return lagna_at(self.jd, self.latitude, self.longitude, self.ephemeris)
+
+    @cached_property
+    def lagna_info(self):
+        return describe_lagna(self.lagna, self.tz)
+
+    @property
+    def planet_houses(self):
+        """Whole-sign house (1-12) from the lagna by planet name."""
+        return self.chart.planet_houses
+
+    @cached_property
+    def moon_sign(self):
+        return SIGN_NAMES[self.signs["Moon"]]
+
+    @cached_property
+    def nakshatra(self):
+        return self.chart.nakshatra_of("Moon")
+
+    @cached_property
+    def dasha(self):
+        """Vimshottari dasha, with the periods running at `transit_jd`."""
+        return get_dasha_periods(self.jd, self.latitude, self.longitude, self.transit_jd, self.ephemeris)
+
+    @cached_property
+    def current_mahadasha(self):
+        """Lord of the mahadasha running at `transit_jd`."""
+        return self.dasha["current"].get("mahadasha")
+
+    @cached_property
+    def transit_jd(self):
+        if self.transit_date:
+            return local_to_jd(_parse_date(self.transit_date).replace(hour=12), self.tz)
+        now = datetime.utcnow()
+        return local_to_jd(now, timezone("UTC"))
+
+    @cached_property
+    def transits(self):
+        """Sidereal longitude by planet name at `transit_jd`."""
+        batch = calc_positions(self.transit_jd, PLANETS, self.ephemeris)
+        return {name: float(batch.sidereal[0, i]) for i, name in enumerate(batch.names)}
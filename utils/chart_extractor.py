@@ -2,11 +2,10 @@
 
 import swisseph as swe
 import datetime
-from timezonefinder import TimezoneFinder
-from geopy.geocoders import Nominatim
+from utils.ascendant import lagna_at
 from utils.dasha_calculator import get_current_dasha_periods
-
-swe.set_ephe_path('/usr/share/ephe')  # Or wherever your ephemeris files are installed
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.geolocation import get_lat_lon_timezone
 
 def get_julian_day(date_str, time_str):
     date_parts = [int(x) for x in date_str.split("-")]
@@ -15,17 +14,10 @@ def get_julian_day(date_str, time_str):
     return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60)
 
 def get_timezone_and_coordinates(place_name):
-    geolocator = Nominatim(user_agent="chart_extractor")
-    location = geolocator.geocode(place_name)
-    if not location:
-        raise ValueError("Could not find location: " + place_name)
-    tf = TimezoneFinder()
-    timezone_str = tf.timezone_at(lng=location.longitude, lat=location.latitude)
-    return location.latitude, location.longitude, timezone_str
+    return get_lat_lon_timezone(place_name)
 
 def get_moon_sign_and_nakshatra(jd):
-    flags = swe.FLG_SWIEPH
-    moon_pos, _ = swe.calc_ut(jd, swe.MOON, flags)
+    moon_pos = DEFAULT_CONTEXT.calc(jd, swe.MOON)
     sign = int(moon_pos[0] // 30)
     sign_names = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
                   'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
@@ -42,13 +34,8 @@ def get_moon_sign_and_nakshatra(jd):
     return moon_sign, nakshatra_names[nakshatra], pada
 
 def get_ascendant(jd, latitude, longitude):
-    # House calculation
-    cusps, ascmc = swe.houses(jd, latitude, longitude.decode() if isinstance(longitude, bytes) else longitude, b'P')
-    asc_deg = ascmc[0]
-    asc_sign = int(asc_deg // 30)
-    sign_names = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-                  'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-    return sign_names[asc_sign]
+    # Tropical rising sign, looked up in the cached ingress table
+    return lagna_at(jd, latitude, longitude, sidereal=False).name
 
 def extract_chart_details(name, date_of_birth, time_of_birth, place_of_birth):
     try:
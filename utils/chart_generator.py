@@ -1,23 +1,32 @@
-from fpdf import FPDF
 import os
-import qrcode
-
-class PDF(FPDF):
-    def header(self):
-        if os.path.exists("static/logo.png"):
-            self.image("static/logo.png", 10, 8, 30)
-        self.set_font("Helvetica", "B", 16)
-        self.cell(0, 10, "Navadharma Prediction Report", ln=True, align="C")
-        self.ln(10)
-
-    def footer(self):
-        self.set_y(-20)
-        self.set_font("Helvetica", "I", 10)
-        self.cell(0, 10, "— Nav, Principal Astrologer", ln=True, align="C")
-        self.cell(0, 10, "Generated by Navadharma.com", align="C")
-
-def generate_pdf(data: dict, filename="report.pdf"):
-    pdf = PDF()
+from functools import lru_cache
+
+from utils.report_assets import SITE_URL, get_logo, get_qr_png, get_report_pdf_class, image_buffer, pdf_bytes
+
+
+@lru_cache(maxsize=None)
+def get_pdf_class():
+    """Report PDF class with the branded header/footer; defined on first use so fpdf loads lazily."""
+    class PDF(get_report_pdf_class()):
+        def header(self):
+            logo = get_logo()
+            if logo:
+                self.image(image_buffer(logo), 10, 8, 30)
+            self.set_font("Helvetica", "B", 16)
+            self.cell(0, 10, "Navadharma Prediction Report", ln=True, align="C")
+            self.ln(10)
+
+        def footer(self):
+            self.set_y(-20)
+            self.set_font("Helvetica", "I", 10)
+            self.cell(0, 10, "— Nav, Principal Astrologer", ln=True, align="C")
+            self.cell(0, 10, "Generated by Navadharma.com", align="C")
+
+    return PDF
+
+def generate_pdf(data: dict) -> bytes:
+    """Renders the prediction report into memory and returns the PDF bytes."""
+    pdf = get_pdf_class()()
     pdf.add_page()
     pdf.set_auto_page_break(auto=True, margin=15)
 
@@ -89,14 +98,7 @@ def generate_pdf(data: dict, filename="report.pdf"):
         pdf.ln(4)
 
     # 📎 QR Code
-    qr_data = "https://navadharma.com"
-    qr_img = qrcode.make(qr_data)
-    qr_path = "static/nav_qr.png"
-    qr_img.save(qr_path)
-    pdf.image(qr_path, x=160, y=pdf.get_y(), w=30)
+    pdf.image(image_buffer(get_qr_png(SITE_URL)), x=160, y=pdf.get_y(), w=30)
     pdf.ln(20)
 
-    # ✅ Save
-    output_path = f"static/{filename}"
-    pdf.output(output_path, "F")
-    return output_path
+    return pdf_bytes(pdf)
@@ -0,0 +1,197 @@
+# utils/chart_svg.py
+
+"""
+South and North Indian chart rendering from precompiled SVG templates.
+
+The chart frame (grid or diamond lines) is built once per style at import;
+a render only formats the per-house text into it. Renders are cached in
+memory by chart content, and saved files are named by content hash, so
+identical charts share one file and concurrent requests never overwrite
+each other's output; the hash covers report_cache.code_version(), so a
+deploy that changes the chart code gets fresh files. PNG output
+rasterizes the SVG with cairosvg when it is installed, and otherwise
+draws the same layout with matplotlib.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from utils.report_cache import code_version
+
+CHART_DIR = os.getenv("CHART_DIR", "static/charts")
+RENDER_CACHE_SIZE = int(os.getenv("CHART_RENDER_CACHE_SIZE", "1024"))
+
+SIZE = 400
+TITLE_HEIGHT = 30
+LINE_HEIGHT = 14
+LABEL_STYLE = ' fill="#888" font-size="10"'
+
+SIGN_ABBR = ["Ar", "Ta", "Ge", "Cn", "Le", "Vi", "Li", "Sc", "Sg", "Cp", "Aq", "Pi"]
+PLANET_ABBR = {
+    "Sun": "Su", "Moon": "Mo", "Mars": "Ma", "Mercury": "Me", "Jupiter": "Ju",
+    "Venus": "Ve", "Saturn": "Sa", "Rahu": "Ra", "Ketu": "Ke", "Ascendant": "As"
+}
+
+# South Indian: signs are fixed, Pisces in the top-left corner, running
+# clockwise. (column, row) on a 4x4 grid, indexed by sign (0 = Aries).
+SOUTH_CELLS = [
+    (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3),
+    (2, 3), (1, 3), (0, 3), (0, 2), (0, 1), (0, 0)
+]
+
+# North Indian: houses are fixed, house 1 in the top diamond, running
+# counter-clockwise. Text anchor per house, as fractions of the square.
+NORTH_HOUSES = [
+    (0.50, 0.25), (0.25, 0.10), (0.10, 0.25), (0.25, 0.50), (0.10, 0.75), (0.25, 0.90),
+    (0.50, 0.75), (0.75, 0.90), (0.90, 0.75), (0.75, 0.50), (0.90, 0.25), (0.75, 0.10)
+]
+
+_HEADER = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}" '
+    'font-family="DejaVu Sans, Arial, sans-serif" font-size="12">'
+    '<rect width="{w}" height="{h}" fill="white"/>'
+    '<text x="{cx}" y="20" text-anchor="middle" font-size="15" font-weight="bold">{{title}}</text>'
+    '<g transform="translate(0,{top})" fill="none" stroke="#333" stroke-width="1.5">'
+).format(w=SIZE, h=SIZE + TITLE_HEIGHT, cx=SIZE // 2, top=TITLE_HEIGHT)
+_FOOTER = '</g><g transform="translate(0,{top})">{{cells}}</g></svg>'.format(top=TITLE_HEIGHT)
+
+
+def _compile_south():
+    cell = SIZE // 4
+    lines = [
+        f'<rect x="{col * cell}" y="{row * cell}" width="{cell}" height="{cell}"/>'
+        for col, row in SOUTH_CELLS
+    ]
+    return _HEADER + "".join(lines) + _FOOTER
+
+
+def _compile_north():
+    s, h = SIZE, SIZE // 2
+    lines = [
+        f'<rect x="0" y="0" width="{s}" height="{s}"/>',
+        f'<line x1="0" y1="0" x2="{s}" y2="{s}"/>',
+        f'<line x1="{s}" y1="0" x2="0" y2="{s}"/>',
+        f'<polygon points="{h},0 {s},{h} {h},{s} 0,{h}"/>',
+    ]
+    return _HEADER + "".join(lines) + _FOOTER
+
+
+TEMPLATES = {"south": _compile_south(), "north": _compile_north()}
+
+
+def _cell_text(x, y, label, planets):
+    """Centered block: a grey sign label above one line per planet."""
+    rows = [label] + [PLANET_ABBR.get(p, p) for p in planets]
+    y0 = y - (len(rows) - 1) * LINE_HEIGHT / 2
+    spans = "".join(
+        f'<tspan x="{x:.0f}" y="{y0 + i * LINE_HEIGHT:.0f}"{LABEL_STYLE if i == 0 else ""}>{escape(row)}</tspan>'
+        for i, row in enumerate(rows)
+    )
+    return f'<text text-anchor="middle" dominant-baseline="middle">{spans}</text>'
+
+
+def _cells(houses, style, ascendant):
+    """(x, y, label, planets) of each cell's text block, below the title."""
+    if style == "north":
+        for house, (fx, fy) in enumerate(NORTH_HOUSES):
+            sign = ((ascendant or 0) + house) % 12
+            yield fx * SIZE, fy * SIZE, str(sign + 1), houses[sign]
+    else:
+        cell = SIZE // 4
+        for sign, (col, row) in enumerate(SOUTH_CELLS):
+            label = SIGN_ABBR[sign] + (" (Asc)" if sign == ascendant else "")
+            yield col * cell + cell / 2, row * cell + cell / 2, label, houses[sign]
+
+
+def _normalize(chart):
+    """{sign: [planets]} -> hashable 12-tuple of planet tuples, by sign."""
+    return tuple(tuple(chart.get(sign, [])) for sign in range(12))
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(houses, title, style, ascendant, fmt):
+    cells = "".join(_cell_text(*cell) for cell in _cells(houses, style, ascendant))
+    svg = TEMPLATES[style].format(title=escape(title), cells=cells).encode("utf-8")
+    if fmt == "svg":
+        return svg
+    try:
+        import cairosvg
+    except (ImportError, OSError):  # OSError: cairosvg installed without the cairo library
+        return _draw_png(houses, title, style, ascendant)
+    return cairosvg.svg2png(bytestring=svg)
+
+
+def _draw_png(houses, title, style, ascendant):
+    """The SVG layout drawn with matplotlib's Agg canvas, for PNG output without cairosvg."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    height = SIZE + TITLE_HEIGHT
+    fig = Figure(figsize=(SIZE / 100, height / 100), dpi=100)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, SIZE)
+    ax.set_ylim(height, 0)
+    ax.axis("off")
+    pt = 0.72  # SVG px to points at 100 dpi
+    ax.text(SIZE / 2, 20, title, ha="center", va="baseline", fontsize=15 * pt, fontweight="bold")
+
+    s, h, cell = SIZE, SIZE / 2, SIZE // 4
+    if style == "north":
+        frame = [((0, s, s, 0, 0), (0, 0, s, s, 0)), ((0, s), (0, s)), ((s, 0), (0, s)),
+                 ((h, s, h, 0, h), (0, h, s, h, 0))]
+    else:
+        frame = [((x, x + cell, x + cell, x, x), (y, y, y + cell, y + cell, y))
+                 for x, y in ((col * cell, row * cell) for col, row in SOUTH_CELLS)]
+    for xs, ys in frame:
+        ax.plot(xs, [y + TITLE_HEIGHT for y in ys], color="#333", linewidth=1.5 * pt)
+
+    for x, y, label, planets in _cells(houses, style, ascendant):
+        rows = [label] + [PLANET_ABBR.get(p, p) for p in planets]
+        y0 = y + TITLE_HEIGHT - (len(rows) - 1) * LINE_HEIGHT / 2
+        for i, row in enumerate(rows):
+            ax.text(x, y0 + i * LINE_HEIGHT, row, ha="center", va="center",
+                    fontsize=(10 if i == 0 else 12) * pt, color="#888" if i == 0 else "black")
+
+    out = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(out)
+    return out.getvalue()
+
+
+def chart_key(chart, title="Chart", style="south", ascendant=None, fmt="svg"):
+    """Content hash identifying a rendered chart, for the current renderer code."""
+    style = "north" if style == "north" else "south"
+    payload = repr((code_version(), _normalize(chart), title, style, ascendant, fmt)).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:24]
+
+
+def render_chart(chart, title="Chart", style="south", ascendant=None, fmt="svg"):
+    """
+    Renders {sign index: [planet names]} as SVG (or PNG) bytes. `ascendant`
+    is the lagna sign index: marked in South charts, and placed in house 1
+    for North charts (Aries if not given).
+    """
+    style = "north" if style == "north" else "south"
+    if fmt not in ("svg", "png"):
+        raise ValueError(f"Unsupported chart format: {fmt}")
+    return _render(_normalize(chart), title, style, ascendant, fmt)
+
+
+def save_chart(chart, title="Chart", style="south", ascendant=None, fmt="svg", directory=CHART_DIR):
+    """Writes the chart to `directory`/<content hash>.<fmt> if not already there and returns the path."""
+    path = os.path.join(directory, f"{chart_key(chart, title, style, ascendant, fmt)}.{fmt}")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        data = render_chart(chart, title, style, ascendant, fmt)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return path
+
+
+def cache_stats():
+    return _render.cache_info()
@@ -3,18 +3,18 @@
 from datetime import datetime
 import swisseph as swe
 from utils.chart_extractor import extract_chart_details
-from utils.dasha_calculator import get_current_dasha_periods
+from utils.ephemeris import DEFAULT_CONTEXT
 
 def get_panchang_elements(date_obj):
     jd = swe.julday(date_obj.year, date_obj.month, date_obj.day)
-    moon_long = swe.lun(jd)[0]
-    tithi = int((moon_long % 360) // 12) + 1
+    elongation = DEFAULT_CONTEXT.calc(jd, swe.MOON)[0] - DEFAULT_CONTEXT.calc(jd, swe.SUN)[0]
+    tithi = int((elongation % 360) // 12) + 1
     weekday = date_obj.strftime('%A')
     return tithi, weekday
 
 def get_daily_forecast(name, dob, tob, pob, target_date=None):
     chart = extract_chart_details(name, dob, tob, pob)
-    dasha_info = get_current_dasha_periods(dob, tob, pob)
+    dasha_info = chart.get("dasha") or {}
 
     if not target_date:
         target_date = datetime.today().strftime("%Y-%m-%d")
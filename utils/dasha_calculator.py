@@ -1,10 +1,182 @@
 # utils/dasha_calculator.py
 
-def get_dasha_periods(jd, latitude, longitude):
-    # 🔮 Placeholder logic – Replace with your actual dasha calculation
+"""
+Vimshottari dasha.
+
+The 120-year cycle starts from the lord of the natal Moon's nakshatra,
+with the part of that mahadasha already elapsed at birth taken off.
+Each period divides into nine sub-periods in the same order, starting
+with its own lord, in proportion to the lords' years. Sub-levels are built
+only when first visited, and each level keeps a sorted array of start
+instants, so finding the running maha/antar/pratyantar dasha for any
+moment is one bisect per level.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+
+import swisseph as swe
+from pytz import timezone
+
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.geolocation import get_lat_lon_timezone
+from utils.kundli import NAKSHATRA_LORDS, NAKSHATRAS
+from utils.panchanga import get_timezone_name, local_to_jd
+
+DASHA_YEARS = {
+    "Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7,
+    "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17
+}
+CYCLE_YEARS = 120
+YEAR_DAYS = 365.25
+NAKSHATRA_SPAN = 360 / 27
+LEVEL_NAMES = ["mahadasha", "antardasha", "pratyantardasha", "sookshma", "prana"]
+# Engines kept per (birth JD, Moon longitude)
+DASHA_CACHE_SIZE = 1024
+
+
+class DashaPeriod:
+    __slots__ = ("lord", "level", "start", "end", "_children", "_starts")
+
+    def __init__(self, lord, level, start, end):
+        self.lord = lord
+        self.level = level
+        self.start = start
+        self.end = end
+        self._children = None
+        self._starts = None
+
+    @property
+    def children(self):
+        """The nine sub-periods, built on first access."""
+        if self._children is None:
+            index = NAKSHATRA_LORDS.index(self.lord)
+            length = self.end - self.start
+            children, t = [], self.start
+            for k in range(9):
+                lord = NAKSHATRA_LORDS[(index + k) % 9]
+                end = self.end if k == 8 else t + length * DASHA_YEARS[lord] / CYCLE_YEARS
+                children.append(DashaPeriod(lord, self.level + 1, t, end))
+                t = end
+            self._children = children
+            self._starts = [child.start for child in children]
+        return self._children
+
+    def child_at(self, jd):
+        children = self.children
+        return children[max(bisect_right(self._starts, jd) - 1, 0)]
+
+    def to_dict(self):
+        return {
+            "lord": self.lord,
+            "level": LEVEL_NAMES[self.level],
+            "start": jd_to_date(self.start),
+            "end": jd_to_date(self.end),
+        }
+
+    def __repr__(self):
+        return f"DashaPeriod({self.lord!r}, {LEVEL_NAMES[self.level]}, {jd_to_date(self.start)}..{jd_to_date(self.end)})"
+
+
+class VimshottariDasha:
+    def __init__(self, birth_jd, moon_longitude, cycles=1):
+        """Mahadashas from the one running at birth through `cycles` full 120-year cycles."""
+        moon = moon_longitude % 360
+        nakshatra = min(int(moon // NAKSHATRA_SPAN), 26)
+        elapsed = (moon - nakshatra * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+        first = nakshatra % 9
+
+        self.birth_jd = birth_jd
+        self.moon_longitude = moon
+        self.nakshatra = NAKSHATRAS[nakshatra]
+        self.balance_years = (1 - elapsed) * DASHA_YEARS[NAKSHATRA_LORDS[first]]
+
+        t = birth_jd - elapsed * DASHA_YEARS[NAKSHATRA_LORDS[first]] * YEAR_DAYS
+        self.mahadashas = []
+        for k in range(9 * cycles):
+            lord = NAKSHATRA_LORDS[(first + k) % 9]
+            end = t + DASHA_YEARS[lord] * YEAR_DAYS
+            self.mahadashas.append(DashaPeriod(lord, 0, t, end))
+            t = end
+        self._starts = [p.start for p in self.mahadashas]
+        self._overview = None
+
+    def overview(self):
+        """Birth-chart part of get_dasha_periods (the same for every query date), built once."""
+        if self._overview is None:
+            summary = ", ".join(f"{p.lord} {jd_to_date(p.start)} to {jd_to_date(p.end)}" for p in self.mahadashas)
+            self._overview = {
+                "moon_longitude": round(self.moon_longitude, 4),
+                "nakshatra": self.nakshatra,
+                "balance_years": round(self.balance_years, 4),
+                "mahadashas": [p.to_dict() for p in self.mahadashas],
+                "summary": f"Mahadashas: {summary}",
+            }
+        return self._overview
+
+    def active(self, jd, depth=3):
+        """Running periods at `jd`, mahadasha first, `depth` levels deep; [] outside the covered cycles."""
+        i = bisect_right(self._starts, jd) - 1
+        if i < 0 or jd >= self.mahadashas[-1].end:
+            return []
+        periods = [self.mahadashas[i]]
+        while len(periods) < depth:
+            periods.append(periods[-1].child_at(jd))
+        return periods
+
+
+@lru_cache(maxsize=DASHA_CACHE_SIZE)
+def get_dasha_engine(birth_jd, moon_longitude):
+    return VimshottariDasha(birth_jd, moon_longitude)
+
+
+def jd_to_date(jd):
+    y, m, d, _ = swe.revjul(jd + 0.5 / 86400)
+    return f"{y:04d}-{m:02d}-{d:02d}"
+
+
+def _describe_current(periods):
+    current = {"periods": [p.to_dict() for p in periods]}
+    for period in periods:
+        current[LEVEL_NAMES[period.level]] = period.lord
+    return current
+
+
+def get_dasha_periods(jd, latitude, longitude, on_jd=None, context=DEFAULT_CONTEXT):
+    """
+    Vimshottari dasha for a birth at UT Julian day `jd` (from the sidereal
+    Moon; the location does not enter): all mahadashas, and the running
+    periods at `on_jd` (default: now).
+    """
+    engine = get_dasha_engine(jd, context.sidereal_longitude(jd, swe.MOON))
+    if on_jd is None:
+        now = datetime.utcnow()
+        on_jd = swe.julday(now.year, now.month, now.day, now.hour + now.minute / 60 + now.second / 3600)
+    return {**engine.overview(), "current": _describe_current(engine.active(on_jd))}
+
+
+def get_current_dasha_periods(date_of_birth, time_of_birth, latitude=None, longitude=None, place=None, on_date=None):
+    """
+    Running mahadasha, antardasha and pratyantardasha for a local birth
+    date ("YYYY-MM-DD") and time ("HH:MM"), at coordinates or a place name,
+    on `on_date` ("YYYY-MM-DD", local noon) or now.
+    """
+    if latitude is None or longitude is None:
+        if place is None:
+            raise ValueError("Either a place or latitude/longitude is required")
+        latitude, longitude, tz_name = get_lat_lon_timezone(place)
+    else:
+        tz_name = get_timezone_name(latitude, longitude)
+    tz = timezone(tz_name)
+    hour, minute = (int(part) for part in time_of_birth.split(":")[:2])
+    birth = datetime.strptime(date_of_birth, "%Y-%m-%d").replace(hour=hour, minute=minute)
+    on_jd = local_to_jd(datetime.strptime(on_date, "%Y-%m-%d").replace(hour=12), tz) if on_date else None
+
+    current = get_dasha_periods(local_to_jd(birth, tz), latitude, longitude, on_jd)["current"]
     return {
-        "jd": jd,
-        "latitude": latitude,
-        "longitude": longitude,
-        "message": "Vimshottari Dasha calculation coming soon!"
+        "current_dasha": current.get("mahadasha", "Unknown"),
+        "antar_dasha": current.get("antardasha", "Unknown"),
+        "pratyantar_dasha": current.get("pratyantardasha", "Unknown"),
+        "periods": current["periods"],
     }
@@ -0,0 +1,164 @@
+# utils/ephemeris.py
+
+import os
+import threading
+from collections import namedtuple
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+# Pseudo body id for Ketu: not a swisseph body, derived as Rahu + 180°
+KETU = -1
+
+PLANETS = {
+    'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS,
+    'Mercury': swe.MERCURY, 'Jupiter': swe.JUPITER, 'Venus': swe.VENUS,
+    'Saturn': swe.SATURN, 'Rahu': swe.MEAN_NODE, 'Ketu': KETU
+}
+
+DEFAULT_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+DEFAULT_EPHE_PATH = os.getenv("SE_EPHE_PATH", "/usr/share/ephe:.")
+
+# swisseph keeps its settings (ephemeris path, sidereal mode, topocentric
+# position) in thread-local storage, so each thread has its own copy. We track
+# which context was last applied on the current thread and only re-apply on
+# change; threads never see each other's settings and no lock is needed.
+_applied = threading.local()
+
+
+@dataclass(frozen=True)
+class EphemerisContext:
+    """
+    Everything a computation needs from swisseph's mutable settings. Contexts
+    are immutable and hashable; pass one around instead of calling
+    swe.set_sid_mode / set_topo / set_ephe_path directly.
+    """
+    sid_mode: int = swe.SIDM_LAHIRI
+    sid_t0: float = 0.0
+    sid_ayan_t0: float = 0.0
+    ephe_path: str = DEFAULT_EPHE_PATH
+    topo: Optional[Tuple[float, float, float]] = None  # (lon, lat, altitude_m)
+    flags: int = DEFAULT_FLAGS
+
+    def activate(self):
+        """Applies this context to swisseph on the current thread, if not already applied."""
+        current = getattr(_applied, "context", None)
+        if current == self:
+            return
+        if current is None or current.ephe_path != self.ephe_path:
+            swe.set_ephe_path(self.ephe_path)
+        if current is None or (current.sid_mode, current.sid_t0, current.sid_ayan_t0) != (self.sid_mode, self.sid_t0, self.sid_ayan_t0):
+            swe.set_sid_mode(self.sid_mode, self.sid_t0, self.sid_ayan_t0)
+        if self.topo is not None and (current is None or current.topo != self.topo):
+            swe.set_topo(*self.topo)
+        _applied.context = self
+
+    @property
+    def calc_flags(self):
+        return (self.flags | swe.FLG_TOPOCTR) if self.topo is not None else self.flags
+
+    def with_topo(self, lon, lat, alt=0.0):
+        return replace(self, topo=(lon, lat, alt))
+
+    def calc(self, jd, pid):
+        """Tropical (lon, lat, dist, lon_speed, lat_speed, dist_speed) for one body."""
+        self.activate()
+        return swe.calc_ut(jd, pid, self.calc_flags)[0]
+
+    def ayanamsa(self, jd):
+        self.activate()
+        return swe.get_ayanamsa_ut(jd)
+
+    def sidereal_longitude(self, jd, pid):
+        return (self.calc(jd, pid)[0] - self.ayanamsa(jd)) % 360
+
+    def houses(self, jd, lat, lon, hsys=b'P'):
+        self.activate()
+        return swe.houses(jd, lat, lon, hsys)
+
+    def angles(self, jd, lat, lon):
+        """
+        Tropical (ascendant, MC). They do not depend on the house system, so
+        this asks for equal houses, which unlike Placidus work at any latitude.
+        """
+        ascmc = self.houses(jd, lat, lon, b'E')[1]
+        return ascmc[0], ascmc[1]
+
+    def rise_trans(self, jd, pid, rsmi, lat, lon, alt=0.0):
+        """Julian day of the next rise/set/transit after `jd`, or None if it does not occur."""
+        self.activate()
+        res, tret = swe.rise_trans(jd, pid, rsmi, (lon, lat, alt), 0.0, 0.0, self.flags & ~swe.FLG_SPEED)
+        return tret[0] if res == 0 else None
+
+    def positions(self, jds, planets=None):
+        return calc_positions(jds, planets, context=self)
+
+
+DEFAULT_CONTEXT = EphemerisContext()
+
+PositionBatch = namedtuple(
+    "PositionBatch",
+    ["names", "jd", "ayanamsa", "tropical", "sidereal", "latitude", "speed"]
+)
+
+
+def calc_positions(jds, planets=None, context=None):
+    """
+    Computes positions for every (Julian day, planet) pair in one pass.
+
+    `jds` is a scalar or a sequence of UT Julian days, `planets` a mapping of
+    name -> swisseph id (defaults to PLANETS). The ayanamsa is computed once
+    per Julian day with the context's sidereal mode (DEFAULT_CONTEXT if none
+    is given), and Ketu is taken as Rahu + 180° instead of an extra ephemeris call.
+
+    Returns a PositionBatch whose array fields have shape (len(jds), len(planets)).
+    """
+    planets = PLANETS if planets is None else planets
+    context = DEFAULT_CONTEXT if context is None else context
+    context.activate()
+    flags = context.calc_flags
+    names = tuple(planets)
+    ids = [planets[name] for name in names]
+    jd = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+
+    n_jd, n_pl = len(jd), len(ids)
+    tropical = np.empty((n_jd, n_pl))
+    latitude = np.empty((n_jd, n_pl))
+    speed = np.empty((n_jd, n_pl))
+
+    # Ketu reuses the node column, so the node must be computed even if not requested
+    ketu_cols = [i for i, pid in enumerate(ids) if pid == KETU]
+    node_id = planets.get('Rahu', swe.MEAN_NODE)
+    calc_ids = [pid for pid in ids if pid != KETU]
+    if ketu_cols and node_id not in calc_ids:
+        calc_ids.append(node_id)
+    columns = {pid: ids.index(pid) if pid in ids else None for pid in calc_ids}
+
+    calc_ut = swe.calc_ut
+    node_lon = np.empty(n_jd)
+    node_speed = np.empty(n_jd)
+    for row, t in enumerate(jd.tolist()):
+        for pid in calc_ids:
+            xx, _ = calc_ut(t, pid, flags)
+            col = columns[pid]
+            if col is not None:
+                tropical[row, col] = xx[0]
+                latitude[row, col] = xx[1]
+                speed[row, col] = xx[3]
+            if pid == node_id:
+                node_lon[row] = xx[0]
+                node_speed[row] = xx[3]
+
+    for col in ketu_cols:
+        tropical[:, col] = (node_lon + 180.0) % 360
+        latitude[:, col] = 0.0
+        speed[:, col] = node_speed
+
+    get_ayanamsa_ut = swe.get_ayanamsa_ut
+    ayanamsa = np.fromiter((get_ayanamsa_ut(t) for t in jd.tolist()), dtype=np.float64, count=n_jd)
+    sidereal = (tropical - ayanamsa[:, None]) % 360
+
+    return PositionBatch(names, jd, ayanamsa, tropical, sidereal, latitude, speed)
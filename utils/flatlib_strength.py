@@ -1,25 +1,18 @@
-from flatlib.chart import Chart
-from flatlib.datetime import Datetime
-from flatlib.geopos import GeoPos
-from flatlib.const import SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN
-
-# Optional: planets list if needed
-FLATLIB_PLANETS = [SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN]
+from utils.chart_context import ChartContext
+from utils.shadbala import get_shadbala
 
 def get_planetary_strength_flatlib(datetime_str, lat, lon, tz_offset):
-    """Only for classical 7 planets (Flatlib doesn't support Rahu/Ketu)."""
-    date_obj = Datetime(datetime_str, tz_offset)
-    pos = GeoPos(lat, lon)
-    chart = Chart(date_obj, pos)
-
-    strengths = {}
-    for planet in FLATLIB_PLANETS:
-        obj = chart.get(planet)
-        strengths[planet] = {
-            "sign": obj.sign,
-            "longitude": obj.lon,
-            "house": obj.house,
-            "isRetrograde": obj.retro,
-        }
-
+    """
+    Classical 7 planets, now from the swisseph Shadbala engine instead of a
+    flatlib Chart: sign, longitude (sidereal), whole-sign house and
+    retrogression, plus the Shadbala fields.
+    """
+    ctx = ChartContext.from_datetime(datetime_str, lat, lon)
+    retrograde = set(ctx.chart.retrograde)
+    strengths = get_shadbala(ctx)
+    for planet, strength in strengths.items():
+        strength.update({
+            "house": ctx.planet_houses[planet],
+            "isRetrograde": planet in retrograde,
+        })
     return strengths
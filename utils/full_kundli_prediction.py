@@ -27,5 +27,6 @@ def generate_full_kundli_prediction(
         "goal": goal,
         "summary": summary["summary"],
         "gpt_prompt": summary["gpt_prompt"],
-        "context": summary["context"]
+        "context": summary["context"],
+        "timings": summary["timings"]
     }
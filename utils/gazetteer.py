@@ -0,0 +1,257 @@
+# utils/gazetteer.py
+
+"""
+Offline city geocoder backed by a compact sorted index.
+
+Index layout (little-endian):
+    header   MAGIC, record_count, place_count, strings_size (u32 each)
+    records  record_count x (key: KEY_WIDTH bytes, place_id: u32), sorted by key
+    places   place_count x (lat: f4, lon: f4, tz_id: u16, country: 2s, population: u32, name_id: u32)
+    strings  newline-separated place names followed by timezone names
+
+Every name and alias of a place gets its own record, so exact and prefix
+lookups are a binary search over the memory-mapped record table.
+
+Build a full index from a GeoNames dump (e.g. cities15000.txt):
+    python -m utils.gazetteer build cities15000.txt data/gazetteer.idx
+Without an index file the bundled data/cities_seed.tsv is indexed in memory.
+"""
+
+import difflib
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+MAGIC = b"NDGZ0001"
+KEY_WIDTH = 40
+_HEADER = struct.Struct("<8sIII")
+_RECORD = struct.Struct(f"<{KEY_WIDTH}sI")
+_PLACE = struct.Struct("<ffH2sII")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(BASE_DIR, "data", "gazetteer.idx"))
+SEED_PATH = os.path.join(BASE_DIR, "data", "cities_seed.tsv")
+
+# Qualifiers after the first comma ("Hyderabad, Pakistan") that name a country
+COUNTRY_ALIASES = {
+    "india": "IN", "bharat": "IN", "nepal": "NP", "sri lanka": "LK", "bangladesh": "BD",
+    "pakistan": "PK", "uae": "AE", "united arab emirates": "AE", "singapore": "SG",
+    "uk": "GB", "united kingdom": "GB", "england": "GB", "great britain": "GB",
+    "usa": "US", "us": "US", "united states": "US", "america": "US",
+    "canada": "CA", "australia": "AU", "japan": "JP", "france": "FR", "germany": "DE",
+}
+
+Place = namedtuple("Place", ["name", "latitude", "longitude", "timezone", "country", "population"])
+
+
+def normalize(text):
+    """ASCII-folded, lower-case, punctuation-free form used for index keys."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _key(text):
+    return normalize(text).encode("ascii")[:KEY_WIDTH]
+
+
+# --- Building ---
+
+def build_index(rows):
+    """
+    rows: iterable of (name, aliases, lat, lon, country, population, timezone).
+    Returns the index as bytes.
+    """
+    places, records = [], []
+    tz_ids, names = {}, []
+    for name, aliases, lat, lon, country, population, tz in rows:
+        if not tz:
+            continue
+        place_id = len(places)
+        tz_id = tz_ids.setdefault(tz, len(tz_ids))
+        places.append((float(lat), float(lon), tz_id, (country or "").encode("ascii")[:2].ljust(2), int(population or 0), len(names)))
+        names.append(name)
+        for key in {_key(n) for n in [name, *aliases] if n and normalize(n)}:
+            records.append((key.ljust(KEY_WIDTH, b"\0"), place_id))
+
+    records.sort()
+    strings = "\n".join(names + list(tz_ids)).encode("utf-8")
+    out = bytearray(_HEADER.pack(MAGIC, len(records), len(places), len(strings)))
+    for key, place_id in records:
+        out += _RECORD.pack(key, place_id)
+    for place in places:
+        out += _PLACE.pack(*place)
+    out += strings
+    return bytes(out)
+
+
+def read_seed(path=SEED_PATH):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            name, aliases, lat, lon, country, population, tz = line.rstrip("\n").split("\t")
+            yield name, [a for a in aliases.split(",") if a], lat, lon, country, population, tz
+
+
+def read_geonames(path, min_population=0):
+    """Rows from a GeoNames cities dump; only ASCII alternate names are kept as aliases."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 18 or int(cols[14] or 0) < min_population:
+                continue
+            aliases = [cols[2]] + [a for a in cols[3].split(",") if a.isascii()]
+            yield cols[1], aliases, cols[4], cols[5], cols[8], cols[14], cols[17]
+
+
+# --- Lookup ---
+
+class Gazetteer:
+    def __init__(self, buffer):
+        self._buf = buffer
+        magic, self.record_count, self.place_count, strings_size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a gazetteer index")
+        self._records_at = _HEADER.size
+        self._places_at = self._records_at + self.record_count * _RECORD.size
+        strings_at = self._places_at + self.place_count * _PLACE.size
+        strings = bytes(buffer[strings_at:strings_at + strings_size]).decode("utf-8").split("\n")
+        self._names = strings[:self.place_count]
+        self._timezones = strings[self.place_count:]
+        self.keys = _KeyView(self)
+
+    @classmethod
+    def open(cls, path=GAZETTEER_PATH):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _record(self, i):
+        key, place_id = _RECORD.unpack_from(self._buf, self._records_at + i * _RECORD.size)
+        return key.rstrip(b"\0"), place_id
+
+    def place(self, place_id):
+        lat, lon, tz_id, country, population, name_id = _PLACE.unpack_from(self._buf, self._places_at + place_id * _PLACE.size)
+        return Place(self._names[name_id], round(lat, 5), round(lon, 5), self._timezones[tz_id], country.decode("ascii").strip(), population)
+
+    def _scan(self, key, prefix=False, limit=50):
+        ids = []
+        i = bisect_left(self.keys, key)
+        while i < self.record_count and len(ids) < limit:
+            k, place_id = self._record(i)
+            if k != key and not (prefix and k.startswith(key)):
+                break
+            ids.append(place_id)
+            i += 1
+        return ids
+
+    def _fuzzy(self, key, cutoff=0.8):
+        # Candidates share the first character; difflib ranks by similarity
+        lo = bisect_left(self.keys, key[:1])
+        hi = bisect_left(self.keys, key[:1] + b"\xff")
+        block = {self._record(i)[0].decode("ascii"): i for i in range(lo, hi)}
+        matches = difflib.get_close_matches(key.decode("ascii"), list(block), n=5, cutoff=cutoff)
+        ids = []
+        for match in matches:
+            ids.extend(self._scan(match.encode("ascii")))
+        return ids
+
+    def _candidates(self, query, suggest):
+        """
+        (places, verified) for `query` ("City" or "City, State/Country").
+        Country qualifiers are hard filters; a qualifier that is not a
+        country (a state, a county) cannot be checked against the index, so
+        `verified` is False and the caller should not trust a match.
+        """
+        parts = [normalize(p) for p in query.split(",")]
+        key = parts[0].encode("ascii")[:KEY_WIDTH]
+        if not key:
+            return [], False
+        countries = set()
+        verified = True
+        for qualifier in filter(None, parts[1:]):
+            country = COUNTRY_ALIASES.get(qualifier)
+            if country is None and len(qualifier) == 2 and qualifier.isalpha():
+                country = qualifier.upper()
+            if country is None:
+                verified = False
+            else:
+                countries.add(country)
+
+        exact = set(self._scan(key))
+        ids = list(exact)
+        if suggest:
+            ids += self._scan(key, prefix=True) + self._fuzzy(key)
+        ranked = sorted(
+            ((i not in exact, -place.population), place)
+            for i, place in ((i, self.place(i)) for i in dict.fromkeys(ids))
+            if not countries or place.country in countries
+        )
+        return [place for _, place in ranked], verified
+
+    def search(self, query, limit=5):
+        """
+        Suggestions for `query`, best first: exact name or alias matches,
+        then prefix and close spellings, restricted to any country named.
+        """
+        return self._candidates(query, suggest=True)[0][:limit]
+
+    def lookup(self, query):
+        """
+        The place `query` names exactly (by name or alias, and in the country
+        given, if any), or None. Ambiguous names resolve to the most populous
+        place; prefix and fuzzy hits are never returned here, use search().
+        """
+        places, verified = self._candidates(query, suggest=False)
+        return places[0] if places and verified else None
+
+
+class _KeyView:
+    """Sequence view over the sorted record keys, for bisect."""
+
+    def __init__(self, gazetteer):
+        self._g = gazetteer
+
+    def __len__(self):
+        return self._g.record_count
+
+    def __getitem__(self, i):
+        return self._g._record(i)[0]
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """Memory-mapped index at GAZETTEER_PATH, or the bundled seed list indexed in memory."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                if os.path.exists(GAZETTEER_PATH):
+                    _gazetteer = Gazetteer.open(GAZETTEER_PATH)
+                else:
+                    _gazetteer = Gazetteer(build_index(read_seed()))
+    return _gazetteer
+
+
+def lookup_place(query):
+    return get_gazetteer().lookup(query)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        sys.exit("usage: python -m utils.gazetteer build <geonames.txt> [output.idx] [min_population]")
+    source = sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) > 3 else GAZETTEER_PATH
+    min_population = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    data = build_index(read_geonames(source, min_population))
+    with open(output, "wb") as f:
+        f.write(data)
+    print(f"Wrote {len(data)} bytes to {output}")
@@ -0,0 +1,98 @@
+# utils/geocode_cache.py
+
+import os
+import sqlite3
+import threading
+import time
+
+from utils.gazetteer import BASE_DIR, normalize
+
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join(BASE_DIR, "data", "geocode_cache.sqlite3"))
+# Misses are re-tried after this long; hits never expire (places do not move)
+GEOCODE_NEGATIVE_TTL = int(os.getenv("GEOCODE_NEGATIVE_TTL", str(7 * 24 * 3600)))
+
+# Returned by GeocodeCache.get for a cached, unexpired "not found"
+NOT_FOUND = object()
+
+
+def normalize_place(place):
+    """Cache key: each comma-separated part normalized, so 'Delhi,India' == 'delhi, INDIA'."""
+    return ", ".join(p for p in (normalize(part) for part in place.split(",")) if p)
+
+
+class GeocodeCache:
+    def __init__(self, path=GEOCODE_CACHE_PATH, negative_ttl=GEOCODE_NEGATIVE_TTL):
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS places ("
+                "key TEXT PRIMARY KEY, lat REAL, lon REAL, tz TEXT, found INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _decode(self, row):
+        lat, lon, tz, found, updated_at = row
+        if found:
+            return lat, lon, tz
+        if time.time() - updated_at < self.negative_ttl:
+            return NOT_FOUND
+        return None
+
+    def get(self, key):
+        """(lat, lon, tz), NOT_FOUND, or None when unknown or the miss has expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT lat, lon, tz, found, updated_at FROM places WHERE key = ?", (key,)
+            ).fetchone()
+        return self._decode(row) if row else None
+
+    def get_many(self, keys):
+        keys = list(keys)
+        results = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, lat, lon, tz, found, updated_at FROM places WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, *row in rows:
+                    value = self._decode(row)
+                    if value is not None:
+                        results[key] = value
+        return results
+
+    def put(self, key, lat, lon, tz):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, 1, ?)", (key, lat, lon, tz, time.time())
+            )
+
+    def put_miss(self, key):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO places VALUES (?, NULL, NULL, NULL, 0, ?)", (key, time.time())
+            )
+
+    def purge_expired(self):
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM places WHERE found = 0 AND updated_at < ?", (time.time() - self.negative_ttl,)
+            )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_geocode_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GeocodeCache()
+    return _cache
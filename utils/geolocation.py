@@ -1,15 +1,90 @@
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
+import os
+import threading
+import time
+
+from utils.gazetteer import lookup_place
+from utils.geocode_cache import NOT_FOUND, get_geocode_cache, normalize_place
+from utils.lazy import get_resource
+from utils.timezones import timezone_at
+
+# Online fallback for places missing from the offline gazetteer: "nominatim" or "none"
+GEOCODER_FALLBACK = os.getenv("GEOCODER_FALLBACK", "nominatim").lower()
+# Nominatim's usage policy allows at most one request per second
+ONLINE_MIN_INTERVAL = 1.0
+
+_online_lock = threading.Lock()
+_last_online_call = 0.0
+
+def geocode_online(location):
+    """Live Nominatim lookup -> (lat, lon) or None. Network-bound and rate-limited (~1 req/s)."""
+    global _last_online_call
+    if GEOCODER_FALLBACK != "nominatim":
+        return None
+    geocoder = get_resource("nominatim")
+    with _online_lock:
+        wait = _last_online_call + ONLINE_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            loc = geocoder.geocode(location)
+        finally:
+            _last_online_call = time.monotonic()
+    return (loc.latitude, loc.longitude) if loc else None
+
+def _resolve_online(key, location):
+    """Online lookup whose outcome (hit or miss) is written to the persistent cache."""
+    cache = get_geocode_cache()
+    coords = geocode_online(location)
+    if not coords:
+        if GEOCODER_FALLBACK == "nominatim":
+            cache.put_miss(key)
+        return None
+    lat, lon = coords
+    result = (lat, lon, timezone_at(lat, lon))
+    cache.put(key, *result)
+    return result
 
 def get_lat_lon_timezone(location):
-    geolocator = Nominatim(user_agent="navadharma")
-    loc = geolocator.geocode(location)
-    if not loc:
-        raise ValueError("Location not found")
+    place = lookup_place(location)
+    if place:
+        return place.latitude, place.longitude, place.timezone
+
+    key = normalize_place(location)
+    cached = get_geocode_cache().get(key)
+    if cached is NOT_FOUND:
+        raise ValueError(f"Location not found: {location}")
+    result = cached or _resolve_online(key, location)
+    if not result:
+        raise ValueError(f"Location not found: {location}")
+
+    return result
+
+def resolve_places(locations):
+    """
+    Bulk geocoding: {location: (lat, lon, tz) or None}. Inputs are deduplicated
+    on their normalized form before the gazetteer, the cache and finally
+    Nominatim are consulted, so each distinct place costs at most one online call.
+    """
+    keys = {location: normalize_place(location) for location in locations}
+    pending = {}
+    resolved = {}
+    for location, key in keys.items():
+        if key in resolved or key in pending:
+            continue
+        place = lookup_place(location)
+        if place:
+            resolved[key] = (place.latitude, place.longitude, place.timezone)
+        else:
+            pending[key] = location
 
-    lat = loc.latitude
-    lon = loc.longitude
-    tf = TimezoneFinder()
-    timezone = tf.timezone_at(lng=lon, lat=lat)
+    cached = get_geocode_cache().get_many(pending)
+    for key, location in pending.items():
+        value = cached.get(key)
+        if value is NOT_FOUND:
+            resolved[key] = None
+        elif value is not None:
+            resolved[key] = value
+        else:
+            resolved[key] = _resolve_online(key, location)
 
-    return lat, lon, timezone
+    return {location: resolved[key] for location, key in keys.items()}
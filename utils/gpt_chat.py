@@ -1,9 +1,6 @@
-import openai
-import os
 from utils.astro_logic import analyze_chart
 from utils.gpt_summary import gpt_summary
-
-openai.api_key = os.getenv("OPENAI_API_KEY")
+from utils.lazy import get_resource
 
 class ChatSessionManager:
     def __init__(self):
@@ -20,6 +17,9 @@ class ChatSessionManager:
 
         self.sessions[session_id].append({"role": "user", "content": user_message})
 
+        openai = get_resource("openai_module")
+        if openai is None:
+            raise RuntimeError("Chat needs the optional openai package")
         response = openai.ChatCompletion.create(
             model="gpt-4",
             messages=self.sessions[session_id],
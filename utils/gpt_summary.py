@@ -1,15 +1,9 @@
 # utils/gpt_summary.py
 
-import os
 from typing import Optional
 
-try:
-    from openai import OpenAI
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-except ImportError:
-    openai_client = None
-
 from utils.language_utils import translate_output
+from utils.lazy import get_resource
 
 
 def generate_gpt_summary(text: str, lang: str = "en") -> str:
@@ -22,6 +16,7 @@ def generate_gpt_summary(text: str, lang: str = "en") -> str:
     """
     summary = ""
 
+    openai_client = get_resource("openai")
     if openai_client:
         try:
             response = openai_client.chat.completions.create(
@@ -1,6 +1,18 @@
 import swisseph as swe
 
+from utils.ascendant import SIGN_NAMES
+from utils.chart import Chart
+from utils.kundli import SIGN_LORDS
+
+def _ascendant_sign(chart):
+    if isinstance(chart, Chart):
+        return SIGN_NAMES[chart.lagna]
+    return chart.get("ascendant", {}).get("sign", "")
+
 def get_planetary_positions(chart):
+    """Sign name by planet, from a Chart or a {"planets": {name: {"sign"}}} dict."""
+    if isinstance(chart, Chart):
+        return chart.sign_names
     positions = {}
     planets = chart.get("planets", {})
     for planet, data in planets.items():
@@ -9,30 +21,18 @@ def get_planetary_positions(chart):
 
 def get_house_lords(chart):
     house_lords = {}
-    asc_sign = chart.get("ascendant", {}).get("sign", "")
-    sign_lords = {
-        "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
-        "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
-        "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-    }
+    asc_sign = _ascendant_sign(chart)
 
     if not asc_sign:
         return house_lords
 
-    signs = list(sign_lords.keys())
-    start_index = signs.index(asc_sign)
-    rotated_signs = signs[start_index:] + signs[:start_index]
+    start_index = SIGN_NAMES.index(asc_sign)
+    rotated_signs = SIGN_NAMES[start_index:] + SIGN_NAMES[:start_index]
 
     for i, sign in enumerate(rotated_signs):
-        house_lords[f"House {i+1}"] = sign_lords[sign]
+        house_lords[f"House {i+1}"] = SIGN_LORDS[sign]
 
     return house_lords
 
 def get_lagna_lord(chart):
-    asc_sign = chart.get("ascendant", {}).get("sign", "")
-    sign_lords = {
-        "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
-        "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
-        "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-    }
-    return sign_lords.get(asc_sign, "")
+    return SIGN_LORDS.get(_ascendant_sign(chart), "")
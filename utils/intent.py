@@ -1,7 +1,4 @@
-import os
-import openai
-
-openai.api_key = os.getenv("OPENAI_API_KEY")  # ✅ Set this in env
+from utils.lazy import get_resource
 
 # Basic keyword fallback
 def fallback_detect_goal(prompt: str) -> str:
@@ -20,6 +17,9 @@ def fallback_detect_goal(prompt: str) -> str:
 
 # GPT-based detection
 def detect_goal_from_prompt(prompt: str) -> str:
+    openai = get_resource("openai_module")
+    if openai is None:
+        return fallback_detect_goal(prompt)
     try:
         completion = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
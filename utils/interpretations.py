@@ -1,6 +1,11 @@
-from .kundli import generate_kundli_chart
-from .dasha_calculator import get_dasha_periods
-import re
+from functools import lru_cache
+
+from utils.chart_context import ChartContext
+from utils.kundli import SIGN_LORDS
+from utils.yoga_rules import (
+    PLANET_NAMES, Rule, all_of, any_of, chart_arrays, compile_rules, conjunct, detect, exchange, from_planet, in_house,
+    in_sign, lord_in, lords_conjunct, negate,
+)
 
 EXALTED_SIGNS = {
     "Sun": "Aries",
@@ -35,125 +40,171 @@ DEBILITATED_SIGNS = {
 REMEDY_MAP = {
     "Kemadruma Yoga": "Chant Moon mantras (e.g., Om Chandraya Namah), wear a Pearl, and practice emotional grounding through meditation.",
     "Neecha Bhanga Raja Yoga": "Strengthen the cancelled planet through donations on its weekday, and wear its gemstone with guidance.",
-    "Debilitated Planet": "Avoid important decisions during its dasha. Chant the planet's mantra or do fasts (vrat)."
+    "Debilitated Planet": "Avoid important decisions during its dasha. Chant the planet's mantra or do fasts (vrat).",
+    "Papa Kartari Yoga": "Recite the Aditya Hridayam on Sundays and serve elders; strengthen the lagna lord with its mantra.",
+    "Dainya Parivartana Yoga": "Worship the lords of the exchanged houses on their weekdays and donate on those days."
 }
 
-def parse_degree(planet_str):
-    match = re.search(r"\((.*?)°\)", planet_str)
-    return float(match.group(1)) if match else 0.0
-
-def get_yogas(datetime_str, latitude, longitude, timezone_offset):
-    chart_data = get_kundli_chart(datetime_str, latitude, longitude, timezone_offset)
-    dasha_data = get_dasha_periods(datetime_str, latitude, longitude, timezone_offset)
-    active_dasha = dasha_data["dashas"][0]["mahadasha"]
-
-    yogas = []
-
-    kendra_houses = [1, 4, 7, 10]
-    dusthana_houses = [6, 8, 12]
-
-    house_lookup = {house["house"]: house for house in chart_data["houses"]}
-    planet_house_map = {}
-    planet_sign_map = {}
-
-    for house in chart_data["houses"]:
-        for planet in house["planets"]:
-            name = planet.split(" ")[0]
-            planet_house_map[name] = house["house"]
-            planet_sign_map[name] = house["sign"]
-
-    # Gajakesari Yoga
-    if "Moon" in planet_house_map and "Jupiter" in planet_house_map:
-        if planet_house_map["Moon"] in kendra_houses and planet_house_map["Jupiter"] in kendra_houses:
-            yogas.append({
-                "name": "Gajakesari Yoga",
-                "description": "Moon and Jupiter are in Kendra from Lagna.",
-                "score": 8,
-                "active": "Jupiter" in active_dasha or "Moon" in active_dasha,
-                "summary": "Gajakesari Yoga brings fame, wisdom, and leadership."
-            })
+KENDRAS = (1, 4, 7, 10)
+TRIKONAS = (1, 5, 9)
+DUSTHANAS = (6, 8, 12)
+BENEFICS = ("Mercury", "Jupiter", "Venus")
+MALEFICS = ("Sun", "Mars", "Saturn", "Rahu", "Ketu")
+# The five planets other than the luminaries and nodes
+TARA_GRAHAS = ("Mars", "Mercury", "Jupiter", "Venus", "Saturn")
+
+
+def _ordinal(n):
+    return f"{n}{'st' if n == 1 else 'nd' if n == 2 else 'rd' if n == 3 else 'th'}"
+
+def get_house_chart(ctx):
+    """Whole-sign houses from the lagna: {"houses": [{"house", "sign", "planets": ["Sun (12.34°)"]}]}."""
+    return ctx.chart.house_chart()
+
+
+def _yoga_catalogue():
+    yogas = [
+        Rule(
+            "Gajakesari Yoga", all_of(in_house("Moon", *KENDRAS), in_house("Jupiter", *KENDRAS)), 8,
+            "Moon and Jupiter are in Kendra from Lagna.",
+            "Gajakesari Yoga brings fame, wisdom, and leadership.", ("Moon", "Jupiter"),
+        ),
+    ]
 
     # Panch Mahapurusha Yogas
-    for planet in ["Mars", "Mercury", "Jupiter", "Venus", "Saturn"]:
-        hnum = planet_house_map.get(planet)
-        if hnum and hnum in kendra_houses:
-            sign = planet_sign_map.get(planet)
-            if sign in OWN_SIGNS[planet] or sign == EXALTED_SIGNS[planet]:
-                yogas.append({
-                    "name": f"{planet} Mahapurusha Yoga",
-                    "description": f"{planet} in Kendra in own/exalted sign.",
-                    "score": 9,
-                    "active": planet in active_dasha,
-                    "summary": f"{planet} gives success and strength through Mahapurusha Yoga."
-                })
-
-    # Budhaditya Yoga
-    if planet_house_map.get("Sun") == planet_house_map.get("Mercury"):
-        yogas.append({
-            "name": "Budhaditya Yoga",
-            "description": "Sun and Mercury are conjunct.",
-            "score": 7,
-            "active": "Sun" in active_dasha or "Mercury" in active_dasha,
-            "summary": "Excellent for intelligence, speech, teaching, and writing."
-        })
-
-    # Kemadruma Yoga
-    moon_house = planet_house_map.get("Moon")
-    if moon_house:
-        before = ((moon_house - 2) % 12) or 12
-        after = (moon_house % 12) + 1
-        if not house_lookup[before]["planets"] and not house_lookup[after]["planets"]:
-            yogas.append({
-                "name": "Kemadruma Yoga",
-                "description": "No planets in 2nd or 12th from Moon.",
-                "score": 3,
-                "active": "Moon" in active_dasha,
-                "summary": "May bring isolation or emotional fluctuation.",
-                "remedy": REMEDY_MAP["Kemadruma Yoga"]
-            })
+    for planet in TARA_GRAHAS:
+        yogas.append(Rule(
+            f"{planet} Mahapurusha Yoga",
+            all_of(in_house(planet, *KENDRAS), in_sign(planet, EXALTED_SIGNS[planet], *OWN_SIGNS[planet])), 9,
+            f"{planet} in Kendra in own/exalted sign.",
+            f"{planet} gives success and strength through Mahapurusha Yoga.", (planet,),
+        ))
+
+    yogas += [
+        Rule(
+            "Budhaditya Yoga", conjunct("Mercury", "Sun"), 7, "Sun and Mercury are conjunct.",
+            "Excellent for intelligence, speech, teaching, and writing.", ("Sun", "Mercury"),
+        ),
+        Rule(
+            "Kemadruma Yoga", all_of(*(negate(from_planet(p, "Moon", 2, 12)) for p in PLANET_NAMES if p != "Moon")), 3,
+            "No planets in 2nd or 12th from Moon.",
+            "May bring isolation or emotional fluctuation.", ("Moon",), (), REMEDY_MAP["Kemadruma Yoga"],
+        ),
+    ]
+
+    # Lunar and solar yogas
+    sunapha = any_of(*(from_planet(p, "Moon", 2) for p in TARA_GRAHAS))
+    anapha = any_of(*(from_planet(p, "Moon", 12) for p in TARA_GRAHAS))
+    vesi = any_of(*(from_planet(p, "Sun", 2) for p in TARA_GRAHAS))
+    vosi = any_of(*(from_planet(p, "Sun", 12) for p in TARA_GRAHAS))
+    yogas += [
+        Rule("Sunapha Yoga", sunapha, 6, "A planet other than the Sun and nodes is 2nd from the Moon.",
+             "Self-earned wealth, a good name and a sharp intellect.", ("Moon",)),
+        Rule("Anapha Yoga", anapha, 6, "A planet other than the Sun and nodes is 12th from the Moon.",
+             "Good health, a pleasing personality and contentment.", ("Moon",)),
+        Rule("Durudhara Yoga", all_of(sunapha, anapha), 7, "Planets on both sides of the Moon.",
+             "Comforts, vehicles and a generous nature.", ("Moon",)),
+        Rule("Vesi Yoga", vesi, 6, "A planet other than the Moon and nodes is 2nd from the Sun.",
+             "Truthfulness, balance and steady effort.", ("Sun",)),
+        Rule("Vosi Yoga", vosi, 6, "A planet other than the Moon and nodes is 12th from the Sun.",
+             "Skill, learning and charity.", ("Sun",)),
+        Rule("Ubhayachari Yoga", all_of(vesi, vosi), 7, "Planets on both sides of the Sun.",
+             "Eloquence, status and a king-like bearing.", ("Sun",)),
+        Rule("Chandra Mangala Yoga", conjunct("Mars", "Moon"), 6, "Moon and Mars are conjunct.",
+             "Drive for wealth through enterprise; guard against a hasty temper.", ("Moon", "Mars")),
+        Rule("Guru Mangala Yoga", conjunct("Mars", "Jupiter"), 7, "Jupiter and Mars are conjunct.",
+             "Courage guided by wisdom; success in leadership and law.", ("Jupiter", "Mars")),
+        Rule("Adhi Yoga", all_of(*(from_planet(p, "Moon", 6, 7, 8) for p in BENEFICS)), 8,
+             "Mercury, Jupiter and Venus are in the 6th, 7th or 8th from the Moon.",
+             "Authority, trust and victory over opponents.", BENEFICS),
+        Rule("Amala Yoga", any_of(*(any_of(in_house(p, 10), from_planet(p, "Moon", 10)) for p in BENEFICS)), 7,
+             "A benefic is in the 10th from the Lagna or the Moon.",
+             "A spotless reputation and lasting prosperity."),
+        Rule("Shubha Kartari Yoga", all_of(any_of(*(in_house(p, 2) for p in BENEFICS)),
+                                           any_of(*(in_house(p, 12) for p in BENEFICS))), 7,
+             "Benefics in the 2nd and 12th hem in the Lagna.",
+             "Protection, good health and support from others."),
+        Rule("Papa Kartari Yoga", all_of(any_of(*(in_house(p, 2) for p in MALEFICS)),
+                                         any_of(*(in_house(p, 12) for p in MALEFICS))), 3,
+             "Malefics in the 2nd and 12th hem in the Lagna.",
+             "Obstacles and pressure on health and initiative.", (), (1,), REMEDY_MAP["Papa Kartari Yoga"]),
+    ]
 
     # Vipreet Raj Yogas
-    lords = {
-        "Harsha": 6,
-        "Sarala": 8,
-        "Vimala": 12
-    }
-    for name, house_num in lords.items():
-        sign = house_lookup[house_num]["sign"]
-        for planet, signs in OWN_SIGNS.items():
-            if sign in signs:
-                pl_house = planet_house_map.get(planet)
-                if pl_house in dusthana_houses:
-                    yogas.append({
-                        "name": f"{name} Vipreet Raj Yoga",
-                        "description": f"Lord of {house_num}th in dusthana.",
-                        "score": 7,
-                        "active": planet in active_dasha,
-                        "summary": f"{name} Yoga gives rise through adversity and karmic protection."
-                    })
-
-    # Neecha Bhanga
-    for planet, deb_sign in DEBILITATED_SIGNS.items():
-        if planet_sign_map.get(planet) == deb_sign:
-            for other, exalted_sign in EXALTED_SIGNS.items():
-                if other != planet and planet_sign_map.get(other) == deb_sign:
-                    yogas.append({
-                        "name": "Neecha Bhanga Raja Yoga",
-                        "description": f"{planet} is debilitated in {deb_sign} but cancellation occurs due to exalted {other}.",
-                        "score": 6,
-                        "active": planet in active_dasha or other in active_dasha,
-                        "summary": f"Neecha Bhanga restores the dignity of {planet} and empowers you through humility.",
-                        "remedy": REMEDY_MAP["Neecha Bhanga Raja Yoga"]
-                    })
-            # If no cancellation, suggest remedy
+    for name, house in {"Harsha": 6, "Sarala": 8, "Vimala": 12}.items():
+        yogas.append(Rule(
+            f"{name} Vipreet Raj Yoga", lord_in(house, *DUSTHANAS), 7, f"Lord of {house}th in dusthana.",
+            f"{name} Yoga gives rise through adversity and karmic protection.", (), (house,),
+        ))
+
+    # Raja and Dhana Yogas: association of kendra and trikona lords, or of wealth and fortune lords
+    for kendra in KENDRAS:
+        for trikona in (5, 9):
+            yogas.append(Rule(
+                f"Raja Yoga ({_ordinal(kendra)} and {_ordinal(trikona)} lords)",
+                any_of(lords_conjunct(kendra, trikona), exchange(kendra, trikona)), 8,
+                f"Lords of the {_ordinal(kendra)} and {_ordinal(trikona)} are conjunct or exchange signs.",
+                "Rise in status, authority and recognition.", (), (kendra, trikona),
+            ))
+    for wealth in (2, 11):
+        for fortune in (5, 9):
+            yogas.append(Rule(
+                f"Dhana Yoga ({_ordinal(wealth)} and {_ordinal(fortune)} lords)",
+                any_of(lords_conjunct(wealth, fortune), exchange(wealth, fortune)), 7,
+                f"Lords of the {_ordinal(wealth)} and {_ordinal(fortune)} are conjunct or exchange signs.",
+                "Accumulation of wealth and financial gains.", (), (wealth, fortune),
+            ))
+
+    # Parivartana Yogas: the lords of two houses occupy each other's sign
+    for a in range(1, 12):
+        for b in range(a + 1, 13):
+            if a in DUSTHANAS or b in DUSTHANAS:
+                kind, score, summary = "Dainya", 4, "Struggles early on that turn into gains through perseverance."
+            elif 3 in (a, b):
+                kind, score, summary = "Khala", 5, "Fluctuating fortunes; success through bold effort."
             else:
-                yogas.append({
-                    "name": f"{planet} Debilitated",
-                    "description": f"{planet} is in its debilitation sign ({deb_sign}).",
-                    "score": 2,
-                    "active": planet in active_dasha,
-                    "summary": f"Debilitated {planet} can reduce effectiveness unless strengthened.",
-                    "remedy": REMEDY_MAP["Debilitated Planet"]
-                })
-
+                kind, score, summary = "Maha", 8, "The two houses strengthen each other, bringing wealth and standing."
+            yogas.append(Rule(
+                f"{kind} Parivartana Yoga ({_ordinal(a)} and {_ordinal(b)})", exchange(a, b), score,
+                f"Lords of the {_ordinal(a)} and {_ordinal(b)} exchange signs.", summary, (), (a, b),
+                REMEDY_MAP["Dainya Parivartana Yoga"] if kind == "Dainya" else None,
+            ))
+
+    # Neecha Bhanga: a debilitated planet is rescued when the lord of its
+    # debilitation sign, or the planet exalted there, is in a kendra from the Lagna or Moon
+    for planet, deb_sign in DEBILITATED_SIGNS.items():
+        cancellers = [SIGN_LORDS[deb_sign]] + [p for p, s in EXALTED_SIGNS.items() if s == deb_sign and p != planet]
+        cancelled = any_of(*(
+            in_house(p, *KENDRAS) if p == "Moon" else any_of(in_house(p, *KENDRAS), from_planet(p, "Moon", *KENDRAS))
+            for p in cancellers
+        ))
+        yogas += [
+            Rule(
+                "Neecha Bhanga Raja Yoga", all_of(in_sign(planet, deb_sign), cancelled), 6,
+                f"{planet} is debilitated in {deb_sign} but cancellation occurs as {' or '.join(cancellers)} "
+                f"is in Kendra from Lagna or Moon.",
+                f"Neecha Bhanga restores the dignity of {planet} and empowers you through humility.",
+                (planet,), (), REMEDY_MAP["Neecha Bhanga Raja Yoga"],
+            ),
+            Rule(
+                f"{planet} Debilitated", all_of(in_sign(planet, deb_sign), negate(cancelled)), 2,
+                f"{planet} is in its debilitation sign ({deb_sign}).",
+                f"Debilitated {planet} can reduce effectiveness unless strengthened.",
+                (planet,), (), REMEDY_MAP["Debilitated Planet"],
+            ),
+        ]
     return yogas
+
+
+YOGAS = _yoga_catalogue()
+
+
+@lru_cache(maxsize=1)
+def compiled_yogas():
+    return compile_rules(YOGAS)
+
+
+def get_yogas(datetime_str, latitude, longitude, timezone_offset, ctx=None):
+    """Yogas in the chart, each flagged active if the running mahadasha lord takes part; pass `ctx` to reuse a ChartContext."""
+    ctx = ctx or ChartContext.from_datetime(datetime_str, latitude, longitude)
+    return detect(compiled_yogas(), *chart_arrays(ctx), ctx.current_mahadasha)
@@ -1,14 +1,12 @@
 import swisseph as swe
 from datetime import datetime
+from pytz import timezone
+from utils.ascendant import lagna_at
+from utils.ephemeris import PLANETS, EphemerisContext, calc_positions
+from utils.panchanga import get_timezone_name, jd_to_datetime, local_to_jd
 
-# Set ephemeris path if needed
-swe.set_ephe_path('/usr/share/ephe')
-
-PLANETS = {
-    'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS,
-    'Mercury': swe.MERCURY, 'Jupiter': swe.JUPITER, 'Venus': swe.VENUS,
-    'Saturn': swe.SATURN, 'Rahu': swe.MEAN_NODE, 'Ketu': swe.TRUE_NODE
-}
+# KP Ayanamsa hardcoded
+KP_CONTEXT = EphemerisContext(sid_mode=swe.SIDM_USER, sid_t0=0, sid_ayan_t0=23.999)
 
 NAKSHATRAS = [
     "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashirsha", "Ardra",
@@ -18,33 +16,74 @@ NAKSHATRAS = [
     "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
 
-def get_ayanamsa(jd):
-    return swe.get_ayanamsa(jd)
-
-def get_planet_positions(jd, debug=False):
-    positions = {}
-    raw_data = {}
-    for name, pid in PLANETS.items():
-        lon, lat, dist = swe.calc_ut(jd, pid)
-        sidereal_lon = lon - get_ayanamsa(jd)
-        sidereal_lon = sidereal_lon % 360
-        positions[name] = round(sidereal_lon, 4)
-        if debug:
-            raw_data[name] = {
-                "tropical": round(lon, 4),
-                "sidereal": round(sidereal_lon, 4)
-            }
-    return (positions, raw_data) if debug else (positions, None)
-
-def get_house_cusps(jd, latitude, longitude):
-    cusps, ascmc = swe.houses(jd, latitude, longitude, b'P')
-    return {
+# Vimshottari lords, repeating every nine nakshatras from Ashwini
+NAKSHATRA_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+
+SIGN_LORDS = {
+    "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
+    "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
+    "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
+}
+
+def get_julian_day(year, month, day, hour=12, minute=0, tz=5.5):
+    # Adjust for timezone
+    utc_hour = hour - tz
+    return swe.julday(year, month, day, utc_hour + (minute / 60.0))
+
+def get_ayanamsa(jd, context=KP_CONTEXT):
+    return context.ayanamsa(jd)
+
+def get_planet_positions(jd, debug=False, context=KP_CONTEXT):
+    batch = calc_positions(jd, PLANETS, context)
+    tropical, sidereal = batch.tropical[0], batch.sidereal[0]
+    positions = {
+        name: round(float(sidereal[i]), 4) for i, name in enumerate(batch.names)
+    }
+    if not debug:
+        return positions, None
+    raw_data = {
+        name: {
+            "tropical": round(float(tropical[i]), 4),
+            "sidereal": round(float(sidereal[i]), 4)
+        }
+        for i, name in enumerate(batch.names)
+    }
+    return positions, raw_data
+
+def get_houses(jd, latitude, longitude, context=KP_CONTEXT):
+    """House cusps and lagna from a single swe.houses call."""
+    cusps, ascmc = context.houses(jd, latitude, longitude, b'P')
+    house_cusps = {
         f"House_{i+1}": round(cusp, 4) for i, cusp in enumerate(cusps)
     }
+    return house_cusps, round(ascmc[0], 4)
+
+def get_house_cusps(jd, latitude, longitude, context=KP_CONTEXT):
+    return get_houses(jd, latitude, longitude, context)[0]
+
+def get_lagna(jd, latitude, longitude, context=KP_CONTEXT):
+    return get_houses(jd, latitude, longitude, context)[1]
 
-def get_lagna(jd, latitude, longitude):
-    _, ascmc = swe.houses(jd, latitude, longitude, b'P')
-    return round(ascmc[0], 4)
+def get_lagna_info(datetime_str, latitude, longitude, timezone_offset=None):
+    """
+    Sidereal (Lahiri) lagna rising at a local date-time, with the instants it
+    rose and sets, read from the cached ascendant-ingress table.
+    """
+    dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00")).replace(tzinfo=None)
+    tz = timezone(get_timezone_name(latitude, longitude))
+    return describe_lagna(lagna_at(local_to_jd(dt, tz), latitude, longitude), tz)
+
+def describe_lagna(span, tz):
+    """get_lagna_info dict for a LagnaSpan, with rise/set times local to `tz`."""
+    info = {
+        "lagna": span.name,
+        "lord": SIGN_LORDS[span.name],
+        "description": f"{span.name} Lagna, ruled by {SIGN_LORDS[span.name]}",
+    }
+    if span.start is not None:
+        info["rises"] = jd_to_datetime(span.start, tz).strftime("%H:%M")
+        info["sets"] = jd_to_datetime(span.end, tz).strftime("%H:%M")
+    return info
 
 def get_nakshatra_and_pada(moon_lon):
     deg = moon_lon % 360
@@ -56,28 +95,46 @@ def get_nakshatra_and_pada(moon_lon):
         "pada": pada
     }
 
-def generate_kundli_chart(jd, lat, lon, tz=5.5, system="kp", debug=False):
-    swe.set_sid_mode(swe.SIDM_USER, 0, 23.999)  # KP Ayanamsa hardcoded
+def get_nakshatra_info(ctx):
+    """Janma nakshatra (Moon's), pada and lord for a ChartContext."""
+    moon_lon = ctx.positions["Moon"]
+    info = get_nakshatra_and_pada(moon_lon)
+    index = NAKSHATRAS.index(info["nakshatra"])
+    info.update({
+        "lord": NAKSHATRA_LORDS[index % 9],
+        "moon_sign": ctx.moon_sign,
+        "moon_longitude": round(moon_lon, 4),
+    })
+    return info
 
-    planet_positions, raw_planets = get_planet_positions(jd, debug)
-    lagna = get_lagna(jd, lat, lon)
+def generate_kundli_chart(jd, lat, lon, tz=5.5, system="kp", debug=False, context=KP_CONTEXT):
+    from utils.chart import Chart  # utils.chart imports this module
+
+    batch = calc_positions(jd, PLANETS, context)
+    house_cusps, lagna = get_houses(jd, lat, lon, context)
+    # swe.houses gives the tropical ascendant; the Chart is sidereal like the batch
+    ascendant = (lagna - float(batch.ayanamsa[0])) % 360
+    natal = Chart.from_batch(batch, ascendant // 30, ascendant=ascendant)
+    planet_positions = natal.planet_positions()
     moon_deg = planet_positions['Moon']
-    nakshatra_info = get_nakshatra_and_pada(moon_deg)
 
     chart = {
         "planet_positions": planet_positions,
         "ascendant": lagna,
-        "nakshatra_details": nakshatra_info
+        "nakshatra_details": natal.nakshatra_of("Moon")
     }
 
     if system == "kp":
-        chart["house_cusps"] = get_house_cusps(jd, lat, lon)
+        chart["house_cusps"] = house_cusps
 
     if debug:
         chart["debug"] = {
             "julian_day": jd,
-            "ayanamsa": round(get_ayanamsa(jd), 6),
-            "raw_planet_positions": raw_planets,
+            "ayanamsa": round(get_ayanamsa(jd, context), 6),
+            "raw_planet_positions": {
+                name: {"tropical": round(float(batch.tropical[0, i]), 4), "sidereal": planet_positions[name]}
+                for i, name in enumerate(batch.names)
+            },
             "ascendant_deg": lagna,
             "moon_deg": moon_deg
         }
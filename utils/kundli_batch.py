@@ -0,0 +1,85 @@
+# utils/kundli_batch.py
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.kundli import generate_kundli_chart, get_julian_day
+from utils.models import KundliBatchRecord
+
+BATCH_WORKERS = int(os.getenv("KUNDLI_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+BATCH_CHUNKSIZE = int(os.getenv("KUNDLI_BATCH_CHUNKSIZE", "32"))
+MAX_BATCH_RECORDS = int(os.getenv("KUNDLI_BATCH_MAX_RECORDS", "50000"))
+
+_pool = None
+
+
+def get_pool():
+    """
+    Worker processes are created on first use and reused across requests.
+    swisseph holds the GIL and keeps global state, so processes (not threads)
+    are what actually spread the work over cores.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def parse_records(body: bytes, content_type: str = "") -> list:
+    """Accepts either a JSON array of records or NDJSON (one record per line)."""
+    try:
+        text = body.decode("utf-8").strip()
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Request body is not valid UTF-8 (byte {e.start})")
+    if not text:
+        raise ValueError("Empty request body")
+
+    if "ndjson" in content_type or not text.startswith("["):
+        records = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no}: {e.msg}")
+    else:
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON array: {e.msg}")
+
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array or NDJSON records")
+    if len(records) > MAX_BATCH_RECORDS:
+        raise ValueError(f"Batch too large: {len(records)} records (max {MAX_BATCH_RECORDS})")
+    return records
+
+
+def compute_record(item):
+    """Runs in a worker process: one birth record -> one NDJSON-ready dict."""
+    index, record = item
+    try:
+        if not isinstance(record, dict):
+            raise ValueError("Record must be a JSON object")
+        r = KundliBatchRecord(**record)
+        jd = get_julian_day(r.year, r.month, r.day, r.hour, r.minute, r.tz)
+        chart = generate_kundli_chart(jd, r.latitude, r.longitude, r.tz, r.system, r.debug)
+        return {"index": index, "result": chart}
+    except Exception as e:
+        return {"index": index, "error": str(e)}
+
+
+def stream_kundli_batch(records):
+    """Yields NDJSON lines in input order, each as soon as its chunk is done."""
+    results = get_pool().map(compute_record, enumerate(records), chunksize=BATCH_CHUNKSIZE)
+    for result in results:
+        yield json.dumps(result, default=str) + "\n"
@@ -1,14 +1,8 @@
 # utils/language_utils.py
 
-import os
 import logging
 
-try:
-    from openai import OpenAI
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=openai_api_key) if openai_api_key else None
-except ImportError:
-    client = None
+from utils.lazy import get_resource
 
 # --- Logger ---
 logger = logging.getLogger(__name__)
@@ -116,6 +110,7 @@ def translate_output(text: str, target_language: str = "en") -> str:
         return translated
 
     # Fallback OpenAI translation if client is configured
+    client = get_resource("openai")
     if client:
         try:
             response = client.chat.completions.create(
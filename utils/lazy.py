@@ -0,0 +1,126 @@
+# utils/lazy.py
+
+"""
+Deferred loading of heavy optional dependencies and API clients.
+
+Only a few endpoints need PDF, QR, OpenAI, geocoding or timezone-polygon
+code, so nothing here is imported at service start:
+
+    fpdf = lazy_import("fpdf")          # module proxy, imported on first attribute access
+    client = get_resource("openai")     # registered factory, built once per process
+
+Factories run at most once per process (under a lock) and their result is
+shared; a factory may return None when the dependency or its credentials
+are missing, and callers keep their existing fallback for that case.
+"""
+
+import importlib
+import os
+import threading
+import types
+
+_factories = {}
+_resources = {}
+_lock = threading.RLock()
+
+
+def register(name, factory):
+    """Registers a zero-argument factory for get_resource(name); replaces any earlier one."""
+    with _lock:
+        _factories[name] = factory
+        _resources.pop(name, None)
+
+
+def get_resource(name):
+    """Shared instance built by the factory registered under `name`."""
+    try:
+        return _resources[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _resources:
+            if name not in _factories:
+                raise KeyError(f"No lazy resource registered as '{name}'")
+            _resources[name] = _factories[name]()
+        return _resources[name]
+
+
+def loaded():
+    """Names of the resources built so far."""
+    return sorted(_resources)
+
+
+def reset(name=None):
+    """Drops one (or every) built resource so the next get_resource rebuilds it."""
+    with _lock:
+        if name is None:
+            _resources.clear()
+        else:
+            _resources.pop(name, None)
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"] or importlib.import_module(self.__name__)
+                self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name):
+    """Module proxy for `name`; an ImportError surfaces on first use, not at import."""
+    return LazyModule(name)
+
+
+def optional_import(name):
+    """Imports `name` now, or returns None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# ------------------ Registered resources ------------------
+
+def _openai_client():
+    openai = optional_import("openai")
+    api_key = os.getenv("OPENAI_API_KEY")
+    if openai is None or not api_key:
+        return None
+    return openai.OpenAI(api_key=api_key)
+
+
+def _openai_module():
+    # Module-level API (openai.ChatCompletion) used by the older chat helpers
+    openai = optional_import("openai")
+    if openai is not None:
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+    return openai
+
+
+def _nominatim():
+    from geopy.geocoders import Nominatim
+    return Nominatim(user_agent="navadharma")
+
+
+def _timezone_finder():
+    # Loading the polygon data is the expensive part
+    from timezonefinder import TimezoneFinder
+    return TimezoneFinder()
+
+
+register("openai", _openai_client)
+register("openai_module", _openai_module)
+register("nominatim", _nominatim)
+register("timezone_finder", _timezone_finder)
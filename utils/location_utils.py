@@ -1,24 +1,21 @@
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
 from datetime import datetime
 import pytz
+from utils.timezones import timezone_at
+from utils.geolocation import get_lat_lon_timezone
 
 def get_coordinates(place_name):
     """
-    Returns (latitude, longitude) for a given place name using geopy.
+    Returns (latitude, longitude) for a given place name, from the offline
+    gazetteer with Nominatim as fallback.
     """
-    geolocator = Nominatim(user_agent="navadharma_astrology")
-    location = geolocator.geocode(place_name)
-    if not location:
-        raise ValueError(f"Location not found: {place_name}")
-    return location.latitude, location.longitude
+    lat, lon, _ = get_lat_lon_timezone(place_name)
+    return lat, lon
 
 def get_timezone_name(lat, lon):
     """
-    Returns timezone name (e.g. 'Asia/Kolkata') from coordinates using TimezoneFinder.
+    Returns timezone name (e.g. 'Asia/Kolkata') from coordinates via the shared timezone cache.
     """
-    tf = TimezoneFinder()
-    tz_name = tf.timezone_at(lng=lon, lat=lat)
+    tz_name = timezone_at(lat, lon)
     if not tz_name:
         raise ValueError("Timezone not found for coordinates.")
     return tz_name
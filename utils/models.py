@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Literal
 
 class KundliRequest(BaseModel):
     datetime: str
@@ -7,6 +8,18 @@ class KundliRequest(BaseModel):
     longitude: float
     timezone: float
 
+class KundliBatchRecord(BaseModel):
+    year: int
+    month: int
+    day: int
+    hour: int = 12
+    minute: int = 0
+    latitude: float
+    longitude: float
+    tz: float = 5.5
+    system: Literal["vedic", "kp"] = "kp"
+    debug: bool = False
+
 class MonthlyRequest(BaseModel):
     rashi: str
     month: str = None
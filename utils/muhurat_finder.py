@@ -1,50 +1,182 @@
-def find_muhurats(date_str, latitude, longitude, timezone_offset, muhurat_type="marriage"):
-    config = MUHURAT_TYPES.get(muhurat_type.lower(), MUHURAT_TYPES["marriage"])
-    muhurats = []
-    top_gpt_summary = ""
+# utils/muhurat_finder.py
+
+from datetime import datetime
+
+from pytz import timezone
+
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.panchanga import get_timezone_name, jd_to_datetime, local_to_jd
+from utils.panchanga_transitions import element_at, get_lagna_transitions, get_panchanga_transitions
+
+AUSPICIOUS_TITHIS = ["Dvitiya", "Tritiya", "Panchami", "Saptami", "Dashami", "Ekadashi", "Trayodashi"]
+AUSPICIOUS_YOGAS = [
+    "Priti", "Ayushman", "Saubhagya", "Shobhana", "Sukarma", "Dhriti", "Vriddhi", "Dhruva",
+    "Harshana", "Siddhi", "Variyana", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla",
+    "Brahma", "Indra"
+]
+
+# Tithis are matched without their paksha ("Shukla Panchami" -> "Panchami")
+MUHURAT_TYPES = {
+    "marriage": {
+        "tithis": AUSPICIOUS_TITHIS,
+        "nakshatras": [
+            "Rohini", "Mrigashirsha", "Magha", "Uttara Phalguni", "Hasta", "Swati",
+            "Anuradha", "Mula", "Uttara Ashadha", "Uttara Bhadrapada", "Revati"
+        ],
+        "yogas": AUSPICIOUS_YOGAS,
+        "lagnas": ["Taurus", "Gemini", "Virgo", "Libra"],
+        "weights": {"tithi": 2, "nakshatra": 3, "yoga": 1, "lagna": 2},
+    },
+    "travel": {
+        "tithis": AUSPICIOUS_TITHIS,
+        "nakshatras": [
+            "Ashwini", "Mrigashirsha", "Punarvasu", "Pushya", "Hasta",
+            "Anuradha", "Shravana", "Dhanishta", "Revati"
+        ],
+        "yogas": AUSPICIOUS_YOGAS,
+        "lagnas": ["Aries", "Cancer", "Libra", "Capricorn"],
+        "weights": {"tithi": 2, "nakshatra": 3, "yoga": 1, "lagna": 2},
+    },
+    "business": {
+        "tithis": AUSPICIOUS_TITHIS + ["Purnima"],
+        "nakshatras": [
+            "Ashwini", "Rohini", "Pushya", "Uttara Phalguni", "Hasta", "Chitra",
+            "Anuradha", "Uttara Ashadha", "Uttara Bhadrapada", "Revati"
+        ],
+        "yogas": AUSPICIOUS_YOGAS,
+        "lagnas": ["Taurus", "Leo", "Scorpio", "Aquarius"],
+        "weights": {"tithi": 2, "nakshatra": 3, "yoga": 1, "lagna": 2},
+    },
+}
+
+MUHURAT_THRESHOLD = 6
+# Local hours searched for muhurats
+MUHURAT_DAY_START = 5
+MUHURAT_DAY_END = 21
+
+SCORED_ELEMENTS = ("tithi", "nakshatra", "yoga")
+
+
+def score_window(config, tithi, nakshatra, yoga, lagna):
+    """Score and reasons for one combination of element names; lagna may be None (not yet known)."""
+    weights = config["weights"]
+    score = 0
+    reasons = []
+
+    tithi_name = tithi.split()[-1]
+    if tithi_name in config["tithis"]:
+        score += weights["tithi"]
+        reasons.append(f"Good Tithi ({tithi_name})")
+
+    if nakshatra in config["nakshatras"]:
+        score += weights["nakshatra"]
+        reasons.append(f"Favorable Nakshatra ({nakshatra})")
+
+    if yoga in config["yogas"]:
+        score += weights["yoga"]
+        reasons.append(f"Auspicious Yoga ({yoga})")
 
-    base_time = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    if lagna in config["lagnas"]:
+        score += weights["lagna"]
+        reasons.append(f"Supportive Lagna ({lagna})")
 
-    for hour in range(5, 21, 2):
-        dt = base_time.replace(hour=hour, minute=0, second=0)
-        iso = dt.isoformat() + "Z"
+    return score, reasons
 
-        panchanga = get_panchanga(iso, latitude, longitude, timezone_offset)
-        lagna = get_lagna_info(iso, latitude, longitude, timezone_offset)["lagna"]
 
-        tithi_num = panchanga["tithi"].split()[1]
-        nak = panchanga["nakshatra"].split("–")[0]
-        yoga = panchanga["yoga"]
+def _cuts(start_jd, end_jd, spans):
+    """Sorted instants at which any of `spans` changes inside [start_jd, end_jd], plus both ends."""
+    cuts = {start_jd, end_jd}
+    cuts.update(s.start for s in spans if start_jd < s.start < end_jd)
+    return sorted(cuts)
 
-        score = 0
-        reasons = []
 
-        if tithi_num in config["tithis"]:
-            score += config["weights"]["tithi"]
-            reasons.append(f"Good Tithi ({tithi_num})")
+def prune_intervals(spans, start_jd, end_jd, config, threshold=MUHURAT_THRESHOLD):
+    """
+    Moon-only stage: cuts [start_jd, end_jd] at every tithi, nakshatra and
+    yoga change and keeps the pieces that could still reach `threshold`
+    with a supportive lagna. Returns [(start_jd, end_jd, {element: ElementSpan})].
+    """
+    moon_spans = [s for element in SCORED_ELEMENTS for s in spans[element]]
+    cuts = _cuts(start_jd, end_jd, moon_spans)
 
-        if nak in config["nakshatras"]:
-            score += config["weights"]["nakshatra"]
-            reasons.append(f"Favorable Nakshatra ({nak})")
+    pieces = []
+    for start, end in zip(cuts, cuts[1:]):
+        active = {element: element_at(spans[element], (start + end) / 2) for element in SCORED_ELEMENTS}
+        score, _ = score_window(config, active["tithi"].name, active["nakshatra"].name, active["yoga"].name, None)
+        if score + config["weights"]["lagna"] >= threshold:
+            pieces.append((start, end, active))
+    return pieces
 
-        if yoga in config["yogas"]:
-            score += config["weights"]["yoga"]
-            reasons.append(f"Auspicious Yoga ({yoga})")
 
-        if lagna in config["lagnas"]:
-            score += config["weights"]["lagna"]
-            reasons.append(f"Supportive Lagna ({lagna})")
+def score_with_lagna(pieces, latitude, longitude, config, threshold=MUHURAT_THRESHOLD, context=DEFAULT_CONTEXT):
+    """
+    Lagna stage: computes rising-sign transitions across `pieces` (from
+    prune_intervals, all within one day) and returns the exact windows
+    scoring at least `threshold` as [(start_jd, end_jd, spans, score, reasons)].
+    """
+    if not pieces:
+        return []
+    lagnas = get_lagna_transitions(pieces[0][0], pieces[-1][1], latitude, longitude, context)
+
+    windows = []
+    for piece_start, piece_end, active in pieces:
+        cuts = _cuts(piece_start, piece_end, lagnas)
+        for start, end in zip(cuts, cuts[1:]):
+            lagna = element_at(lagnas, (start + end) / 2)
+            score, reasons = score_window(
+                config, active["tithi"].name, active["nakshatra"].name, active["yoga"].name, lagna.name
+            )
+            if score >= threshold:
+                windows.append((start, end, {**active, "lagna": lagna}, score, reasons))
+    return windows
+
+
+def find_muhurat_windows(start_jd, end_jd, latitude, longitude, config, threshold=MUHURAT_THRESHOLD, context=DEFAULT_CONTEXT):
+    """
+    Exact windows in [start_jd, end_jd] scoring at least `threshold`.
+
+    Tithi, nakshatra, yoga and lagna change only at their transition
+    instants, so the union of those instants cuts the range into intervals
+    of constant score; each interval is scored once at its midpoint, and
+    lagna is only computed where the Moon-driven elements leave a chance.
+    Returns [(start_jd, end_jd, spans, score, reasons)] in time order, where
+    `spans` maps element -> ElementSpan.
+    """
+    spans = get_panchanga_transitions(start_jd, end_jd, list(SCORED_ELEMENTS), context=context)
+    pieces = prune_intervals(spans, start_jd, end_jd, config, threshold)
+    return score_with_lagna(pieces, latitude, longitude, config, threshold, context)
+
+
+def format_window(window, tz):
+    """One window from find_muhurat_windows as the dict returned to API callers."""
+    start, end, active, score, reasons = window
+    start_dt, end_dt = jd_to_datetime(start, tz), jd_to_datetime(end, tz)
+    return {
+        "date": start_dt.strftime("%Y-%m-%d"),
+        "time": start_dt.strftime("%H:%M"),
+        "start": start_dt.strftime("%H:%M"),
+        "end": end_dt.strftime("%H:%M"),
+        "duration_minutes": round((end - start) * 1440),
+        "lagna": active["lagna"].name,
+        "tithi": active["tithi"].name,
+        "nakshatra": active["nakshatra"].name,
+        "yoga": active["yoga"].name,
+        "score": score,
+        "reasons": reasons
+    }
+
+
+def find_muhurats(date_str, latitude, longitude, timezone_offset, muhurat_type="marriage"):
+    config = MUHURAT_TYPES.get(muhurat_type.lower(), MUHURAT_TYPES["marriage"])
+    top_gpt_summary = ""
+
+    base_time = datetime.fromisoformat(date_str.replace("Z", "+00:00")).replace(tzinfo=None)
+    tz = timezone(get_timezone_name(latitude, longitude))
+    start_jd = local_to_jd(base_time.replace(hour=MUHURAT_DAY_START, minute=0, second=0, microsecond=0), tz)
+    end_jd = local_to_jd(base_time.replace(hour=MUHURAT_DAY_END, minute=0, second=0, microsecond=0), tz)
 
-        if score >= 6:
-            muhurats.append({
-                "time": dt.strftime("%H:%M"),
-                "lagna": lagna,
-                "tithi": panchanga["tithi"],
-                "nakshatra": panchanga["nakshatra"],
-                "yoga": yoga,
-                "score": score,
-                "reasons": reasons
-            })
+    windows = find_muhurat_windows(start_jd, end_jd, latitude, longitude, config)
+    muhurats = [format_window(window, tz) for window in windows]
 
     # GPT Summary (top muhurat)
     if muhurats:
@@ -56,7 +188,7 @@ def find_muhurats(date_str, latitude, longitude, timezone_offset, muhurat_type="
         }.get(muhurat_type, "important activity")
 
         top_gpt_summary = (
-            f"Tomorrow’s best time for {action} is **{top['time']}** under **{top['lagna']} Lagna** "
+            f"Tomorrow’s best time for {action} is **{top['start']}–{top['end']}** under **{top['lagna']} Lagna** "
             f"and **{top['yoga']} Yoga**, with **{top['nakshatra']}** and **{top['tithi']}**. "
             "This time is astrologically favorable and spiritually uplifting."
         )
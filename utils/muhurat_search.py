@@ -0,0 +1,115 @@
+# utils/muhurat_search.py
+
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+
+from pytz import timezone
+
+from utils.kundli_batch import get_pool
+from utils.muhurat_finder import (
+    MUHURAT_DAY_END, MUHURAT_DAY_START, MUHURAT_THRESHOLD, MUHURAT_TYPES, SCORED_ELEMENTS,
+    format_window, prune_intervals, score_with_lagna
+)
+from utils.panchanga import get_timezone_name, local_to_jd
+from utils.panchanga_transitions import get_panchanga_transitions
+
+MAX_SEARCH_DAYS = int(os.getenv("MUHURAT_MAX_SEARCH_DAYS", "366"))
+# Below this many surviving days the lagna stage runs in-process; worker
+# round-trips cost more than the few milliseconds each day takes
+PARALLEL_MIN_DAYS = int(os.getenv("MUHURAT_PARALLEL_MIN_DAYS", "60"))
+PARALLEL_CHUNKSIZE = 8
+
+
+def _lagna_stage(task):
+    """Runs in a worker process: one day's surviving pieces -> scored windows."""
+    muhurat_type, latitude, longitude, threshold, pieces = task
+    return score_with_lagna(pieces, latitude, longitude, MUHURAT_TYPES[muhurat_type], threshold)
+
+
+def candidate_days(start_date, days, muhurat_type, threshold, tz):
+    """
+    Cheap stage over the whole range: one set of tithi/nakshatra/yoga
+    transitions, then per-day pruning. Yields each day's surviving pieces where
+    some interval could still reach `threshold`.
+    """
+    config = MUHURAT_TYPES[muhurat_type]
+    windows = []
+    for i in range(days):
+        day = start_date + timedelta(days=i)
+        windows.append((
+            local_to_jd(day.replace(hour=MUHURAT_DAY_START), tz),
+            local_to_jd(day.replace(hour=MUHURAT_DAY_END), tz),
+        ))
+
+    spans = get_panchanga_transitions(windows[0][0], windows[-1][1], list(SCORED_ELEMENTS))
+    for start_jd, end_jd in windows:
+        pieces = prune_intervals(spans, start_jd, end_jd, config, threshold)
+        if pieces:
+            yield pieces
+
+
+def iter_muhurat_range(start_date_str, days, latitude, longitude, muhurat_type="marriage", threshold=MUHURAT_THRESHOLD):
+    """
+    Qualifying windows (as format_window dicts) across `days` days from
+    `start_date_str`, in date order. Days are rejected on the Moon-driven
+    elements first; only survivors get lagna transitions, spread over the
+    shared worker pool when there are enough of them.
+
+    Arguments are validated eagerly (ValueError); the windows are produced
+    lazily by the returned iterator.
+    """
+    if not 0 < days <= MAX_SEARCH_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_SEARCH_DAYS}")
+    muhurat_type = muhurat_type.lower()
+    if muhurat_type not in MUHURAT_TYPES:
+        raise ValueError(f"Unknown muhurat type: {muhurat_type}")
+    start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00")).replace(
+        tzinfo=None, hour=0, minute=0, second=0, microsecond=0
+    )
+    return _iter_windows(start_date, days, latitude, longitude, muhurat_type, threshold)
+
+
+def _iter_windows(start_date, days, latitude, longitude, muhurat_type, threshold):
+    tz = timezone(get_timezone_name(latitude, longitude))
+    tasks = [
+        (muhurat_type, latitude, longitude, threshold, pieces)
+        for pieces in candidate_days(start_date, days, muhurat_type, threshold, tz)
+    ]
+    if len(tasks) >= PARALLEL_MIN_DAYS:
+        results = get_pool().map(_lagna_stage, tasks, chunksize=PARALLEL_CHUNKSIZE)
+    else:
+        results = map(_lagna_stage, tasks)
+
+    for windows in results:
+        for window in windows:
+            yield format_window(window, tz)
+
+
+def window_rank(window):
+    """Higher score first, then longer windows; ties keep date order."""
+    return window["score"], window["duration_minutes"]
+
+
+def find_best_muhurats(start_date_str, days, latitude, longitude, muhurat_type="marriage", top_k=10, threshold=MUHURAT_THRESHOLD):
+    """Top `top_k` windows over the range, best first."""
+    windows = iter_muhurat_range(start_date_str, days, latitude, longitude, muhurat_type, threshold)
+    return heapq.nlargest(top_k, windows, key=window_rank)
+
+
+def stream_muhurat_search(windows, top_k=10):
+    """
+    NDJSON lines: {"window": ...} for each qualifying window as soon as its
+    day is scored, then a final {"top": [...]} with the best `top_k`.
+    """
+    best = []
+    for order, window in enumerate(windows):
+        yield json.dumps({"window": window}) + "\n"
+        entry = (window_rank(window), -order, window)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        elif best and entry > best[0]:
+            heapq.heapreplace(best, entry)
+    top = [window for _, _, window in sorted(best, key=lambda e: e[:2], reverse=True)]
+    yield json.dumps({"top": top}) + "\n"
@@ -2,10 +2,9 @@
 
 import swisseph as swe
 from datetime import datetime, timedelta
-from timezonefinder import TimezoneFinder
 from pytz import timezone, utc
-
-swe.set_ephe_path('.')  # Set ephemeris path to current directory
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.timezones import timezone_at
 
 # --- Constants ---
 TITHI_NAMES = [
@@ -27,8 +26,20 @@ NAKSHATRA_NAMES = [
     "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
 
-YOGA_NAMES = [ ... ]  # (Same as before)
-KARANA_NAMES = [ ... ]  # (Same as before)
+YOGA_NAMES = [
+    "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda",
+    "Sukarma", "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva",
+    "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyana",
+    "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla",
+    "Brahma", "Indra", "Vaidhriti"
+]
+
+# 7 movable karanas repeat through the month; the 4 fixed ones occupy the
+# last three half-tithis of Krishna paksha and the first of Shukla Pratipada
+KARANA_NAMES = [
+    "Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti",
+    "Shakuni", "Chatushpada", "Naga", "Kimstughna"
+]
 WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
 
 RAHU_KAAL_INDEX = {
@@ -56,32 +67,45 @@ RAVI_YOGA_PAIRS = {
 def get_panchanga(date_str, lat, lon, tz_offset):
     date = datetime.fromisoformat(date_str)
     tz = timezone(get_timezone_name(lat, lon))
-    local_dt = tz.localize(date)
-    utc_dt = local_dt.astimezone(utc)
-    jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute / 60)
+    jd = local_to_jd(date, tz)
 
-    # Sunrise & Sunset
-    sunrise_jd, _ = swe.rise_trans(jd, swe.SUN, lon, lat, rsmi=1)
-    sunset_jd, _ = swe.rise_trans(jd, swe.SUN, lon, lat, rsmi=2)
-    sunrise_dt = jd_to_datetime(sunrise_jd, tz)
-    sunset_dt = jd_to_datetime(sunset_jd, tz)
+    # Sunrise & Sunset, plus the next sunrise to close the night. For a
+    # single day three rise_trans searches beat building a rise/set table;
+    # multi-day callers use utils.riseset instead (see panchanga_calendar).
+    sunrise_jd = DEFAULT_CONTEXT.rise_trans(jd, swe.SUN, swe.CALC_RISE, lat, lon)
+    sunset_jd = DEFAULT_CONTEXT.rise_trans(jd, swe.SUN, swe.CALC_SET, lat, lon)
+    next_sunrise_jd = DEFAULT_CONTEXT.rise_trans(sunset_jd, swe.SUN, swe.CALC_RISE, lat, lon) if sunset_jd else None
 
     # Planetary Longitudes
-    moon_long, _ = swe.calc_ut(jd, swe.MOON)
-    sun_long, _ = swe.calc_ut(jd, swe.SUN)
+    moon_long = DEFAULT_CONTEXT.calc(jd, swe.MOON)
+    sun_long = DEFAULT_CONTEXT.calc(jd, swe.SUN)
+    ayanamsa = DEFAULT_CONTEXT.ayanamsa(jd)
+
+    return build_panchanga_day(
+        date_str, date, tz, sunrise_jd, sunset_jd, next_sunrise_jd, sun_long[0], moon_long[0], ayanamsa
+    )
 
-    # Panchanga Calculations
-    diff = (moon_long[0] - sun_long[0]) % 360
+def build_panchanga_day(date_str, date, tz, sunrise_jd, sunset_jd, next_sunrise_jd, sun_lon, moon_lon, ayanamsa):
+    """
+    Assembles one day's panchanga from precomputed inputs, so multi-day callers
+    can share sunrise and ephemeris work. Without `next_sunrise_jd` the night
+    is taken to end 24h after sunrise.
+    """
+    sunrise_dt = jd_to_datetime(sunrise_jd, tz)
+    sunset_dt = jd_to_datetime(sunset_jd, tz)
+    next_sunrise_dt = jd_to_datetime(next_sunrise_jd, tz) if next_sunrise_jd else None
+
+    # Panchanga Calculations (nakshatra and yoga are on the sidereal zodiac)
+    diff = (moon_lon - sun_lon) % 360
     tithi_index = int(diff / 12)
     tithi = TITHI_NAMES[tithi_index]
-    nakshatra_index = int(moon_long[0] / (360 / 27))
+    nakshatra_index = int(((moon_lon - ayanamsa) % 360) / (360 / 27))
     nakshatra = NAKSHATRA_NAMES[nakshatra_index]
-    yoga_index = int(((sun_long[0] + moon_long[0]) % 360) / (360 / 27))
+    yoga_index = int(((sun_lon + moon_lon - 2 * ayanamsa) % 360) / (360 / 27))
     yoga = YOGA_NAMES[yoga_index]
-    karana_index = int((diff % 60) / 6)
-    karana = KARANA_NAMES[karana_index + 7] if tithi_index in [14, 29] else KARANA_NAMES[karana_index % 7]
+    karana = get_karana_name(int(diff / 6))
 
-    weekday = WEEKDAYS[date.weekday()]
+    weekday = get_weekday(date)
     rahu_start, rahu_end = get_rahu_kaal(sunrise_dt, sunset_dt, weekday)
     abhijit_start, abhijit_end = get_abhijit_muhurat(sunrise_dt, sunset_dt)
     abhijit_in_rahu = time_ranges_overlap(abhijit_start, abhijit_end, rahu_start, rahu_end)
@@ -89,19 +113,11 @@ def get_panchanga(date_str, lat, lon, tz_offset):
     # Yogas
     ravi_yoga = is_ravi_yoga(weekday, nakshatra)
     amrit_siddhi = is_amrit_siddhi_yoga(weekday, nakshatra)
-    moon_phase = get_moon_phase(sun_long[0], moon_long[0])
-    vedic_month = get_vedic_month(sun_long[0])
+    moon_phase = get_moon_phase(sun_lon, moon_lon)
+    vedic_month = get_vedic_month(sun_lon)
 
     # Vrat & Festivals
     festivals = get_festivals(tithi, nakshatra, weekday, date)
-    if "Chaturthi" in tithi:
-        festivals.append("Chaturthi Vrat")
-    if "Ekadashi" in tithi:
-        festivals.append("Ekadashi Vrat")
-    if "Trayodashi" in tithi and "Krishna" in tithi:
-        festivals.append("Pradosham Vrat")
-    if "Chaturthi" in tithi and "Krishna" in tithi:
-        festivals.append("Sankashti Chaturthi")
 
     moon_event = None
     if tithi == "Purnima":
@@ -135,47 +151,81 @@ def get_panchanga(date_str, lat, lon, tz_offset):
         },
         "moon_phase": moon_phase,
         "vedic_month": vedic_month,
-        "choghadiya": get_choghadiya(sunrise_dt, sunset_dt)
+        "choghadiya": get_choghadiya(sunrise_dt, sunset_dt, next_sunrise_dt)
     }
 
 # --- Monthly Ekadashi/Chaturthi/Purnima Listing ---
 def get_monthly_utsav_list(start_date_str, lat, lon, days=30, tz_offset=5.5):
+    # Tithi/nakshatra for the whole range come from one transition solve
+    # instead of a full get_panchanga per day
+    from utils.panchanga_transitions import get_panchanga_transitions, element_at
+
     start_date = datetime.fromisoformat(start_date_str)
+    tz = timezone(get_timezone_name(lat, lon))
+    day_list = [start_date + timedelta(days=i) for i in range(days)]
+    jds = [local_to_jd(day, tz) for day in day_list]
+    spans = get_panchanga_transitions(jds[0], jds[-1], ["tithi", "nakshatra"])
+
     events = []
-    for i in range(days):
-        day = start_date + timedelta(days=i)
-        panchanga = get_panchanga(day.isoformat(), lat, lon, tz_offset)
-        if any(f for f in panchanga["festivals"] if "Vrat" in f or "Jayanti" in f or "Ekadashi" in f):
+    for day, jd in zip(day_list, jds):
+        tithi = element_at(spans["tithi"], jd).name
+        nakshatra = element_at(spans["nakshatra"], jd).name
+        weekday = get_weekday(day)
+        festivals = get_festivals(tithi, nakshatra, weekday, day)
+        if any(f for f in festivals if "Vrat" in f or "Jayanti" in f or "Ekadashi" in f):
             events.append({
-                "date": panchanga["date"],
-                "weekday": panchanga["weekday"],
-                "festivals": panchanga["festivals"]
+                "date": day.isoformat(),
+                "weekday": weekday,
+                "festivals": festivals
             })
     return events
 
 # --- Monthly Full Moon / New Moon Dates ---
 def get_purnima_amavasya_list(start_date_str, lat, lon, days=30, tz_offset=5.5):
+    from utils.syzygy import SYZYGY_EVENTS, find_syzygies
+
     start_date = datetime.fromisoformat(start_date_str)
+    tz = timezone(get_timezone_name(lat, lon))
+    start_jd = local_to_jd(start_date, tz)
+    jds, events = find_syzygies(start_jd, start_jd + days)
+
     results = []
-    for i in range(days):
-        day = start_date + timedelta(days=i)
-        p = get_panchanga(day.isoformat(), lat, lon, tz_offset)
-        if p.get("moon_event") in ["Purnima", "Amavasya"]:
-            results.append({
-                "date": p["date"],
-                "event": p["moon_event"],
-                "weekday": p["weekday"]
-            })
+    for jd_val, event in zip(jds.tolist(), events.tolist()):
+        local_dt = jd_to_datetime(jd_val, tz)
+        day = local_dt.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        results.append({
+            "date": day.isoformat(),
+            "event": SYZYGY_EVENTS[event],
+            "weekday": get_weekday(day),
+            "time": local_dt.strftime("%I:%M %p")
+        })
     return results
 
 # --- Helpers ---
+def local_to_jd(local_dt, tz):
+    utc_dt = tz.localize(local_dt).astimezone(utc)
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute / 60)
+
+def get_weekday(date):
+    # WEEKDAYS starts on Sunday; datetime.weekday() starts on Monday
+    return WEEKDAYS[date.isoweekday() % 7]
+
 def jd_to_datetime(jd_val, tz):
     y, m, d, h = swe.revjul(jd_val)
-    utc_dt = datetime(y, m, d) + timedelta(days=h)
+    # Round to the second so instants built from local times (e.g. 05:00) don't print as 04:59
+    utc_dt = datetime(y, m, d) + timedelta(seconds=round(h * 3600))
     return utc_dt.replace(tzinfo=utc).astimezone(tz)
 
+def get_karana_name(karana_index):
+    """Karana for the n-th (0-59) half-tithi of the lunar month."""
+    if karana_index == 0:
+        return KARANA_NAMES[10]
+    if karana_index >= 57:
+        return KARANA_NAMES[karana_index - 50]
+    return KARANA_NAMES[(karana_index - 1) % 7]
+
 def get_timezone_name(lat, lon):
-    return TimezoneFinder().timezone_at(lat=lat, lng=lon) or "UTC"
+    return timezone_at(lat, lon) or "UTC"
 
 def get_rahu_kaal(sunrise, sunset, weekday):
     index = RAHU_KAAL_INDEX[weekday]
@@ -191,7 +241,7 @@ def get_abhijit_muhurat(sunrise, sunset):
 def time_ranges_overlap(start1, end1, start2, end2):
     return start1 < end2 and start2 < end1
 
-def get_choghadiya(sunrise, sunset):
+def get_choghadiya(sunrise, sunset, next_sunrise=None):
     choghadiya = {"day": [], "night": []}
     slot = (sunset - sunrise).total_seconds() / 8
     for i in range(8):
@@ -199,7 +249,7 @@ def get_choghadiya(sunrise, sunset):
         e = s + timedelta(seconds=slot)
         choghadiya["day"].append(f"{s.strftime('%I:%M %p')} - {e.strftime('%I:%M %p')}")
     night_start = sunset
-    night_end = sunrise + timedelta(days=1)
+    night_end = next_sunrise or sunrise + timedelta(days=1)
     slot = (night_end - night_start).total_seconds() / 8
     for i in range(8):
         s = night_start + timedelta(seconds=i * slot)
@@ -241,4 +291,12 @@ def get_festivals(tithi, nakshatra, weekday, date):
         special.append("Krishna Janmashtami")
     if tithi == "Shukla Chaturdashi" and nakshatra == "Rohini":
         special.append("Narasimha Jayanti")
+    if "Chaturthi" in tithi:
+        special.append("Chaturthi Vrat")
+    if "Ekadashi" in tithi:
+        special.append("Ekadashi Vrat")
+    if "Trayodashi" in tithi and "Krishna" in tithi:
+        special.append("Pradosham Vrat")
+    if "Chaturthi" in tithi and "Krishna" in tithi:
+        special.append("Sankashti Chaturthi")
     return special
@@ -1,17 +1,44 @@
 from datetime import datetime, timedelta
-from utils.panchanga import get_panchanga
+
+import swisseph as swe
+from pytz import timezone
+
+from utils.ephemeris import DEFAULT_CONTEXT, calc_positions
+from utils.panchanga import build_panchanga_day, get_timezone_name, local_to_jd
+from utils.riseset import jd_or_none, sunrise_sunset
+
+SUN_MOON = {"Sun": swe.SUN, "Moon": swe.MOON}
+
+# Days computed per ephemeris batch; bounds memory and first-day latency
+CALENDAR_CHUNK_DAYS = 31
+
+def iter_panchanga_calendar(start_date_str, days, latitude, longitude, timezone_offset, context=DEFAULT_CONTEXT):
+    """
+    Yields calendar days lazily. The timezone is resolved once, and each
+    chunk of days gets one batch of Sun/Moon positions and one sunrise/sunset
+    table; each day's night ends at the next day's sunrise for choghadiya.
+    """
+    start_dt = datetime.fromisoformat(start_date_str.replace("Z", "+00:00")).replace(tzinfo=None)
+    tz = timezone(get_timezone_name(latitude, longitude))
+
+    for chunk_start in range(0, days, CALENDAR_CHUNK_DAYS):
+        chunk = range(chunk_start, min(chunk_start + CALENDAR_CHUNK_DAYS, days))
+        local_days = [start_dt + timedelta(days=i) for i in chunk]
+        # Local midnights bounding each day, plus the day after for its sunrise
+        bounds = [local_to_jd(start_dt + timedelta(days=i), tz) for i in range(chunk.start, chunk.stop + 2)]
+        batch = calc_positions(bounds[:len(chunk)], SUN_MOON, context)
+        sun = sunrise_sunset(bounds, latitude, longitude, context)
+
+        for row, day_dt in enumerate(local_days):
+            panchanga = build_panchanga_day(
+                day_dt.strftime("%Y-%m-%dT%H:%M:%SZ"), day_dt, tz,
+                jd_or_none(sun.rise[row]), jd_or_none(sun.set[row]), jd_or_none(sun.rise[row + 1]),
+                float(batch.tropical[row, 0]), float(batch.tropical[row, 1]), float(batch.ayanamsa[row])
+            )
+            yield {
+                "date": day_dt.strftime("%Y-%m-%d"),
+                "panchanga": panchanga
+            }
 
 def generate_panchanga_calendar(start_date_str, days, latitude, longitude, timezone_offset):
-    calendar = []
-
-    start_dt = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
-    for i in range(days):
-        current_dt = start_dt + timedelta(days=i)
-        iso_date = current_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-        panchanga = get_panchanga(iso_date, latitude, longitude, timezone_offset)
-        calendar.append({
-            "date": current_dt.strftime("%Y-%m-%d"),
-            "panchanga": panchanga
-        })
-
-    return calendar
+    return list(iter_panchanga_calendar(start_date_str, days, latitude, longitude, timezone_offset))
@@ -0,0 +1,207 @@
+# utils/panchanga_transitions.py
+
+from bisect import bisect_right
+from collections import namedtuple
+
+import numpy as np
+import swisseph as swe
+
+from utils.ascendant import MAX_TABLE_LATITUDE, SIGN_NAMES, lagna_spans
+from utils.ephemeris import DEFAULT_CONTEXT, calc_positions
+from utils.panchanga import (
+    TITHI_NAMES, NAKSHATRA_NAMES, YOGA_NAMES, get_karana_name
+)
+
+SUN_MOON = {"Sun": swe.SUN, "Moon": swe.MOON}
+
+# Element -> angular width of one unit. Tithi/karana run on the Moon–Sun
+# elongation, nakshatra on the sidereal Moon, yoga on sidereal Sun + Moon.
+ELEMENT_SPANS = {
+    "tithi": 12.0,
+    "karana": 6.0,
+    "nakshatra": 360 / 27,
+    "yoga": 360 / 27,
+}
+ELEMENT_CYCLES = {"tithi": 30, "karana": 60, "nakshatra": 27, "yoga": 27}
+
+# Longest tithi/nakshatra is ~27h, so 2 days either side always contains the
+# boundaries of any element overlapping the requested window.
+WINDOW_PADDING = 2.0
+
+# Ascendant sampling step in days, used only inside the polar circles where
+# utils.ascendant has no closed-form table. Fast-rising signs can still be
+# skipped there.
+LAGNA_SAMPLE_STEP = 10 / 1440
+LAGNA_BISECTIONS = 16  # 10 min / 2**16 < 0.01 s
+
+ElementSpan = namedtuple("ElementSpan", ["element", "index", "name", "start", "end"])
+
+
+def _element_name(element, index):
+    if element == "tithi":
+        return TITHI_NAMES[index]
+    if element == "karana":
+        return get_karana_name(index)
+    if element == "nakshatra":
+        return NAKSHATRA_NAMES[index]
+    return YOGA_NAMES[index]
+
+
+def _unwrap(lon):
+    """Continuous longitude for a body that only moves forward (Sun, Moon)."""
+    jumps = np.concatenate(([0.0], np.cumsum(np.diff(lon) < -180) * 360.0))
+    return lon + jumps
+
+
+class ElongationInterpolant:
+    """
+    Piecewise cubic Hermite interpolant of a monotonically increasing angle,
+    built from ephemeris samples of value and rate. With daily samples the
+    Moon-driven angles are reproduced to ~1e-4°, i.e. about a second of time.
+    """
+
+    def __init__(self, t, value, rate):
+        self.t = t
+        self.value = value
+        self.rate = rate
+
+    def __call__(self, t):
+        i = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, len(self.t) - 2)
+        return self._eval(i, t)[0]
+
+    def _eval(self, i, t):
+        t0, t1 = self.t[i], self.t[i + 1]
+        h = t1 - t0
+        s = (t - t0) / h
+        y0, y1 = self.value[i], self.value[i + 1]
+        m0, m1 = self.rate[i] * h, self.rate[i + 1] * h
+        s2, s3 = s * s, s * s * s
+        y = (2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * m0 + (-2 * s3 + 3 * s2) * y1 + (s3 - s2) * m1
+        dy = ((6 * s2 - 6 * s) * (y0 - y1) + (3 * s2 - 4 * s + 1) * m0 + (3 * s2 - 2 * s) * m1) / h
+        return y, dy
+
+    def solve(self, targets, iterations=6):
+        """Instants at which the angle reaches each of `targets` (all inside the sampled range)."""
+        targets = np.asarray(targets, dtype=np.float64)
+        i = np.clip(np.searchsorted(self.value, targets, side="right") - 1, 0, len(self.t) - 2)
+        t0, t1 = self.t[i], self.t[i + 1]
+        frac = (targets - self.value[i]) / (self.value[i + 1] - self.value[i])
+        t = t0 + frac * (t1 - t0)
+        for _ in range(iterations):
+            y, dy = self._eval(i, t)
+            t = np.clip(t - (y - targets) / dy, t0, t1)
+        return t
+
+
+def sample_elements(start_jd, end_jd, step=1.0, context=DEFAULT_CONTEXT):
+    """
+    Samples Sun and Moon once per `step` days over the window (plus padding)
+    and returns one interpolant per panchanga element.
+    """
+    n = int(np.ceil((end_jd - start_jd + 2 * WINDOW_PADDING) / step)) + 1
+    t = start_jd - WINDOW_PADDING + step * np.arange(n)
+    batch = calc_positions(t, SUN_MOON, context)
+
+    sun = _unwrap(batch.tropical[:, 0])
+    moon = _unwrap(batch.tropical[:, 1])
+    sun_rate, moon_rate = batch.speed[:, 0], batch.speed[:, 1]
+    ayanamsa = batch.ayanamsa
+    ayanamsa_rate = np.gradient(ayanamsa, t) if n > 1 else np.zeros(n)
+
+    elongation = moon - sun
+    elongation -= 360.0 * np.floor(elongation[0] / 360.0)
+    return {
+        "tithi": ElongationInterpolant(t, elongation, moon_rate - sun_rate),
+        "karana": ElongationInterpolant(t, elongation, moon_rate - sun_rate),
+        "nakshatra": ElongationInterpolant(t, moon - ayanamsa, moon_rate - ayanamsa_rate),
+        "yoga": ElongationInterpolant(t, sun + moon - 2 * ayanamsa, sun_rate + moon_rate - 2 * ayanamsa_rate),
+    }
+
+
+def get_panchanga_transitions(start_jd, end_jd, elements=None, step=1.0, context=DEFAULT_CONTEXT):
+    """
+    Exact start/end instants (UT Julian days) of every tithi, nakshatra, yoga
+    and karana overlapping [start_jd, end_jd].
+
+    Returns {element: [ElementSpan, ...]} in chronological order. A month
+    costs ~35 Sun/Moon samples regardless of how many elements are requested.
+    """
+    elements = elements or list(ELEMENT_SPANS)
+    curves = sample_elements(start_jd, end_jd, step, context)
+
+    result = {}
+    for element in elements:
+        curve = curves[element]
+        width = ELEMENT_SPANS[element]
+        cycle = ELEMENT_CYCLES[element]
+
+        first = int(np.floor(curve(start_jd) / width))
+        last = int(np.floor(curve(end_jd) / width))
+        # Boundary k separates unit k-1 from unit k; we need both ends of each unit
+        boundaries = curve.solve(np.arange(first, last + 2) * width)
+
+        spans = []
+        for k, unit in enumerate(range(first, last + 1)):
+            index = unit % cycle
+            spans.append(ElementSpan(
+                element, index, _element_name(element, index),
+                float(boundaries[k]), float(boundaries[k + 1])
+            ))
+        result[element] = spans
+    return result
+
+
+def element_at(spans, jd):
+    """The span active at `jd` (spans as returned by get_panchanga_transitions)."""
+    starts = [span.start for span in spans]
+    i = bisect_right(starts, jd) - 1
+    if i < 0 or jd >= spans[i].end:
+        return None
+    return spans[i]
+
+
+def _sidereal_ascendant(jd, lat, lon, context):
+    cusps, ascmc = context.houses(jd, lat, lon, b'E')
+    return (ascmc[0] - context.ayanamsa(jd)) % 360
+
+
+def get_lagna_transitions(start_jd, end_jd, lat, lon, context=DEFAULT_CONTEXT):
+    """
+    Sidereal rising-sign (lagna) spans over [start_jd, end_jd] at one place,
+    as ElementSpans with element "lagna"; the first and last spans are
+    clipped to the window. Read from the cached ascendant-ingress tables.
+    """
+    if abs(lat) > MAX_TABLE_LATITUDE:
+        return _sampled_lagna_transitions(start_jd, end_jd, lat, lon, context)
+    return [
+        ElementSpan("lagna", span.sign, span.name, span.start, span.end)
+        for span in lagna_spans(start_jd, end_jd, lat, lon, context)
+    ]
+
+
+def _sampled_lagna_transitions(start_jd, end_jd, lat, lon, context):
+    """Sign changes bracketed on a 10 minute ascendant grid and bisected."""
+    n = int(np.ceil((end_jd - start_jd) / LAGNA_SAMPLE_STEP)) + 1
+    t = start_jd + LAGNA_SAMPLE_STEP * np.arange(n)
+    asc = _unwrap(np.array([_sidereal_ascendant(jd, lat, lon, context) for jd in t.tolist()]))
+    units = np.floor(asc / 30).astype(int)
+
+    edges = [start_jd]
+    for i in np.nonzero(np.diff(units))[0].tolist():
+        target = units[i + 1] * 30.0
+        lo, hi = t[i], t[i + 1]
+        for _ in range(LAGNA_BISECTIONS):
+            mid = (lo + hi) / 2
+            value = asc[i] + (_sidereal_ascendant(mid, lat, lon, context) - asc[i]) % 360
+            lo, hi = (mid, hi) if value < target else (lo, mid)
+        edges.append(min(float(hi), end_jd))
+    edges.append(end_jd)
+
+    spans = []
+    first = units[0]
+    for k, (start, end) in enumerate(zip(edges, edges[1:])):
+        if end <= start:
+            continue
+        index = int(first + k) % 12
+        spans.append(ElementSpan("lagna", index, SIGN_NAMES[index], float(start), float(end)))
+    return spans
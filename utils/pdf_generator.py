@@ -1,32 +1,34 @@
-import os
-from fpdf import FPDF
 from datetime import datetime
 
+from utils.chart_context import ChartContext
 from utils.predictions import get_daily_prediction
-from utils.kundli import get_nakshatra_info, get_lagna_info
+from utils.kundli import get_nakshatra_info
 from utils.transit import get_transit_effects
 from utils.remedies import get_astrological_remedies
+from utils.report_assets import new_pdf, pdf_bytes
 
-STATIC_DIR = "static/predictions"
-os.makedirs(STATIC_DIR, exist_ok=True)
-
-def generate_pdf_prediction_report(name: str, date: str):
+def generate_pdf_prediction_report(name: str, date: str, time: str = "12:00", place: str = "Delhi, India",
+                                   birth_date: str = None, birth_time: str = "12:00", birth_place: str = None) -> bytes:
+    """
+    Renders the daily prediction report into memory and returns the PDF bytes.
+    The day's nakshatra, lagna and prediction come from the sky at `date`,
+    `time` and `place`; transit effects and remedies are judged against the
+    natal chart, so they are only included when `birth_date` is given.
+    """
     today_str = date or datetime.today().strftime("%Y-%m-%d")
-    filename = f"{name}_{today_str}.pdf"
-    filepath = os.path.join(STATIC_DIR, filename)
-
-    # Dummy time/place for fallback if not used
-    default_time = "12:00"
-    default_place = "Delhi, India"
 
-    # Get data
-    nakshatra_info = get_nakshatra_info(today_str, default_time, default_place)
-    lagna_info = get_lagna_info(today_str, default_time, default_place)
-    prediction = get_daily_prediction(name, today_str)
-    transits = get_transit_effects(name, today_str, default_time, default_place)
-    remedies = get_astrological_remedies(name, today_str, default_time, default_place)
+    # One context per chart: geocoding and ephemeris work happen once for each
+    ctx = ChartContext(today_str, time, place, name=name)
+    nakshatra_info = get_nakshatra_info(ctx)
+    lagna_info = ctx.lagna_info
+    prediction = get_daily_prediction(name, today_str, ctx)
+    transits = remedies = None
+    if birth_date:
+        natal = ChartContext(birth_date, birth_time, birth_place or place, name=name, transit_date=today_str)
+        transits = [t["effect"] for t in get_transit_effects(natal)]
+        remedies = [f"{r['reason']}: {r['remedy']}" for r in get_astrological_remedies(natal)["all"]]
 
-    pdf = FPDF()
+    pdf = new_pdf()
     pdf.add_page()
     pdf.set_font("Arial", size=14)
 
@@ -56,17 +58,17 @@ def generate_pdf_prediction_report(name: str, date: str):
     pdf.multi_cell(0, 10, txt=str(prediction))
     pdf.ln(3)
 
-    pdf.set_font("Arial", style="B", size=12)
-    pdf.cell(200, 10, txt="Transit Effects:", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, txt=str(transits))
-    pdf.ln(3)
+    if birth_date:
+        pdf.set_font("Arial", style="B", size=12)
+        pdf.cell(200, 10, txt="Transit Effects:", ln=True)
+        pdf.set_font("Arial", size=12)
+        pdf.multi_cell(0, 10, txt="\n".join(transits))
+        pdf.ln(3)
 
-    pdf.set_font("Arial", style="B", size=12)
-    pdf.cell(200, 10, txt="Recommended Remedies:", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, txt=str(remedies))
-    pdf.ln(3)
+        pdf.set_font("Arial", style="B", size=12)
+        pdf.cell(200, 10, txt="Recommended Remedies:", ln=True)
+        pdf.set_font("Arial", size=12)
+        pdf.multi_cell(0, 10, txt="\n".join(remedies) or "None")
+        pdf.ln(3)
 
-    pdf.output(filepath)
-    return filepath
+    return pdf_bytes(pdf)
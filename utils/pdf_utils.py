@@ -1,14 +1,15 @@
-from fpdf import FPDF
-import os
-from utils.kundli import get_planet_positions, get_lagna_info, get_dasha_periods
+from utils.chart_context import ChartContext
+from utils.report_assets import new_pdf, pdf_bytes
 
-def generate_kundli_report_pdf(datetime_str, place, latitude, longitude, timezone_offset):
+def generate_kundli_report_pdf(datetime_str, place, latitude, longitude, timezone_offset) -> bytes:
+    """Renders the kundli report into memory and returns the PDF bytes."""
     # Get basic info
-    planet_data = get_planet_positions(datetime_str, latitude, longitude, timezone_offset)
-    lagna_info = get_lagna_info(datetime_str, latitude, longitude, timezone_offset)
-    dasha_info = get_dasha_periods(datetime_str, latitude, longitude, timezone_offset)
+    ctx = ChartContext.from_datetime(datetime_str, latitude, longitude)
+    planet_data = {"positions": {planet: f"{lon:.2f}°" for planet, lon in ctx.positions.items()}}
+    lagna_info = ctx.lagna_info
+    dasha_info = ctx.dasha
 
-    pdf = FPDF()
+    pdf = new_pdf()
     pdf.add_page()
     pdf.set_font("Arial", size=14)
     pdf.set_text_color(40, 40, 40)
@@ -47,11 +48,4 @@ def generate_kundli_report_pdf(datetime_str, place, latitude, longitude, timezon
     pdf.set_font("Arial", size=12)
     pdf.multi_cell(0, 10, dasha_info["summary"])
 
-    # Save to static
-    output_path = "/app/static/kundli_report.pdf"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    pdf.output(output_path)
-
-    return {
-        "pdf_url": "https://navadharma.onrender.com/static/kundli_report.pdf"
-    }
+    return pdf_bytes(pdf)
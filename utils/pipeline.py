@@ -0,0 +1,102 @@
+# utils/pipeline.py
+
+"""
+Small dependency-graph executor for multi-stage report builders.
+
+Each Stage names the stages (or pipeline inputs) it needs; it is called
+with their results as positional arguments as soon as they are all
+available, so independent stages overlap. Stages run inline, on a shared
+thread pool (I/O, GPT calls, short ephemeris work) or on the shared worker
+process pool (long CPU-bound searches; the function and its arguments
+must then be picklable).
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.kundli_batch import get_pool
+
+PIPELINE_THREADS = int(os.getenv("PIPELINE_THREADS", "16"))
+
+INLINE, THREAD, PROCESS = "inline", "thread", "process"
+
+Stage = namedtuple("Stage", ["name", "func", "deps", "executor"], defaults=((), THREAD))
+PipelineResult = namedtuple("PipelineResult", ["results", "timings"])
+
+_threads = None
+_threads_lock = threading.Lock()
+
+
+def get_thread_pool():
+    global _threads
+    if _threads is None:
+        with _threads_lock:
+            if _threads is None:
+                _threads = ThreadPoolExecutor(max_workers=PIPELINE_THREADS, thread_name_prefix="pipeline")
+    return _threads
+
+
+def _timed(func, args):
+    start = time.perf_counter()
+    return func(*args), time.perf_counter() - start
+
+
+def _check(stages, inputs):
+    names = set(inputs)
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        names.add(stage.name)
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown {', '.join(missing)}")
+
+
+def run_pipeline(stages, inputs=None):
+    """
+    Runs `stages` (any order) given the `inputs` dict and returns a
+    PipelineResult: results by stage/input name and the wall-clock ms of
+    each stage. The first stage to raise aborts the run with its exception;
+    a dependency cycle raises ValueError.
+    """
+    results = dict(inputs or {})
+    _check(stages, results)
+    timings = {}
+    pending = list(stages)
+    running = {}
+
+    while pending or running:
+        ready = [s for s in pending if all(dep in results for dep in s.deps)]
+        for stage in ready:
+            pending.remove(stage)
+            args = [results[dep] for dep in stage.deps]
+            if stage.executor == INLINE:
+                start = time.perf_counter()
+                results[stage.name] = stage.func(*args)
+                timings[stage.name] = round((time.perf_counter() - start) * 1e3, 1)
+            elif stage.executor == PROCESS:
+                running[get_pool().submit(stage.func, *args)] = (stage, time.perf_counter())
+            else:
+                running[get_thread_pool().submit(_timed, stage.func, args)] = (stage, None)
+        if any(s.executor == INLINE for s in ready):
+            continue  # inline results may unblock more stages right away
+        if not running:
+            if pending:
+                raise ValueError(f"Dependency cycle among: {', '.join(s.name for s in pending)}")
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage, submitted = running.pop(future)
+            if stage.executor == PROCESS:
+                results[stage.name] = future.result()
+                elapsed = time.perf_counter() - submitted
+            else:
+                results[stage.name], elapsed = future.result()
+            timings[stage.name] = round(elapsed * 1e3, 1)
+
+    return PipelineResult(results, timings)
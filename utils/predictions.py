@@ -1,15 +1,10 @@
 import swisseph as swe
 from datetime import datetime
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
 import pytz
 import math
-from fpdf import FPDF
-import os
-
-swe.set_ephe_path(".")
-geolocator = Nominatim(user_agent="astro-prediction")
-tz_finder = TimezoneFinder()
+from urllib.parse import urlencode
+from utils.ephemeris import DEFAULT_CONTEXT, calc_positions
+from utils.report_assets import new_pdf, pdf_bytes
 
 # Get zodiac sign from longitude
 def get_planet_sign(lon):
@@ -62,8 +57,8 @@ def nakshatra_predictions():
     }
 
 def is_retrograde(jd, planet):
-    lon_today = swe.calc_ut(jd, planet)[0][0]
-    lon_yesterday = swe.calc_ut(jd - 1, planet)[0][0]
+    lon_today = DEFAULT_CONTEXT.calc(jd, planet)[0]
+    lon_yesterday = DEFAULT_CONTEXT.calc(jd - 1, planet)[0]
     return lon_today < lon_yesterday
 
 def check_aspects(lon1, lon2):
@@ -98,8 +93,9 @@ def get_transit_effects(natal_moon_sign, planets):
                 effects.append(f"{planet} is challenging your Moon sign ({natal_moon_sign}).")
     return effects
 
-def generate_prediction_pdf(data, filename):
-    pdf = FPDF()
+def generate_prediction_pdf(data) -> bytes:
+    """Renders a get_daily_prediction result into memory and returns the PDF bytes."""
+    pdf = new_pdf()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
     pdf.cell(200, 10, txt="Daily Vedic Astrology Prediction", ln=True, align='C')
@@ -130,35 +126,24 @@ def generate_prediction_pdf(data, filename):
         for effect in data["transitEffects"]:
             pdf.multi_cell(0, 8, effect)
 
-    pdf.output(filename)
+    return pdf_bytes(pdf)
 
 # Primary prediction function with PDF download link
-def get_daily_prediction(name: str, date: str):
+def get_daily_prediction(name: str, date: str, ctx=None):
+    """Sky on `date` (noon UT); pass a ChartContext for that date to reuse its positions instead."""
     try:
-        dt = datetime.strptime(date, "%Y-%m-%d")
-        jd = swe.julday(dt.year, dt.month, dt.day)
-
-        planet_ids = {
-            "Sun": swe.SUN,
-            "Moon": swe.MOON,
-            "Mercury": swe.MERCURY,
-            "Venus": swe.VENUS,
-            "Mars": swe.MARS,
-            "Jupiter": swe.JUPITER,
-            "Saturn": swe.SATURN,
-            "Rahu": swe.MEAN_NODE,
-            "Ketu": swe.MEAN_NODE  # shifted 180 degrees
-        }
-
+        if ctx is not None:
+            batch = ctx.batch
+        else:
+            dt = datetime.strptime(date, "%Y-%m-%d")
+            batch = calc_positions(swe.julday(dt.year, dt.month, dt.day))
         planet_data = {}
-        for pname, pid in planet_ids.items():
-            lon = swe.calc_ut(jd, pid)[0][0]
-            if pname == "Ketu":
-                lon = (lon + 180) % 360
+        for i, pname in enumerate(batch.names):
+            lon = float(batch.tropical[0, i])
             planet_data[pname] = {
                 "longitude": lon,
                 "sign": get_planet_sign(lon),
-                "retrograde": is_retrograde(jd, pid) if pname not in ["Sun", "Moon", "Rahu", "Ketu"] else False
+                "retrograde": bool(batch.speed[0, i] < 0) if pname not in ["Sun", "Moon", "Rahu", "Ketu"] else False
             }
 
         moon_sign = planet_data["Moon"]["sign"]
@@ -185,12 +170,8 @@ def get_daily_prediction(name: str, date: str):
             "transitEffects": transits
         }
 
-        # Save PDF in static/predictions folder
-        os.makedirs("static/predictions", exist_ok=True)
-        filename = f"static/predictions/{name}_{date}.pdf"
-        generate_prediction_pdf(result, filename)
-
-        result["pdf_url"] = f"/static/predictions/{name}_{date}.pdf"
+        # Rendered on demand by GET /prediction/daily/pdf
+        result["pdf_url"] = f"/prediction/daily/pdf?{urlencode({'name': name, 'date': date})}"
         return result
 
     except Exception as e:
@@ -1,6 +1,5 @@
 from utils.language_utils import translate_output
 from datetime import datetime
-import os
 import logging
 
 # Optional: DB
@@ -11,13 +10,11 @@ try:
 except ImportError:
     USE_DB = False
 
-# ✅ OpenAI Setup
-try:
-    import openai
-    openai.api_key = os.getenv("OPENAI_API_KEY")
-    use_gpt = True
-except ImportError:
-    use_gpt = False
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.interpretations import DEBILITATED_SIGNS
+from utils.lazy import get_resource
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -46,10 +43,14 @@ DASHA_NAKSHATRA_REMEDIES = {
     # ...
 }
 
+# Degrees from the Sun within which a planet is combust
+COMBUSTION_ORBS = {"Moon": 12, "Mars": 17, "Mercury": 14, "Jupiter": 11, "Venus": 10, "Saturn": 15}
+
 # ------------------ GPT Explanation Helper ------------------
 
 def generate_gpt_explanation(reason, remedy, lang="en"):
-    if not use_gpt:
+    openai = get_resource("openai_module")
+    if openai is None:
         return None
     try:
         response = openai.ChatCompletion.create(
@@ -164,3 +165,32 @@ def get_remedies(
         "all": remedy_list,
         "grouped": grouped
     }
+
+
+def get_afflictions(ctx):
+    """{planet: ["weak", "combust"]} for a ChartContext: debilitated planets and planets combust by the Sun."""
+    chart = ctx.chart
+    sun = chart.longitude[chart.index("Sun")]
+    distance = np.abs((chart.longitude - sun + 180) % 360 - 180).tolist()
+    afflictions = {}
+    for i, (planet, sign) in enumerate(zip(chart.names, chart.sign.tolist())):
+        issues = []
+        if DEBILITATED_SIGNS.get(planet) == SIGN_NAMES[sign]:
+            issues.append("weak")
+        orb = COMBUSTION_ORBS.get(planet)
+        if orb and distance[i] <= orb:
+            issues.append("combust")
+        if issues:
+            afflictions[planet] = issues
+    return afflictions
+
+def get_astrological_remedies(ctx, lang="en", explain_with_gpt=False):
+    """get_remedies for a ChartContext: afflictions, whole-sign houses, running mahadasha and nakshatra."""
+    return get_remedies(
+        get_afflictions(ctx),
+        ctx.planet_houses,
+        lang=lang,
+        current_dasha=ctx.current_mahadasha,
+        current_nakshatra=ctx.nakshatra["nakshatra"],
+        explain_with_gpt=explain_with_gpt
+    )
@@ -0,0 +1,78 @@
+# utils/report_assets.py
+
+"""
+In-memory assets and output buffers for PDF reports.
+
+The logo and the site QR code are read or generated once per process and
+embedded from memory, and reports render into bytes, so concurrent
+requests never share a file on disk. Needs fpdf2 (images from buffers,
+output() returning bytes).
+"""
+
+import io
+import os
+from functools import lru_cache
+
+from utils.lazy import lazy_import
+
+fpdf = lazy_import("fpdf")
+qrcode = lazy_import("qrcode")
+
+LOGO_PATH = os.getenv("REPORT_LOGO_PATH", "static/logo.png")
+SITE_URL = "https://navadharma.com"
+STREAM_CHUNK_SIZE = 64 * 1024
+# Built-in PDF fonts cover cp1252 (dashes, bullets, quotes); other characters such as emoji are dropped
+CORE_FONT_ENCODING = "windows-1252"
+
+
+@lru_cache(maxsize=None)
+def get_report_pdf_class():
+    """FPDF base class for reports; defined on first use so fpdf loads lazily."""
+    class ReportPDF(fpdf.FPDF):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.core_fonts_encoding = CORE_FONT_ENCODING
+
+        def normalize_text(self, text):
+            if not self.is_ttf_font:
+                text = text.encode(CORE_FONT_ENCODING, "ignore").decode(CORE_FONT_ENCODING)
+            return super().normalize_text(text)
+
+    return ReportPDF
+
+
+def new_pdf():
+    return get_report_pdf_class()()
+
+
+@lru_cache(maxsize=1)
+def get_logo():
+    """Logo PNG bytes, or None if there is no logo file."""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    with open(LOGO_PATH, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=32)
+def get_qr_png(data=SITE_URL):
+    """QR code for `data` as PNG bytes."""
+    buf = io.BytesIO()
+    qrcode.make(data).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def image_buffer(data):
+    """Fresh file-like view of cached image bytes for pdf.image()."""
+    return io.BytesIO(data)
+
+
+def pdf_bytes(pdf):
+    """Renders an FPDF document into bytes."""
+    return bytes(pdf.output())
+
+
+def iter_chunks(data, size=STREAM_CHUNK_SIZE):
+    """Yields `data` in chunks, for streaming responses."""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
@@ -0,0 +1,163 @@
+# utils/report_cache.py
+
+"""
+Content-addressed store for rendered reports.
+
+A report is keyed by a hash of its kind, its normalized inputs and the
+code version, so identical requests map to one file. The code version
+hashes every module in the utils package (the renderers and everything
+they compute from: charts, dashas, strengths, vargas) and the versions of
+the rendering and ephemeris libraries, so a deploy that changes any of
+them invalidates everything at once. Other inputs (ephemeris files, data
+tables outside utils/) are not covered; set REPORT_CODE_VERSION to the
+deployed release to key on that instead. The key doubles as
+the HTTP ETag: a client presenting it in If-None-Match already holds the
+current bytes, and nothing needs to be rendered or read.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from importlib import metadata
+
+from utils.gazetteer import BASE_DIR
+
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", os.path.join(BASE_DIR, "data", "report_cache"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Size checks scan the whole directory, so a process runs one at most this often (seconds)
+PRUNE_INTERVAL = 300
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Installed distributions whose version changes report output; see code_version()
+REPORT_DEPENDENCIES = ["fpdf2", "pyswisseph", "matplotlib", "cairosvg", "numpy"]
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """
+    REPORT_CODE_VERSION if set (e.g. the deployed commit), else a hash of
+    every utils/*.py source and the REPORT_DEPENDENCIES versions.
+    """
+    version = os.getenv("REPORT_CODE_VERSION")
+    if version:
+        return version
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(UTILS_DIR)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(UTILS_DIR, name), "rb") as f:
+                digest.update(f.read())
+    for dist in REPORT_DEPENDENCIES:
+        try:
+            digest.update(f"{dist}=={metadata.version(dist)}".encode("utf-8"))
+        except metadata.PackageNotFoundError:
+            digest.update(f"{dist}=-".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def report_key(kind, params):
+    """Content hash of a report's kind, normalized inputs and the code version."""
+    payload = json.dumps(
+        [code_version(), kind, _normalize(params)], sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+def etag(key):
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match, key, ext="pdf"):
+    """
+    True if an If-None-Match header value covers `key`. "*" only matches a
+    report that has been rendered and is still cached.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if etag(key) in tags or f"W/{etag(key)}" in tags:
+        return True
+    return "*" in tags and os.path.exists(_path(key, ext))
+
+
+def _path(key, ext):
+    return os.path.join(REPORT_CACHE_DIR, key[:2], f"{key}.{ext}")
+
+
+def load(key, ext="pdf"):
+    """Cached bytes for `key`, or None."""
+    try:
+        with open(_path(key, ext), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def store(key, data, ext="pdf"):
+    """Writes `data` under `key` atomically; concurrent writers of the same key are harmless."""
+    path = _path(key, ext)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    if time.monotonic() - _last_prune > PRUNE_INTERVAL:
+        prune()
+
+
+def get_or_render(kind, params, render, ext="pdf"):
+    """(key, bytes) for a report, rendering with render(params) and storing it on a miss."""
+    key = report_key(kind, params)
+    data = load(key, ext)
+    if data is None:
+        data = render(params)
+        store(key, data, ext)
+    return key, data
+
+
+def prune(max_bytes=REPORT_CACHE_MAX_BYTES):
+    """Deletes least recently written files until the cache fits in `max_bytes`."""
+    global _last_prune
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_prune = time.monotonic()
+        entries, total = [], 0
+        for root, _, files in os.walk(REPORT_CACHE_DIR):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, os.path.join(root, name)))
+                total += st.st_size
+        if total <= max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= max_bytes:
+                break
+    finally:
+        _prune_lock.release()
@@ -0,0 +1,213 @@
+# utils/report_jobs.py
+
+"""
+Background PDF report generation.
+
+submit() queues a report on a pool of worker processes and returns a job id
+straight away; status() and result() are polled by the API. Finished PDFs
+are held in memory until they expire: after REPORT_JOB_TTL seconds, or
+earlier (oldest first) when stored reports exceed REPORT_STORE_MAX_BYTES.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils.chart_generator import generate_pdf
+from utils.predictions import generate_prediction_pdf, get_daily_prediction
+from utils.report_cache import get_or_render
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "0")) or os.cpu_count() or 1
+REPORT_JOB_TTL = int(os.getenv("REPORT_JOB_TTL", "3600"))
+REPORT_STORE_MAX_BYTES = int(os.getenv("REPORT_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+MAX_PENDING_JOBS = int(os.getenv("REPORT_MAX_PENDING_JOBS", "1000"))
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _render_report(params):
+    return generate_pdf(params)
+
+
+def _render_daily(params):
+    prediction = get_daily_prediction(params["name"], params["date"])
+    if "error" in prediction:
+        raise ValueError(prediction["error"])
+    return generate_prediction_pdf(prediction)
+
+
+def _render_prediction(params):
+    from utils.pdf_generator import generate_pdf_prediction_report
+    return generate_pdf_prediction_report(
+        params["name"], params["date"], params["time"], params["place"],
+        params.get("birth_date"), params.get("birth_time", "12:00"), params.get("birth_place"),
+    )
+
+
+def _prediction_defaults():
+    return {"date": datetime.today().strftime("%Y-%m-%d"), "time": "12:00", "place": "Delhi, India"}
+
+
+# kind -> (renderer, required params, defaults for the optional ones)
+REPORT_KINDS = {
+    "report": (_render_report, (), None),
+    "daily": (_render_daily, ("name", "date"), None),
+    "prediction": (_render_prediction, ("name",), _prediction_defaults),
+}
+
+
+def resolve_params(kind, params):
+    """
+    `params` with omitted optional inputs filled in, so the cache key covers
+    everything the report shows (a prediction without a date is for today).
+    """
+    defaults = REPORT_KINDS[kind][2]
+    if defaults is None:
+        return params
+    return {**defaults(), **{k: v for k, v in params.items() if v not in (None, "")}}
+
+
+def render_report(kind, params):
+    """(cache key, PDF bytes) for one report, rendered only if not already cached."""
+    return get_or_render(kind, resolve_params(kind, params), REPORT_KINDS[kind][0])
+
+
+def render_job(kind, params):
+    """Runs in a worker process: one report -> (cache key, PDF bytes)."""
+    return render_report(kind, params)
+
+
+class ReportJobQueue:
+    def __init__(self, workers=REPORT_WORKERS, ttl=REPORT_JOB_TTL, max_bytes=REPORT_STORE_MAX_BYTES,
+                 max_pending=MAX_PENDING_JOBS):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._stored_bytes = 0
+
+    def submit(self, kind, params):
+        """Queues a report and returns its job id. ValueError for bad input, QueueFull when saturated."""
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report kind: {kind}")
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object")
+        missing = [name for name in REPORT_KINDS[kind][1] if name not in params]
+        if missing:
+            raise ValueError(f"Missing params for '{kind}' report: {', '.join(missing)}")
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._sweep()
+            pending = sum(1 for job in self._jobs.values() if job["status"] == "pending")
+            if pending >= self.max_pending:
+                raise QueueFull(f"Too many pending reports ({pending})")
+            self._jobs[job_id] = {
+                "id": job_id, "kind": kind, "status": "pending", "created": time.time(),
+                "finished": None, "error": None, "key": None, "pdf": None, "future": None,
+            }
+        future = self._pool.submit(render_job, kind, params)
+        with self._lock:
+            self._jobs[job_id]["future"] = future
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["future"] = None
+            job["finished"] = time.time()
+            try:
+                job["key"], job["pdf"] = future.result()
+                job["status"] = "done"
+                self._stored_bytes += len(job["pdf"])
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = str(e) or type(e).__name__
+            self._sweep()
+
+    def _drop(self, job_id):
+        job = self._jobs.pop(job_id)
+        if job["pdf"] is not None:
+            self._stored_bytes -= len(job["pdf"])
+
+    def _sweep(self):
+        """Drops expired jobs, then the oldest finished reports while over the size limit. Caller holds the lock."""
+        cutoff = time.time() - self.ttl
+        for job_id in [j["id"] for j in self._jobs.values() if j["finished"] and j["finished"] < cutoff]:
+            self._drop(job_id)
+        if self._stored_bytes > self.max_bytes:
+            stored = sorted((j for j in self._jobs.values() if j["pdf"] is not None), key=lambda j: j["finished"])
+            for job in stored:
+                if self._stored_bytes <= self.max_bytes:
+                    break
+                self._drop(job["id"])
+
+    def status(self, job_id):
+        """Public job state, or None if unknown or expired."""
+        with self._lock:
+            self._sweep()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            status = job["status"]
+            if status == "pending" and job["future"] is not None and job["future"].running():
+                status = "running"
+            return {
+                "job_id": job_id,
+                "kind": job["kind"],
+                "status": status,
+                "created": job["created"],
+                "finished": job["finished"],
+                "size": len(job["pdf"]) if job["pdf"] is not None else None,
+                "key": job["key"],
+                "error": job["error"],
+                "expires": job["finished"] + self.ttl if job["finished"] else None,
+            }
+
+    def result(self, job_id):
+        """PDF bytes of a finished job, else None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["pdf"] if job else None
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return {"jobs": counts, "stored_bytes": self._stored_bytes}
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Process-wide queue; worker processes are started on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReportJobQueue()
+    return _queue
+
+
+def shutdown_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.shutdown()
+            _queue = None
@@ -0,0 +1,152 @@
+# utils/riseset.py
+
+"""
+Rise/set tables for one location over a range of days.
+
+swe.rise_trans searches for each event separately. For a table we sample
+the body's apparent right ascension and declination once per step and
+interpolate them, then solve every rise and set in the range together
+with a few Newton steps on the hour angle. Against swe.rise_trans, using
+the same conventions (upper limb, standard refraction at 0°C / 1013.25 hPa),
+sunrise and sunset agree to about a second below 52° latitude and two
+seconds at 60°; moonrise and moonset agree as closely below 52°, but near
+60° the Moon can graze the horizon and individual moonsets may be shifted
+or missed (see benchmarks/bench_rise_set.py).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import swisseph as swe
+
+from utils.ephemeris import DEFAULT_CONTEXT
+from utils.panchanga_transitions import ElongationInterpolant
+
+# Days between ephemeris samples; the Moon's declination needs a finer grid
+SAMPLE_STEP = {swe.SUN: 2.0, swe.MOON: 0.5}
+NEWTON_ITERATIONS = 4
+
+EARTH_RADIUS_KM = 6378.137
+AU_KM = 149597870.7
+BODY_RADIUS_KM = {swe.SUN: 695700.0, swe.MOON: 1737.4}
+# Horizon refraction as rise_trans applies it with atpress=0 (1013.25 hPa
+# at sea level), 0°C and the standard lapse rate: about 36.7'
+HORIZON_REFRACTION = -swe.refrac_extended(0.0, 0.0, 1013.25, 0.0, 0.0065, swe.APP_TO_TRUE)[0]
+
+SIDEREAL_RATE = 360.98564736629  # degrees of Earth rotation per UT day
+
+RiseSet = namedtuple("RiseSet", ["rise", "set"])
+
+
+def _wrap(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _mean_sidereal_time(jd):
+    """Greenwich mean sidereal time in degrees (IAU 1982)."""
+    T = (jd - 2451545.0) / 36525
+    return 280.46061837 + SIDEREAL_RATE * (jd - 2451545.0) + 0.000387933 * T * T - T ** 3 / 38710000
+
+
+class _Track:
+    """Interpolated apparent RA/Dec, horizon altitude and sidereal time for one body."""
+
+    def __init__(self, body, start_jd, end_jd, context):
+        step = SAMPLE_STEP.get(body, 0.25)
+        n = int(np.ceil((end_jd - start_jd) / step)) + 1
+        t = start_jd + step * np.arange(n)
+
+        context.activate()
+        flags = (context.flags | swe.FLG_EQUATORIAL) & ~swe.FLG_TOPOCTR
+        samples = np.array([swe.calc_ut(jd, body, flags)[0] for jd in t.tolist()])
+        ra, dec, dist = samples[:, 0], samples[:, 1], samples[:, 2]
+        ra_rate, dec_rate = samples[:, 3], samples[:, 4]
+
+        ra = ra + np.concatenate(([0.0], np.cumsum(np.diff(ra) < -180) * 360.0))
+        self.ra = ElongationInterpolant(t, ra, ra_rate)
+        self.dec = ElongationInterpolant(t, dec, dec_rate)
+        self.t = t
+        self.ra_rate = ra_rate
+
+        # Equation of the equinoxes turns mean into apparent sidereal time
+        gast = np.array([swe.sidtime(jd) * 15.0 for jd in t.tolist()])
+        self.eqeq = _wrap(gast - _mean_sidereal_time(t))
+
+        # Altitude of the body's centre when its upper limb touches the horizon
+        dist_km = dist * AU_KM
+        parallax = np.degrees(np.arcsin(EARTH_RADIUS_KM / dist_km)) if body == swe.MOON else 0.0
+        semidiameter = np.degrees(np.arcsin(BODY_RADIUS_KM.get(body, 0.0) / dist_km))
+        self._h0 = parallax - semidiameter - HORIZON_REFRACTION
+
+    def h0(self, jd):
+        return np.interp(jd, self.t, self._h0)
+
+    def hour_angle(self, jd, lon):
+        gast = _mean_sidereal_time(jd) + np.interp(jd, self.t, self.eqeq)
+        return _wrap(gast + lon - self.ra(jd))
+
+    def rate(self, jd):
+        return SIDEREAL_RATE - np.interp(jd, self.t, self.ra_rate)
+
+
+def _solve_events(track, seeds, lat, lon):
+    """Transit nearest each seed, then the rise and set around it (NaN where the body stays up or down)."""
+    transit = seeds.copy()
+    for _ in range(NEWTON_ITERATIONS):
+        transit -= track.hour_angle(transit, lon) / track.rate(transit)
+
+    phi = np.radians(lat)
+    events = {}
+    for name, sign in (("rise", -1.0), ("set", 1.0)):
+        t = transit.copy()
+        for _ in range(NEWTON_ITERATIONS):
+            dec = np.radians(track.dec(t))
+            cos_h = (np.sin(np.radians(track.h0(t))) - np.sin(phi) * np.sin(dec)) / (np.cos(phi) * np.cos(dec))
+            target = sign * np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0)))
+            t = t + _wrap(target - track.hour_angle(t, lon)) / track.rate(t)
+        events[name] = np.where(np.abs(cos_h) <= 1.0, t, np.nan)
+    return events
+
+
+def _bin_by_day(times, day_bounds):
+    """First event inside each [day_bounds[i], day_bounds[i+1]), NaN for days without one."""
+    times = np.sort(times[~np.isnan(times)])
+    day = np.searchsorted(day_bounds, times, side="right") - 1
+    inside = (day >= 0) & (day < len(day_bounds) - 1)
+    out = np.full(len(day_bounds) - 1, np.nan)
+    days, first = np.unique(day[inside], return_index=True)
+    out[days] = times[inside][first]
+    return out
+
+
+def rise_set_table(day_bounds, lat, lon, body=swe.SUN, context=DEFAULT_CONTEXT):
+    """
+    Rise and set instants for consecutive days at one location.
+
+    `day_bounds` holds n+1 increasing UT Julian days delimiting n days
+    (normally successive local midnights). Returns RiseSet(rise, set), two
+    arrays of length n with the first event inside each day, or NaN where
+    it does not occur (moonless days, polar day/night).
+    """
+    day_bounds = np.asarray(day_bounds, dtype=np.float64)
+    track = _Track(body, day_bounds[0] - 2.0, day_bounds[-1] + 2.0, context)
+
+    # One seed per day plus one either side; every transit is within half a
+    # day of a seed, so each converges to a distinct or duplicate transit
+    mid = (day_bounds[:-1] + day_bounds[1:]) / 2
+    seeds = np.concatenate(([mid[0] - 1.0], mid, [mid[-1] + 1.0]))
+    events = _solve_events(track, seeds, lat, lon)
+    return RiseSet(_bin_by_day(events["rise"], day_bounds), _bin_by_day(events["set"], day_bounds))
+
+
+def sunrise_sunset(day_bounds, lat, lon, context=DEFAULT_CONTEXT):
+    return rise_set_table(day_bounds, lat, lon, swe.SUN, context)
+
+
+def moonrise_moonset(day_bounds, lat, lon, context=DEFAULT_CONTEXT):
+    return rise_set_table(day_bounds, lat, lon, swe.MOON, context)
+
+
+def jd_or_none(value):
+    """Table entry as a float Julian day, or None where no event occurred."""
+    return None if np.isnan(value) else float(value)
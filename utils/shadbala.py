@@ -0,0 +1,288 @@
+# utils/shadbala.py
+
+"""
+Shadbala, Parashara's six-fold planetary strength, for the seven classical
+planets.
+
+Everything comes from one PositionBatch (positions and speeds) plus each
+chart's angles and place, with numpy over arrays of shape (charts, 7), so
+a batch of charts costs little more than one. Dignity, friendship and
+the other classical tables are precomputed arrays. Values are in virupas
+(60 virupas = 1 rupa).
+
+Simplifications: day/night, the tribhaga, the hora and the weekday (which
+starts at sunrise) are taken from the Sun's hour angle and semi-diurnal
+arc instead of a rise/set search; Chesta bala of Mars to Saturn uses the
+classical motion classes judged from daily speed; Yuddha (planetary war)
+bala is not applied.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.ephemeris import DEFAULT_CONTEXT, calc_positions
+from utils.kundli import SIGN_LORDS
+from utils.vargas import varga_signs
+
+SHADBALA_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN = range(7)
+
+SIGN_LORD = np.array([SHADBALA_PLANETS.index(SIGN_LORDS[sign]) for sign in SIGN_NAMES])
+DEEP_EXALTATION = np.array([10.0, 33.0, 298.0, 165.0, 95.0, 357.0, 200.0])
+# (sign, from degree, to degree) within the rasi
+MOOLATRIKONA = np.array([[4, 0, 20], [1, 3, 30], [0, 0, 12], [5, 15, 20], [8, 0, 10], [6, 0, 15], [10, 0, 20]])
+# Natural relationship of the row planet towards the column planet: 1 friend, 0 neutral, -1 enemy
+NATURAL_FRIENDSHIP = np.array([
+    # Sun Moon Mars Merc Jup Ven Sat
+    [0, 1, 1, 0, 1, -1, -1],     # Sun
+    [1, 0, 0, 1, 0, 0, 0],       # Moon
+    [1, 1, 0, -1, 1, 0, 0],      # Mars
+    [1, -1, 0, 0, 0, 1, 0],      # Mercury
+    [1, 1, 1, -1, 0, -1, 0],     # Jupiter
+    [-1, -1, 0, 1, 0, 0, 1],     # Venus
+    [-1, -1, -1, 1, 0, 1, 0],    # Saturn
+])
+# Houses from a planet whose occupants are its temporary friends
+TEMPORARY_FRIEND_HOUSES = np.isin(np.arange(1, 13), [2, 3, 4, 10, 11, 12])
+# Saptavargaja virupas by compound relationship, great enemy (-2) .. great friend (2)
+RELATION_VIRUPAS = np.array([1.875, 3.75, 7.5, 15.0, 22.5])
+OWN_SIGN_VIRUPAS = 30.0
+MOOLATRIKONA_VIRUPAS = 45.0
+# Vargas whose lords give saptavargaja bala
+SAPTAVARGA = ("D1", "D2", "D3", "D7", "D9", "D12", "D30")
+
+# Kendra / panapara / apoklima
+KENDRADI_VIRUPAS = np.array([60.0, 30.0, 15.0])
+# Drekkana of a sign (0-2) that strengthens the planet: male 1st, neuter 2nd, female 3rd
+DREKKANA_OF = np.array([0, 2, 0, 1, 0, 2, 1])
+# Ojhayugma: Moon and Venus gain in even signs and navamsas, the others in odd ones
+PREFERS_EVEN = np.isin(np.arange(7), [MOON, VENUS])
+# House (from the lagna) of full directional strength
+DIG_BALA_HOUSE = np.array([10, 4, 10, 1, 1, 4, 7])
+NAISARGIKA = np.array([60.0, 51.43, 17.14, 25.71, 34.29, 42.86, 8.57])
+REQUIRED_RUPAS = np.array([6.5, 6.0, 5.0, 7.0, 6.5, 5.5, 5.0])
+
+DAY_STRONG = np.isin(np.arange(7), [SUN, JUPITER, VENUS])
+NIGHT_STRONG = np.isin(np.arange(7), [MOON, MARS, SATURN])
+BENEFICS = np.isin(np.arange(7), [MOON, MERCURY, JUPITER, VENUS])
+TRIBHAGA_DAY = np.array([MERCURY, SUN, SATURN])
+TRIBHAGA_NIGHT = np.array([MOON, VENUS, MARS])
+# Planetary hours follow this order from the weekday lord, who rules the first
+HORA_ORDER = np.array([SUN, VENUS, MERCURY, MOON, SATURN, JUPITER, MARS])
+HORA_POSITION = np.argsort(HORA_ORDER)
+# Abda (year), masa (month), vara (weekday) and hora lords
+ABDA_VIRUPAS, MASA_VIRUPAS, VARA_VIRUPAS, HORA_VIRUPAS = 15.0, 30.0, 45.0, 60.0
+# Julian day number of the Kali Yuga epoch (a Friday), from which years of 360 and months of 30 days are counted
+KALI_EPOCH_DAY = 588466
+
+# Mean daily motion, for the Chesta bala motion classes
+MEAN_SPEED = np.array([0.9856, 13.1764, 0.5240, 0.9856, 0.0831, 0.9856, 0.0335])
+# (upper bound of speed / mean speed, virupas): vakra, vikala, mandatara, manda, chara, atichara
+MOTION_CLASSES = [(0.0, 60.0), (0.1, 15.0), (0.5, 15.0), (1.0, 30.0), (1.25, 45.0), (np.inf, 30.0)]
+
+# Special full aspects: planet -> arcs (from, to) of the aspected point counted from the planet
+SPECIAL_ASPECTS = {MARS: [(90, 120), (210, 240)], JUPITER: [(120, 150), (240, 270)], SATURN: [(60, 90), (270, 300)]}
+
+Shadbala = namedtuple("Shadbala", ["sthana", "dig", "kala", "chesta", "naisargika", "drik", "total"])
+
+
+def _distance(a, b):
+    """Shortest arc between longitudes, 0-180."""
+    return np.abs((a - b + 180) % 360 - 180)
+
+
+def _sthana_bala(lon, lagna):
+    n = len(lon)
+    planets = np.arange(7)
+    sign = (lon // 30).astype(np.intp) % 12
+    deg = lon % 30
+
+    uchcha = (180 - _distance(lon, DEEP_EXALTATION)) / 3
+
+    # Saptavargaja: own sign, moolatrikona (rasi only) or compound relationship with each varga's lord
+    vargas = varga_signs(lon, SAPTAVARGA)
+    lords = SIGN_LORD[vargas]
+    temporary = np.where(TEMPORARY_FRIEND_HOUSES[(sign[:, None, :] - sign[:, :, None]) % 12], 1, -1)
+    compound = NATURAL_FRIENDSHIP[planets[None, :, None], lords] + np.take_along_axis(temporary, lords, axis=2)
+    virupas = np.where(lords == planets[None, :, None], OWN_SIGN_VIRUPAS, RELATION_VIRUPAS[compound + 2])
+    moolatrikona = (sign == MOOLATRIKONA[:, 0]) & (deg >= MOOLATRIKONA[:, 1]) & (deg < MOOLATRIKONA[:, 2])
+    virupas[:, :, 0] = np.where(moolatrikona, MOOLATRIKONA_VIRUPAS, virupas[:, :, 0])
+    saptavargaja = virupas.sum(axis=2)
+
+    even_sign = sign % 2 == 1
+    even_navamsa = vargas[:, :, 4] % 2 == 1
+    ojhayugma = 15.0 * ((even_sign == PREFERS_EVEN).astype(float) + (even_navamsa == PREFERS_EVEN))
+
+    house = (sign - np.asarray(lagna).reshape(n, 1)) % 12
+    kendradi = KENDRADI_VIRUPAS[house % 3]
+    drekkana = np.where((deg // 10).astype(np.intp) == DREKKANA_OF, 15.0, 0.0)
+    return uchcha + saptavargaja + ojhayugma + kendradi + drekkana
+
+
+def _dig_bala(lon, ascendant, mc):
+    points = np.stack([ascendant, (mc + 180) % 360, (ascendant + 180) % 360, mc], axis=1)
+    strongest = points[:, (DIG_BALA_HOUSE - 1) // 3]
+    return (180 - _distance(lon, strongest)) / 3
+
+
+def _declination(tropical, latitude, obliquity):
+    lam, beta, eps = np.radians(tropical), np.radians(latitude), np.radians(obliquity)
+    return np.degrees(np.arcsin(np.sin(beta) * np.cos(eps) + np.cos(beta) * np.sin(eps) * np.sin(lam)))
+
+
+def _kala_bala(jd, lon, tropical, ecl_latitude, geo_latitude, geo_longitude):
+    """(kala bala, ayana bala, paksha bala), each (charts, 7)."""
+    n = len(jd)
+    rows = np.arange(n)
+    obliquity = (23.4392911 - 0.0130042 * (jd - 2451545.0) / 36525)[:, None]
+    declination = _declination(tropical, ecl_latitude, obliquity)
+
+    # Sun's hour angle and semi-diurnal arc (degrees), from mean sidereal time
+    lam, eps = np.radians(tropical[:, SUN]), np.radians(obliquity[:, 0])
+    ra = np.degrees(np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam)))
+    lst = 280.46061837 + 360.98564736629 * (jd - 2451545.0) + geo_longitude
+    hour_angle = (lst - ra + 180) % 360 - 180
+    tan_product = -np.tan(np.radians(geo_latitude)) * np.tan(np.radians(declination[:, SUN]))
+    semi_arc = np.degrees(np.arccos(np.clip(tan_product, -1, 1)))
+    since_rise = (hour_angle + semi_arc) % 360
+    day = since_rise < 2 * semi_arc
+    night_arc = np.maximum(360 - 2 * semi_arc, 1e-9)
+    into_night = since_rise - 2 * semi_arc
+
+    nathonnatha = np.where(DAY_STRONG, (180 - np.abs(hour_angle))[:, None] / 3,
+                           np.where(NIGHT_STRONG, np.abs(hour_angle)[:, None] / 3, 60.0))
+
+    elongation = _distance(lon[:, MOON], lon[:, SUN])[:, None]
+    paksha = np.where(BENEFICS, elongation / 3, 60 - elongation / 3)
+
+    third = np.where(day, since_rise // np.maximum(2 * semi_arc / 3, 1e-9), into_night // (night_arc / 3))
+    third = np.clip(third, 0, 2).astype(np.intp)
+    tribhaga = np.zeros((n, 7))
+    tribhaga[rows, np.where(day, TRIBHAGA_DAY[third], TRIBHAGA_NIGHT[third])] = 60.0
+    tribhaga[:, JUPITER] = 60.0
+
+    # The day (weekday, month, year) runs from the last sunrise; civil date at the place
+    rise_day = np.floor(jd - since_rise / 360 + geo_longitude / 360 + 0.5).astype(np.int64)
+    weekday = (rise_day + 1) % 7
+    ahargana = rise_day - KALI_EPOCH_DAY
+    masa = (KALI_EPOCH_DAY + ahargana // 30 * 30 + 1) % 7
+    abda = (KALI_EPOCH_DAY + ahargana // 360 * 360 + 1) % 7
+    hora_index = np.where(day, since_rise // np.maximum(2 * semi_arc / 12, 1e-9), 12 + into_night // (night_arc / 12))
+    hora = HORA_ORDER[(HORA_POSITION[weekday] + np.clip(hora_index, 0, 23).astype(np.int64)) % 7]
+    lords = np.zeros((n, 7))
+    for lord, virupas in ((abda, ABDA_VIRUPAS), (masa, MASA_VIRUPAS), (weekday, VARA_VIRUPAS), (hora, HORA_VIRUPAS)):
+        lords[rows, lord] += virupas
+
+    ayana = (24 + declination) / 48 * 60
+    ayana[:, [MOON, SATURN]] = (24 - declination[:, [MOON, SATURN]]) / 48 * 60
+    ayana[:, MERCURY] = (24 + np.abs(declination[:, MERCURY])) / 48 * 60
+    ayana = np.clip(ayana, 0, 60)
+    kala = nathonnatha + paksha + tribhaga + lords + ayana
+    kala[:, SUN] += ayana[:, SUN]  # the Sun's ayana bala counts twice
+    return kala, ayana, paksha
+
+
+def _chesta_bala(speed, ayana, paksha):
+    ratio = speed / MEAN_SPEED
+    chesta = np.select([ratio < bound for bound, _ in MOTION_CLASSES], [v for _, v in MOTION_CLASSES])
+    chesta[:, SUN] = ayana[:, SUN]
+    chesta[:, MOON] = paksha[:, MOON]
+    return chesta
+
+
+def _aspect_value(arc):
+    """Drishti in virupas of a planet on a point `arc` degrees ahead of it."""
+    return np.select(
+        [arc < 30, arc < 60, arc < 90, arc < 120, arc < 150, arc < 180, arc < 300],
+        [0.0, (arc - 30) / 2, arc - 45, (120 - arc) / 2 + 30, 150 - arc, (arc - 150) * 2, (300 - arc) / 2],
+        0.0,
+    )
+
+
+def _drik_bala(lon):
+    # arc[c, i, j]: from aspecting planet i to aspected planet j
+    arc = (lon[:, None, :] - lon[:, :, None]) % 360
+    value = _aspect_value(arc)
+    for planet, windows in SPECIAL_ASPECTS.items():
+        for lo, hi in windows:
+            value[:, planet, :] = np.where((arc[:, planet, :] >= lo) & (arc[:, planet, :] < hi), 60.0,
+                                           value[:, planet, :])
+    value[:, np.arange(7), np.arange(7)] = 0.0
+    nature = np.where(BENEFICS, 1.0, -1.0) * np.ones((len(lon), 1))
+    waning = (lon[:, MOON] - lon[:, SUN]) % 360 > 180
+    nature[waning, MOON] = -1.0
+    return (nature[:, :, None] * value).sum(axis=1) / 4
+
+
+def compute_shadbala(batch, ascendant, mc, latitude, longitude):
+    """
+    Shadbala of every chart (row) of `batch`, whose planets must include
+    SHADBALA_PLANETS. `ascendant` and `mc` are sidereal longitudes and
+    `latitude`/`longitude` the places, one per chart (scalars broadcast).
+    Returns a Shadbala of (charts, 7) arrays in virupas.
+    """
+    cols = [batch.names.index(name) for name in SHADBALA_PLANETS]
+    n = len(batch.jd)
+    jd = np.asarray(batch.jd, dtype=np.float64)
+    lon = batch.sidereal[:, cols]
+    ascendant, mc, latitude, longitude = (
+        np.broadcast_to(np.asarray(a, dtype=np.float64), (n,)) for a in (ascendant, mc, latitude, longitude)
+    )
+
+    sthana = _sthana_bala(lon, (ascendant // 30).astype(np.intp))
+    dig = _dig_bala(lon, ascendant, mc)
+    kala, ayana, paksha = _kala_bala(jd, lon, batch.tropical[:, cols], batch.latitude[:, cols], latitude, longitude)
+    chesta = _chesta_bala(batch.speed[:, cols], ayana, paksha)
+    naisargika = np.broadcast_to(NAISARGIKA, (n, 7))
+    drik = _drik_bala(lon)
+    return Shadbala(sthana, dig, kala, chesta, naisargika, drik, sthana + dig + kala + chesta + naisargika + drik)
+
+
+def chart_angles(jds, latitudes, longitudes, context=DEFAULT_CONTEXT):
+    """Sidereal (ascendant, MC) arrays, one swe.houses call per chart; any latitude."""
+    jds, latitudes, longitudes = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=np.float64))
+                                                       for a in (jds, latitudes, longitudes)))
+    ascendant, mc = np.empty(len(jds)), np.empty(len(jds))
+    for i, (jd, lat, lon) in enumerate(zip(jds.tolist(), latitudes.tolist(), longitudes.tolist())):
+        asc, mid = context.angles(jd, lat, lon)
+        ayanamsa = context.ayanamsa(jd)
+        ascendant[i], mc[i] = (asc - ayanamsa) % 360, (mid - ayanamsa) % 360
+    return ascendant, mc
+
+
+def shadbala_for_charts(jds, latitudes, longitudes, context=DEFAULT_CONTEXT):
+    """Shadbala for many charts at once: UT Julian days and places as arrays."""
+    batch = calc_positions(jds, None, context)
+    ascendant, mc = chart_angles(batch.jd, latitudes, longitudes, context)
+    return compute_shadbala(batch, ascendant, mc, latitudes, longitudes)
+
+
+def describe_shadbala(result, batch, row=0):
+    """{planet: strength dict} for one chart of a compute_shadbala result."""
+    cols = [batch.names.index(name) for name in SHADBALA_PLANETS]
+    components = {name: getattr(result, name)[row].tolist() for name in Shadbala._fields}
+    lon = batch.sidereal[row, cols].tolist()
+    strengths = {}
+    for i, planet in enumerate(SHADBALA_PLANETS):
+        rupas = components["total"][i] / 60
+        sign = SIGN_NAMES[int(lon[i] // 30) % 12]
+        strengths[planet] = {
+            "longitude": round(lon[i], 2),
+            "sign": sign,
+            "score": round(rupas, 2),
+            "rupas": round(rupas, 2),
+            "required": float(REQUIRED_RUPAS[i]),
+            "ratio": round(rupas / float(REQUIRED_RUPAS[i]), 2),
+            "strong": bool(rupas >= REQUIRED_RUPAS[i]),
+            "exalted": sign == SIGN_NAMES[int(DEEP_EXALTATION[i] // 30)],
+            "components": {name: round(components[name][i], 2) for name in Shadbala._fields[:-1]},
+        }
+    return strengths
+
+
+def get_shadbala(ctx):
+    """Shadbala of a ChartContext's natal planets."""
+    ascendant, mc = ctx.angles
+    return describe_shadbala(compute_shadbala(ctx.batch, ascendant, mc, ctx.latitude, ctx.longitude), ctx.batch)
@@ -1,55 +1,79 @@
-from .kundli import get_dasha_periods
+import time
+
+from utils.chart_context import ChartContext
 from .interpretations import get_yogas
 from utils.swiss_strength import get_planetary_strength_swiss as get_planetary_strength
 from .muhurat_finder import find_muhurats
 from .deity_map import get_deity_recommendation
-from utils.remedies import get_remedies
+from utils.pipeline import INLINE, PROCESS, Stage, run_pipeline
+from utils.remedies import get_afflictions, get_remedies
 from utils.language_utils import translate_output
 
 
+def _chart(datetime_str, latitude, longitude):
+    ctx = ChartContext.from_datetime(datetime_str, latitude, longitude)
+    # Computed once here, before the stages that read them fan out
+    for attr in ("batch", "lagna", "dasha"):
+        getattr(ctx, attr)
+    return ctx
+
+
+def _remedies(ctx, lang):
+    remedies = get_remedies(get_afflictions(ctx), ctx.planet_houses, lang=lang,
+                            current_dasha=ctx.current_mahadasha, current_nakshatra=ctx.nakshatra["nakshatra"])
+    return remedies["all"]
+
+
+def summary_stages(muhurat_type="business", lang="en"):
+    """
+    The summary as a dependency graph. Inputs: datetime_str, latitude,
+    longitude, timezone_offset. The chart is computed once and shared;
+    yogas, strengths, remedies, the muhurat search (worker process) and the
+    deity lookup run concurrently.
+    """
+    return [
+        Stage("chart", _chart, ("datetime_str", "latitude", "longitude"), INLINE),
+        Stage("yogas", lambda ctx: get_yogas(None, None, None, None, ctx=ctx), ("chart",)),
+        Stage("strengths", lambda ctx: get_planetary_strength(None, None, None, None, ctx=ctx), ("chart",)),
+        Stage("remedies", lambda ctx: _remedies(ctx, lang), ("chart",)),
+        Stage("muhurat", find_muhurats, ("datetime_str", "latitude", "longitude", "timezone_offset", "muhurat_type"), PROCESS),
+        Stage("deity", get_deity_recommendation, ("muhurat_type",)),
+    ]
+
+
 def generate_summary(datetime_str, latitude, longitude, timezone_offset, muhurat_type="business", lang="en"):
     # 🔮 Core Calculations
-    dasha = get_dasha_periods(datetime_str, latitude, longitude, timezone_offset)
-    yogas = get_yogas(datetime_str, latitude, longitude, timezone_offset)
-    strengths = get_planetary_strength(datetime_str, latitude, longitude, timezone_offset)
+    run = run_pipeline(summary_stages(muhurat_type, lang), {
+        "datetime_str": datetime_str, "latitude": latitude, "longitude": longitude,
+        "timezone_offset": timezone_offset, "muhurat_type": muhurat_type,
+    })
+    ctx, yogas, strengths = run.results["chart"], run.results["yogas"], run.results["strengths"]
 
     # 👁️‍🗨️ Extract active Mahadasha
-    active_dasha = dasha["dashas"][0]["mahadasha"]
-    dasha_score = strengths.get(active_dasha, 20.0)
-
-    # 🧠 Build planetary weakness/affliction map
-    planetary_status = {
-        planet: details.get("afflictions", [])
-        for planet, details in strengths.items()
-        if isinstance(details, dict) and details.get("afflictions")
-    }
-
-    # 🏠 House Mapping — fallback-safe
-    house_mapping = {
-        planet: details.get("house", None)
-        for planet, details in strengths.items()
-        if isinstance(details, dict)
-    }
+    active_dasha = ctx.current_mahadasha or "Unknown"
+    # Shadbala in rupas; the nodes (Rahu/Ketu) have none
+    dasha_score = strengths.get(active_dasha, {}).get("score")
+    dasha_strength = f"Shadbala: {dasha_score} rupas" if dasha_score is not None else "Shadbala: n/a"
 
     # 🪬 Remedies — Localized and contextual
-    remedies = get_remedies(planetary_status, house_mapping, lang=lang) or []
+    remedies = run.results["remedies"]
 
     # ✨ Yogas
     active_yogas = [y for y in yogas if y.get("active")]
     difficult_yogas = [y for y in yogas if y.get("score", 5) <= 4]
 
     # ⏰ Muhurat
-    muhurat_result = find_muhurats(datetime_str, latitude, longitude, timezone_offset, muhurat_type)
+    muhurat_result = run.results["muhurat"]
     muhurat_summary = muhurat_result.get("gpt_summary", "")
 
     # 🙏 Deity
-    deity_info = get_deity_recommendation(muhurat_type) or {}
+    deity_info = run.results["deity"] or {}
     deity_name = deity_info.get("deity", "Your Ishta Devata")
     deity_mantra = deity_info.get("mantra", "Om Namah Shivaya")
     deity_reason = deity_info.get("reason", "Connect spiritually with this guiding deity.")
 
     # 📝 Build the English summary
-    summary = f"🕉️ You are currently in **{active_dasha} Mahadasha** (Strength: {dasha_score}/40).\n\n"
+    summary = f"🕉️ You are currently in **{active_dasha} Mahadasha** ({dasha_strength}).\n\n"
 
     if active_yogas:
         summary += "✨ Active Yogas:\n"
@@ -78,13 +102,15 @@ def generate_summary(datetime_str, latitude, longitude, timezone_offset, muhurat
     )
 
     # 🔠 Translate summary if not in English
+    start = time.perf_counter()
     translated_summary = translate_output(summary, target_language=lang)
+    timings = {**run.timings, "translate": round((time.perf_counter() - start) * 1e3, 1)}
 
     # 🧠 GPT Prompt
     gpt_prompt = f"""
 You are a traditional Vedic astrologer. Interpret the following chart summary in {lang.upper()}:
 
-- Active Mahadasha: {active_dasha} (Strength: {dasha_score}/40)
+- Active Mahadasha: {active_dasha} ({dasha_strength})
 - Active Yogas: {', '.join([y['name'] for y in active_yogas]) or 'None'}
 - Difficult Yogas: {', '.join([y['name'] for y in difficult_yogas]) or 'None'}
 - Remedies: {', '.join([r['remedy'] for r in remedies]) or 'None'}
@@ -110,5 +136,6 @@ Respond in 3–5 sentences using a calm, spiritual, and devotional tone.
         "summary": translated_summary.strip(),
         "gpt_prompt": gpt_prompt.strip(),
         "dasha_score": dasha_score,
-        "context": context
+        "context": context,
+        "timings": timings
     }
@@ -1,8 +1,7 @@
 import swisseph as swe
 from datetime import datetime
 import pytz
-
-swe.set_ephe_path("/usr/share/ephe")  # Optional: Set path to Swiss Ephemeris files
+from utils.ephemeris import calc_positions
 
 PLANETS = {
     0: "Sun", 1: "Moon", 2: "Mercury", 3: "Venus", 4: "Mars",
@@ -14,11 +13,10 @@ def calculate_planet_positions(date_str, time_str, lat, lon):
     utc_dt = pytz.timezone("Asia/Kolkata").localize(dt).astimezone(pytz.utc)
     jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute / 60)
 
+    batch = calc_positions(jd, {name: pid for pid, name in PLANETS.items()})
     planet_data = {}
-    for i in PLANETS.keys():
-        pos, _ = swe.calc_ut(jd, i)
-        sign = int(pos[0] // 30)
-        degree = round(pos[0] % 30, 2)
-        planet_data[PLANETS[i]] = {"sign": sign + 1, "degree": degree}
+    for i, name in enumerate(batch.names):
+        lon = float(batch.tropical[0, i])
+        planet_data[name] = {"sign": int(lon // 30) + 1, "degree": round(lon % 30, 2)}
 
     return planet_data
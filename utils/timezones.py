@@ -0,0 +1,58 @@
+# utils/timezones.py
+
+import os
+import threading
+from functools import lru_cache
+
+from utils.lazy import get_resource
+
+# Coordinates are rounded to this many decimals before lookup/caching
+# (3 decimals ≈ 110 m, far below any timezone border precision we need)
+TZ_CACHE_PRECISION = int(os.getenv("TZ_CACHE_PRECISION", "3"))
+TZ_CACHE_SIZE = int(os.getenv("TZ_CACHE_SIZE", "4096"))
+
+_finder_lock = threading.Lock()
+
+
+def get_finder():
+    """Process-wide TimezoneFinder, built on first use."""
+    return get_resource("timezone_finder")
+
+
+def _lookup(lat, lon):
+    finder = get_finder()
+    with _finder_lock:
+        return finder.timezone_at(lat=lat, lng=lon)
+
+
+_cached_lookup = lru_cache(maxsize=TZ_CACHE_SIZE)(_lookup)
+
+
+def configure(precision=None, maxsize=None):
+    """Changes the quantization precision and/or cache size; clears the cache."""
+    global TZ_CACHE_PRECISION, TZ_CACHE_SIZE, _cached_lookup
+    if precision is not None:
+        TZ_CACHE_PRECISION = int(precision)
+    if maxsize is not None:
+        TZ_CACHE_SIZE = int(maxsize)
+    _cached_lookup = lru_cache(maxsize=TZ_CACHE_SIZE)(_lookup)
+
+
+def timezone_at(lat, lon):
+    """IANA timezone name for the coordinates, or None (e.g. open ocean)."""
+    return _cached_lookup(round(float(lat), TZ_CACHE_PRECISION), round(float(lon), TZ_CACHE_PRECISION))
+
+
+def cache_stats():
+    info = _cached_lookup.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "precision": TZ_CACHE_PRECISION
+    }
+
+
+def clear_cache():
+    _cached_lookup.cache_clear()
@@ -1,8 +1,15 @@
 import datetime
 import swisseph as swe
 from utils.geolocation import get_lat_lon_timezone
+from utils.ascendant import SIGN_NAMES
+from utils.ephemeris import calc_positions
 
-swe.set_ephe_path('.')  # Optional: path to Swiss Ephemeris data
+def _tropical_positions(jd):
+    batch = calc_positions(jd)
+    return {
+        name: round(float(batch.tropical[0, i]), 2)
+        for i, name in enumerate(batch.names)
+    }
 
 def get_transits(dob: str, tob: str, pob: str):
     lat, lon, timezone = get_lat_lon_timezone(pob)
@@ -12,34 +19,35 @@ def get_transits(dob: str, tob: str, pob: str):
 
     jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute / 60.0)
 
-    planets = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
-    planet_ids = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE]
-
-    results = {}
-
-    for i, pid in enumerate(planet_ids):
-        lon, _ = swe.calc_ut(jd, pid)
-        results[planets[i]] = round(lon[0], 2)
-
-    # Ketu = 180 deg opposite Rahu
-    if 'Rahu' in results:
-        results['Ketu'] = (results['Rahu'] + 180) % 360
-
-    return results
+    return _tropical_positions(jd)
 
 def get_daily_global_transits():
     today = datetime.datetime.utcnow()
     jd = swe.julday(today.year, today.month, today.day, today.hour + today.minute / 60.0)
 
-    planets = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
-    planet_ids = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE]
-
-    results = {}
-    for i, pid in enumerate(planet_ids):
-        lon, _ = swe.calc_ut(jd, pid)
-        results[planets[i]] = round(lon[0], 2)
-
-    if 'Rahu' in results:
-        results['Ketu'] = (results['Rahu'] + 180) % 360
-
-    return results
+    return _tropical_positions(jd)
+
+# Gochara: houses counted from the natal Moon sign in which a transiting planet gives good results
+FAVORABLE_TRANSIT_HOUSES = {
+    "Sun": [3, 6, 10, 11], "Moon": [1, 3, 6, 7, 10, 11], "Mars": [3, 6, 11],
+    "Mercury": [2, 4, 6, 8, 10, 11], "Jupiter": [2, 5, 7, 9, 11], "Venus": [1, 2, 3, 4, 5, 8, 9, 11, 12],
+    "Saturn": [3, 6, 11], "Rahu": [3, 6, 11], "Ketu": [3, 6, 11]
+}
+
+def get_transit_effects(ctx):
+    """Transits at ctx.transit_jd judged from the natal Moon sign of a ChartContext."""
+    moon_sign = ctx.signs["Moon"]
+    effects = []
+    for planet, lon in ctx.transits.items():
+        sign = int(lon // 30) % 12
+        house = (sign - moon_sign) % 12 + 1
+        favorable = house in FAVORABLE_TRANSIT_HOUSES[planet]
+        effects.append({
+            "planet": planet,
+            "sign": SIGN_NAMES[sign],
+            "house_from_moon": house,
+            "favorable": favorable,
+            "effect": f"{planet} transits house {house} from your Moon sign ({ctx.moon_sign}): "
+                      + ("supportive." if favorable else "calls for patience.")
+        })
+    return effects
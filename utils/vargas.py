@@ -0,0 +1,132 @@
+# utils/vargas.py
+
+"""
+The sixteen Parashari divisional charts (shodasavarga), D1 to D60.
+
+Every varga splits each sign into N equal parts, except the trimsamsa,
+whose five unequal parts fall on whole degrees. Where a part lands depends
+on the varga and on the rasi sign (odd/even, movable/fixed/dual or
+element), so the rules are tabulated once at import as VARGA_TABLE
+[varga, sign, part] -> sign, with the trimsamsa spread over 30 one-degree
+parts. Any array of longitudes then maps to all sixteen vargas in one
+broadcast: the part index of every (longitude, varga) pair, then a single
+gather from the table.
+"""
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+
+# Varga -> number of parts per sign
+VARGAS = {
+    "D1": 1, "D2": 2, "D3": 3, "D4": 4, "D7": 7, "D9": 9, "D10": 10, "D12": 12,
+    "D16": 16, "D20": 20, "D24": 24, "D27": 27, "D30": 30, "D40": 40, "D45": 45, "D60": 60,
+}
+VARGA_NAMES = tuple(VARGAS)
+VARGA_TITLES = {
+    "D1": "Rasi", "D2": "Hora", "D3": "Drekkana", "D4": "Chaturthamsa", "D7": "Saptamsa",
+    "D9": "Navamsa", "D10": "Dasamsa", "D12": "Dwadasamsa", "D16": "Shodasamsa", "D20": "Vimsamsa",
+    "D24": "Chaturvimsamsa", "D27": "Saptavimsamsa", "D30": "Trimsamsa", "D40": "Khavedamsa",
+    "D45": "Akshavedamsa", "D60": "Shashtiamsa",
+}
+
+# Trimsamsa: (upper bound in degrees, sign) of each part; odd signs run Mars,
+# Saturn, Jupiter, Mercury, Venus, even signs the reverse
+TRIMSAMSA = {
+    True: [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)],
+    False: [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)],
+}
+
+# Signs advanced per part where it is not one: drekkanas go by trines, chaturthamsas by kendras
+STEP = {"D3": 4, "D4": 3}
+
+
+def _first_sign(varga, sign):
+    """Sign of the first part of `sign` in an equal-part varga."""
+    odd = sign % 2 == 0
+    modality = sign % 3  # movable, fixed, dual
+    return {
+        "D1": sign,
+        "D3": sign,
+        "D4": sign,
+        "D7": sign if odd else sign + 6,
+        "D9": sign * 9,
+        "D10": sign if odd else sign + 8,
+        "D12": sign,
+        "D16": (0, 4, 8)[modality],
+        "D20": (0, 8, 4)[modality],
+        "D24": 4 if odd else 3,
+        "D27": sign * 27,
+        "D40": 0 if odd else 6,
+        "D45": (0, 4, 8)[modality],
+        "D60": sign,
+    }[varga]
+
+
+def _build_table():
+    table = np.zeros((len(VARGAS), 12, max(VARGAS.values())), dtype=np.int8)
+    for v, (varga, parts) in enumerate(VARGAS.items()):
+        for sign in range(12):
+            odd = sign % 2 == 0
+            if varga == "D2":
+                # Hora: odd signs Leo then Cancer, even signs Cancer then Leo
+                row = [4, 3] if odd else [3, 4]
+            elif varga == "D30":
+                row = [next(s for bound, s in TRIMSAMSA[odd] if degree < bound) for degree in range(30)]
+            else:
+                row = [(_first_sign(varga, sign) + STEP.get(varga, 1) * part) % 12 for part in range(parts)]
+            table[v, sign, :parts] = row
+    return table
+
+
+VARGA_TABLE = _build_table()
+_PARTS = np.array(list(VARGAS.values()), dtype=np.float64)
+
+
+def _columns(vargas):
+    unknown = [v for v in vargas if v.upper() not in VARGAS]
+    if unknown:
+        raise ValueError(f"Unknown varga {unknown[0]!r}; expected one of {', '.join(VARGA_NAMES)}")
+    return np.array([VARGA_NAMES.index(v.upper()) for v in vargas])
+
+
+def varga_signs(longitude, vargas=VARGA_NAMES):
+    """
+    Sign (0 = Aries) of each longitude in each of `vargas`, stacked on a new
+    last axis in that order: shape (..., len(vargas)).
+    """
+    columns = _columns(vargas)
+    parts = _PARTS[columns]
+    longitude = np.asarray(longitude, dtype=np.float64)[..., None] % 360
+    sign = (longitude // 30).astype(np.intp)
+    part = np.minimum((longitude % 30 * parts / 30).astype(np.intp), (parts - 1).astype(np.intp))
+    return VARGA_TABLE[columns, sign, part]
+
+
+def varga_sign(longitude, varga):
+    """Sign index of one longitude in one varga."""
+    return int(varga_signs(longitude, (varga,))[0])
+
+
+def divisional_chart(chart, varga="D9"):
+    """{sign index: [planets]} of a Chart in one varga, the shape chart_svg draws."""
+    placed = {i: [] for i in range(12)}
+    for name, sign in zip(chart.names, chart.vargas[:, VARGA_NAMES.index(varga.upper())].tolist()):
+        placed[sign].append(name)
+    return placed
+
+
+def varga_positions(chart, ascendant=None):
+    """
+    {varga: {"lagna": sign name or None, "planets": {planet: sign name}}}
+    for all sixteen vargas of a Chart; the lagna needs the sidereal ascendant.
+    """
+    planets = chart.vargas.tolist()
+    lagna = varga_signs(ascendant).tolist() if ascendant is not None else [None] * len(VARGAS)
+    return {
+        varga: {
+            "lagna": SIGN_NAMES[lagna[v]] if lagna[v] is not None else None,
+            "planets": {name: SIGN_NAMES[row[v]] for name, row in zip(chart.names, planets)},
+        }
+        for v, varga in enumerate(VARGA_NAMES)
+    }
@@ -0,0 +1,273 @@
+# utils/yoga_rules.py
+
+"""
+Declarative yoga rules, compiled to one vectorized check.
+
+A chart is two small integer arrays: the sidereal sign (0 = Aries) of each
+planet, in PLANET_NAMES order, and the lagna sign; houses are whole-sign
+from the lagna. Each chart is encoded once as a row of boolean features
+(planet in house, planet in sign, planet in the n-th house from another
+planet, lord of a house in a house). A rule's condition is built from those
+atoms with all_of/any_of/negate and kept in disjunctive normal form: a list
+of clauses, each a set of (possibly negated) feature columns. Compiling a
+catalogue packs its distinct clauses into a few padded index matrices.
+Evaluation turns each feature into a bitset over the charts, so matching
+every rule against any number of charts is a handful of gathered ANDs and
+one OR-reduceat, with no Python work per rule or per chart.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from utils.ascendant import SIGN_NAMES
+from utils.ephemeris import PLANETS
+from utils.kundli import SIGN_LORDS
+
+PLANET_NAMES = list(PLANETS)
+SIGN_LORD_INDEX = np.array([PLANET_NAMES.index(SIGN_LORDS[sign]) for sign in SIGN_NAMES])
+
+_P = len(PLANET_NAMES)
+# Feature blocks, as column offsets
+_HOUSE = 0                    # planet p in house h
+_SIGN = _HOUSE + _P * 12      # planet p in sign s
+_FROM = _SIGN + _P * 12       # planet p in the k-th house from planet q
+_LORD = _FROM + _P * _P * 12  # lord of house h in house k
+N_FEATURES = _LORD + 12 * 12
+# Encoded rows hold the features, their negations, then an always-true and an always-false column
+_TRUE = 2 * N_FEATURES
+_FALSE = _TRUE + 1
+# Charts encoded per step in evaluate(), to bound the gather buffers
+EVAL_CHUNK = 4096
+
+_TWELVE = np.arange(12)[:, None]
+
+# `clauses` is a condition built with the helpers below. `planets` and `lords`
+# (house numbers whose lords count) always take part; so does every graha
+# named by a non-negated atom of a clause that held in the chart, so only the
+# planets that actually form an any-of yoga count. The yoga is active when
+# one of its participants runs the mahadasha.
+Rule = namedtuple(
+    "Rule",
+    ["name", "clauses", "score", "description", "summary", "planets", "lords", "remedy"],
+    defaults=((), (), None),
+)
+CompiledRules = namedtuple("CompiledRules", ["rules", "groups", "clause_ids", "starts"])
+
+
+def _planet(name):
+    if name not in PLANETS:
+        raise ValueError(f"Unknown planet: {name}")
+    return PLANET_NAMES.index(name)
+
+
+def _sign(name):
+    if name not in SIGN_NAMES:
+        raise ValueError(f"Unknown sign: {name}")
+    return SIGN_NAMES.index(name)
+
+
+def _house(house):
+    if not 1 <= house <= 12:
+        raise ValueError(f"House out of range: {house}")
+    return house - 1
+
+
+def _negated(literal):
+    return literal + N_FEATURES if literal < N_FEATURES else literal - N_FEATURES
+
+
+def _simplify(clauses):
+    """Drops contradictory and repeated clauses, keeping order."""
+    seen, out = set(), []
+    for clause in clauses:
+        if clause in seen or any(_negated(lit) in clause for lit in clause):
+            continue
+        seen.add(clause)
+        out.append(clause)
+    return out
+
+
+def _any_literal(literals):
+    return _simplify([frozenset([lit]) for lit in literals])
+
+
+# Conditions
+
+def in_house(planet, *houses):
+    p = _planet(planet)
+    return _any_literal(_HOUSE + p * 12 + _house(h) for h in houses)
+
+
+def in_sign(planet, *signs):
+    p = _planet(planet)
+    return _any_literal(_SIGN + p * 12 + _sign(s) for s in signs)
+
+
+def from_planet(planet, ref, *houses):
+    """`planet` in any of `houses` counted from `ref` (1 = the same house)."""
+    p, q = _planet(planet), _planet(ref)
+    return _any_literal(_FROM + (p * _P + q) * 12 + _house(h) for h in houses)
+
+
+def conjunct(a, b):
+    return from_planet(a, b, 1)
+
+
+def lord_in(house, *houses):
+    """The lord of `house` placed in any of `houses`."""
+    h = _house(house)
+    return _any_literal(_LORD + h * 12 + _house(k) for k in houses)
+
+
+def lords_conjunct(a, b):
+    """The lords of houses `a` and `b` in one house (always true when one planet rules both)."""
+    return any_of(*(all_of(lord_in(a, k), lord_in(b, k)) for k in range(1, 13)))
+
+
+def exchange(a, b):
+    """Parivartana: the lord of `a` in `b` and the lord of `b` in `a`."""
+    return all_of(lord_in(a, b), lord_in(b, a))
+
+
+def all_of(*conditions):
+    clauses = [frozenset()]
+    for condition in conditions:
+        clauses = _simplify([a | b for a in clauses for b in condition])
+    return clauses
+
+
+def any_of(*conditions):
+    return _simplify([clause for condition in conditions for clause in condition])
+
+
+def negate(condition):
+    """Negation of a disjunction of single atoms (as in_house etc. return)."""
+    if any(not clause for clause in condition):
+        return []
+    if any(len(clause) != 1 for clause in condition):
+        raise ValueError("Only a disjunction of single atoms can be negated")
+    return [frozenset(_negated(lit) for clause in condition for lit in clause)]
+
+
+# Compilation and evaluation
+
+def compile_rules(rules):
+    """
+    Packs the distinct clauses of `rules` (shared ones are evaluated once)
+    into index matrices grouped by padded width, a power of two.
+    """
+    rules = tuple(rules)
+    unique, clause_ids, starts = {}, [], []
+    for rule in rules:
+        starts.append(len(clause_ids))
+        for clause in rule.clauses or [frozenset([_FALSE])]:
+            clause_ids.append(unique.setdefault(clause, len(unique)))
+
+    by_width = {}
+    for clause, index in unique.items():
+        width = 1
+        while width < len(clause):
+            width *= 2
+        by_width.setdefault(width, []).append((index, sorted(clause)))
+
+    groups = []
+    for width, entries in sorted(by_width.items()):
+        literals = np.full((len(entries), width), _TRUE, dtype=np.intp)
+        for row, (_, clause) in enumerate(entries):
+            literals[row, :len(clause)] = clause
+        groups.append((np.array([index for index, _ in entries], dtype=np.intp), literals))
+    return CompiledRules(rules, groups, np.array(clause_ids, dtype=np.intp), np.array(starts, dtype=np.intp))
+
+
+def encode(signs, lagna):
+    """
+    Features of charts given `signs` (n, len(PLANET_NAMES)) and `lagna` (n,)
+    sign indices, feature-major: row f is feature f for every chart.
+    """
+    signs = np.atleast_2d(np.asarray(signs, dtype=np.intp)).T % 12
+    lagna = np.atleast_1d(np.asarray(lagna, dtype=np.intp)) % 12
+    n = len(lagna)
+    houses = (signs - lagna) % 12
+    relative = (houses[:, None, :] - houses[None, :, :]) % 12
+    lord_houses = np.take_along_axis(houses, SIGN_LORD_INDEX[(lagna + _TWELVE) % 12], axis=0)
+
+    features = np.empty((_FALSE + 1, n), dtype=bool)
+    features[_HOUSE:_SIGN] = (houses[:, None, :] == _TWELVE).reshape(-1, n)
+    features[_SIGN:_FROM] = (signs[:, None, :] == _TWELVE).reshape(-1, n)
+    features[_FROM:_LORD] = (relative[:, :, None, :] == _TWELVE).reshape(-1, n)
+    features[_LORD:N_FEATURES] = (lord_houses[:, None, :] == _TWELVE).reshape(-1, n)
+    np.logical_not(features[:N_FEATURES], out=features[N_FEATURES:_TRUE])
+    features[_TRUE] = True
+    features[_FALSE] = False
+    return features
+
+
+def evaluate(compiled, signs, lagna):
+    """(n charts, n rules) boolean array of matches."""
+    signs = np.atleast_2d(signs)
+    lagna = np.atleast_1d(lagna)
+    out = np.empty((len(signs), len(compiled.rules)), dtype=bool)
+    for lo in range(0, len(signs), EVAL_CHUNK):
+        count = len(lagna[lo:lo + EVAL_CHUNK])
+        # One bitset over the charts per feature: a clause is the AND of its literals' bitsets
+        bits = np.packbits(encode(signs[lo:lo + EVAL_CHUNK], lagna[lo:lo + EVAL_CHUNK]), axis=1)
+        hits = np.empty((sum(len(indices) for indices, _ in compiled.groups), bits.shape[1]), dtype=np.uint8)
+        for indices, literals in compiled.groups:
+            hits[indices] = np.bitwise_and.reduce(bits[literals], axis=1)
+        matches = np.bitwise_or.reduceat(hits[compiled.clause_ids], compiled.starts, axis=0)
+        out[lo:lo + EVAL_CHUNK] = np.unpackbits(matches, axis=1, count=count).T
+    return out
+
+
+def _atom_graha(literal, lagna):
+    """The graha a (non-negated) feature column is about: the placed planet, or the house lord."""
+    if literal < _SIGN:
+        return PLANET_NAMES[(literal - _HOUSE) // 12]
+    if literal < _FROM:
+        return PLANET_NAMES[(literal - _SIGN) // 12]
+    if literal < _LORD:
+        return PLANET_NAMES[(literal - _FROM) // (_P * 12)]
+    return SIGN_LORDS[SIGN_NAMES[(lagna + (literal - _LORD) // 12) % 12]]
+
+
+def participants(rule, lagna, features):
+    """
+    Names of the grahas taking part in `rule` for one chart: its fixed
+    `planets` and `lords`, plus those named by the atoms of the clauses that
+    held, given the chart's encoded `features` (one column of encode()).
+    """
+    names = set(rule.planets)
+    for house in rule.lords:
+        names.add(SIGN_LORDS[SIGN_NAMES[(lagna + house - 1) % 12]])
+    for clause in rule.clauses:
+        if all(features[lit] for lit in clause):
+            names.update(_atom_graha(lit, lagna) for lit in clause if lit < N_FEATURES)
+    return names
+
+
+def detect(compiled, signs, lagna, dasha_lord=None):
+    """Matching yogas of one chart as dicts, active if `dasha_lord` takes part."""
+    matches = evaluate(compiled, [signs], [lagna])[0]
+    features = encode(signs, lagna)[:, 0] if dasha_lord else None
+    yogas = []
+    for rule in (compiled.rules[i] for i in np.flatnonzero(matches)):
+        yoga = {
+            "name": rule.name,
+            "description": rule.description,
+            "score": rule.score,
+            "active": features is not None and dasha_lord in participants(rule, lagna, features),
+            "summary": rule.summary,
+        }
+        if rule.remedy:
+            yoga["remedy"] = rule.remedy
+        yogas.append(yoga)
+    return yogas
+
+
+def chart_arrays(ctx):
+    """(planet signs, lagna sign) of a ChartContext, as evaluate() and detect() take them."""
+    chart = ctx.chart
+    if chart.names == tuple(PLANET_NAMES):
+        return chart.sign, chart.lagna
+    return [chart.signs[name] for name in PLANET_NAMES], chart.lagna